@@ -0,0 +1,52 @@
+"""
+Per-file `FileHistoryStore.append` versus one `append_many` call.
+
+    python benchmarks/bench_history_append.py
+
+The per-file path re-reads and re-writes the whole history on every call,
+so it is only run on the smaller sizes.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from sasori.util import session_util
+
+PER_FILE_SIZES = (100, 250, 500)
+BULK_SIZES = (100, 250, 500, 10_000)
+
+
+def _paths(n: int) -> list[str]:
+    return [f"/repo/src/pkg{i % 50}/module_{i}.py" for i in range(n)]
+
+
+def main() -> None:
+    os.environ["HISTORY_SESSION_ID"] = "bench"
+    with tempfile.TemporaryDirectory() as tmp:
+        session_util.CACHE_DIR = Path(tmp)
+        from sasori.db.file_history_db import FileHistoryStore
+
+        print(f"{'files':>7} {'append (s)':>11} {'append_many (s)':>16}")
+        for n in BULK_SIZES:
+            paths = _paths(n)
+            per_file = "-"
+            if n in PER_FILE_SIZES:
+                store = FileHistoryStore(f"per_file_{n}", "bench")
+                start = time.perf_counter()
+                for p in paths:
+                    store.append(p)
+                per_file = f"{time.perf_counter() - start:.3f}"
+
+            store = FileHistoryStore(f"bulk_{n}", "bench")
+            start = time.perf_counter()
+            store.append_many(paths)
+            bulk = time.perf_counter() - start
+            print(f"{n:>7} {per_file:>11} {bulk:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Size and encode/decode time of each history codec on path-list histories.
+
+    python benchmarks/bench_history_codec.py
+"""
+
+from __future__ import annotations
+
+import time
+
+from sasori.db.history_codec import CompactCodec, HistoryCodec
+
+SIZES = (1_000, 10_000, 50_000)
+SNAPSHOTS = 5
+CODECS = (HistoryCodec(), CompactCodec(), CompactCodec("zlib"), CompactCodec("lzma"))
+
+
+def _history(n: int) -> list[list[str]]:
+    paths = sorted(
+        f"/home/user/project/src/pkg{i % 50}/sub{i % 7}/module_{i}.py" for i in range(n)
+    )
+    return [paths[: n * (k + 1) // SNAPSHOTS] for k in range(SNAPSHOTS)]
+
+
+def main() -> None:
+    print(
+        f"{'files':>7} {'codec':>13} {'bytes':>11} {'ratio':>6} "
+        f"{'encode (s)':>11} {'decode (s)':>11}"
+    )
+    for n in SIZES:
+        history = _history(n)
+        baseline = 0
+        for codec in CODECS:
+            start = time.perf_counter()
+            data = codec.encode(history)
+            encode = time.perf_counter() - start
+            start = time.perf_counter()
+            assert codec.decode(data) == history
+            decode = time.perf_counter() - start
+            baseline = baseline or len(data)
+            print(
+                f"{n:>7} {codec.name:>13} {len(data):>11} "
+                f"{len(data) / baseline:>6.2f} {encode:>11.3f} {decode:>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+N processes appending to the same `FileHistoryStore` at once, per backend.
+
+    python benchmarks/bench_history_concurrency.py
+
+Every writer does a locked read-modify-write per path, so the final
+snapshot must hold all N × M paths; `lost` counts any that went missing.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from sasori.util import session_util
+
+BACKENDS = ("json", "delta", "journal", "sqlite")
+WRITERS = (1, 4, 8)
+APPENDS_PER_WRITER = 50
+
+
+def _writer(cache_dir: str, backend: str, writer: int, count: int) -> None:
+    os.environ["HISTORY_SESSION_ID"] = "bench"
+    os.environ["HISTORY_BACKEND"] = backend
+    session_util.CACHE_DIR = Path(cache_dir)
+    from sasori.db.file_history_db import FileHistoryStore
+
+    store = FileHistoryStore(f"stress_{backend}", "bench")
+    for i in range(count):
+        store.append(f"/repo/w{writer}/module_{i}.py")
+
+
+def _run(cache_dir: str, backend: str, writers: int) -> tuple[float, int]:
+    procs = [
+        mp.Process(target=_writer, args=(cache_dir, backend, w, APPENDS_PER_WRITER))
+        for w in range(writers)
+    ]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    elapsed = time.perf_counter() - start
+
+    os.environ["HISTORY_BACKEND"] = backend
+    from sasori.db.file_history_db import FileHistoryStore
+
+    tracked = len(FileHistoryStore(f"stress_{backend}", "bench").latest())
+    return elapsed, tracked
+
+
+def main() -> None:
+    os.environ["HISTORY_SESSION_ID"] = "bench"
+    print(f"{'backend':>8} {'writers':>8} {'appends':>8} {'time (s)':>9} {'lost':>5}")
+    for backend in BACKENDS:
+        for writers in WRITERS:
+            with tempfile.TemporaryDirectory() as tmp:
+                session_util.CACHE_DIR = Path(tmp)
+                elapsed, tracked = _run(tmp, backend, writers)
+            total = writers * APPENDS_PER_WRITER
+            print(
+                f"{backend:>8} {writers:>8} {total:>8} {elapsed:>9.3f} "
+                f"{total - tracked:>5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare the per-pattern `fnmatch` loop with the compiled `NameMatcher`.
+
+    python benchmarks/bench_ignore.py
+"""
+
+from __future__ import annotations
+
+import random
+import string
+import timeit
+from fnmatch import fnmatch
+
+from sasori.util.file_util import DEFAULT_IGNORES
+from sasori.util.ignore_util import NameMatcher
+
+NAMES = 20_000
+PATTERN_COUNTS = (len(DEFAULT_IGNORES), 32, 128, 512)
+
+
+def _random_name(rng: random.Random) -> str:
+    stem = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12)))
+    return stem + rng.choice((".py", ".txt", ".md", ".pyc", ".json", ""))
+
+
+def _patterns(count: int, rng: random.Random) -> list[str]:
+    patterns = list(DEFAULT_IGNORES)
+    while len(patterns) < count:
+        word = "".join(rng.choices(string.ascii_lowercase, k=6))
+        patterns.append(rng.choice((word, f"*.{word[:3]}", f"{word}?", f"*{word}*")))
+    return patterns
+
+
+def main() -> None:
+    rng = random.Random(0)
+    names = [_random_name(rng) for _ in range(NAMES)]
+    print(f"{'patterns':>8} {'fnmatch (s)':>12} {'compiled (s)':>13} {'speedup':>8}")
+    for count in PATTERN_COUNTS:
+        patterns = _patterns(count, rng)
+        matcher = NameMatcher(patterns)
+
+        def naive() -> None:
+            for n in names:
+                any(fnmatch(n, p) for p in patterns)
+
+        def compiled() -> None:
+            for n in names:
+                matcher(n)
+
+        t_naive = min(timeit.repeat(naive, number=1, repeat=3))
+        t_compiled = min(timeit.repeat(compiled, number=1, repeat=3))
+        print(
+            f"{count:>8} {t_naive:>12.4f} {t_compiled:>13.4f} "
+            f"{t_naive / t_compiled:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
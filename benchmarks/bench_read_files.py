@@ -0,0 +1,53 @@
+"""
+Sequential versus thread-pool reading in `stringify_file_contents`.
+
+    PYTHONPATH=. python benchmarks/bench_read_files.py
+
+Local reads come from the page cache, so a second run adds a fixed delay
+per file to stand in for a network mount.
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+from typing import Union
+
+from sasori.util import file_util
+
+SIZES = (100, 500)
+LATENCY_S = (0.0, 0.002)
+
+
+def main() -> None:
+    read = file_util.stringify_file_content
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'files':>6} {'latency':>8} {'sequential (s)':>15} {'pool (s)':>9}")
+        for n in SIZES:
+            files = []
+            for i in range(n):
+                path = Path(tmp) / f"module_{n}_{i}.py"
+                path.write_text(f"def f{i}():\n    return {i}\n" * 40)
+                files.append(str(path))
+            for latency in LATENCY_S:
+
+                def slow(path: Union[str, Path], latency: float = latency) -> str:
+                    time.sleep(latency)
+                    return read(path)
+
+                file_util.stringify_file_content = slow
+                timings = []
+                for workers in (1, None):
+                    start = time.perf_counter()
+                    file_util.stringify_file_contents(files, max_workers=workers)
+                    timings.append(time.perf_counter() - start)
+                print(
+                    f"{n:>6} {latency * 1000:>6.0f}ms {timings[0]:>15.3f} "
+                    f"{timings[1]:>9.3f}"
+                )
+    file_util.stringify_file_content = read
+
+
+if __name__ == "__main__":
+    main()
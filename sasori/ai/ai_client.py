@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Optional, Union
 
@@ -17,27 +22,139 @@ from sasori.instruction.instruction_model import Instruction
 from sasori.ai.ai_client_config import AIConfig
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+DEFAULT_MAX_CONNECTIONS = 16
+
+
+def connection_pool_size() -> int:
+    """
+    Keep-alive connections each provider client pools, from
+    $AI_MAX_CONNECTIONS (default: the rate limiter's default concurrency
+    ceiling, so requests in flight don't queue for a connection).
+    """
+    raw = (os.getenv("AI_MAX_CONNECTIONS") or "").strip()
+    if not raw:
+        return DEFAULT_MAX_CONNECTIONS
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        raise ValueError(
+            f"AI_MAX_CONNECTIONS must be an integer, got {raw!r}"
+        ) from None
+
+
+@dataclass(frozen=True)
+class PreparedContext:
+    """
+    Messages shared by every request of a batch: `head` goes before the
+    per-file messages (instructions, shared files) and `tail` after them
+    (saved prompts).
+    """
+
+    head: tuple[dict[str, Any], ...] = ()
+    tail: tuple[dict[str, Any], ...] = ()
+
+    def messages(self, body: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Fresh message list with `body` in between; shared dicts are copied."""
+        return [dict(m) for m in self.head] + body + [dict(m) for m in self.tail]
 
 
 class AIClient(ABC):
+    # threads backing the default `aget_response` (blocking SDKs only)
+    ASYNC_WORKERS = 16
+
     def __init__(self, config: AIConfig):
         self.config = config
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     @abstractmethod
     def get_response(self, messages: Any) -> str:
         pass
 
+    async def aget_response(self, messages: Any) -> str:
+        """
+        Async `get_response`. Clients with an async SDK override this; the
+        default runs the blocking call on a pool of `ASYNC_WORKERS` threads
+        owned by the client, so one event loop can keep that many requests
+        in flight.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._async_executor(), functools.partial(self.get_response, messages)
+        )
+
+    def _async_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.ASYNC_WORKERS,
+                    thread_name_prefix=type(self).__name__,
+                )
+            return self._executor
+
+    def prepare_context(
+        self, instructions: Optional[list[Instruction]] = None
+    ) -> PreparedContext:
+        """
+        Render the parts of a request that don't depend on the file being
+        processed (instructions, shared files, saved prompts) once, for
+        reuse by every `send_message(context=...)` of a batch.
+        """
+        try:
+            head: list[dict[str, Any]] = []
+            tail: list[dict[str, Any]] = []
+            if instructions:
+                instruction_strings = get_instruction_strings(instructions)
+                head.append(
+                    {
+                        "role": "system",
+                        "content": "\n".join(instruction_strings),
+                    }
+                )
+            shared_files = get_shared_files()
+            if shared_files:
+                shared_files_content = stringify_file_contents(
+                    shared_files, "File context"
+                )
+                head.append(
+                    {
+                        "role": "user",
+                        "content": "\n".join(shared_files_content),
+                    }
+                )
+            prompts = get_latest_prompts()
+            if prompts:
+                tail.append(
+                    {
+                        "role": "user",
+                        "content": "\n".join(prompts),
+                    }
+                )
+            return PreparedContext(head=tuple(head), tail=tuple(tail))
+        except Exception as e:
+            typer.secho(f"❌ Failed to prepare context: {e}", fg="red", err=True)
+            raise
+
     def send_message(
         self,
         instructions: Optional[list[Instruction]] = None,
         prompt_files: Optional[Union[list[str], list[Path]]] = None,
         final_prompt: Optional[str] = None,
+        context: Optional[PreparedContext] = None,
     ) -> str:
+        """
+        Send one request. With `context` (from `prepare_context`), only
+        `prompt_files` and `final_prompt` are rendered here and
+        `instructions` must be left out.
+        """
         try:
             messages = self._format_messages(
                 instructions=instructions,
                 prompt_files=prompt_files,
                 final_prompt=final_prompt,
+                context=context,
             )
             response = self.get_response(
                 messages=messages,
@@ -50,49 +167,56 @@ class AIClient(ABC):
             )
             raise
 
+    async def asend_message(
+        self,
+        instructions: Optional[list[Instruction]] = None,
+        prompt_files: Optional[Union[list[str], list[Path]]] = None,
+        final_prompt: Optional[str] = None,
+        context: Optional[PreparedContext] = None,
+    ) -> str:
+        """
+        Async `send_message`. Messages are built on a worker thread (they
+        read files), then sent with `aget_response`.
+        """
+        try:
+            messages = await asyncio.to_thread(
+                self._format_messages,
+                instructions=instructions,
+                prompt_files=prompt_files,
+                final_prompt=final_prompt,
+                context=context,
+            )
+            response = await self.aget_response(messages=messages)
+            typer.secho("☑️ Received response from AI client", fg="green")
+            return response
+        except Exception as e:
+            typer.secho(
+                f"❌ Failed to send message to AI client: {e}", fg="red", err=True
+            )
+            raise
+
     def _format_messages(
         self,
         instructions: Optional[list[Instruction]] = None,
         prompt_files: Optional[Union[list[str], list[Path]]] = None,
         final_prompt: Optional[str] = None,
+        context: Optional[PreparedContext] = None,
     ) -> list[dict[str, Any]]:
-        msgs: list[dict[str, Any]] = []
         try:
-            if instructions:
-                instruction_strings = get_instruction_strings(instructions)
-                msgs.append(
-                    {
-                        "role": "system",
-                        "content": "\n".join(instruction_strings),
-                    }
-                )
-            shared_files = get_shared_files()
-            if shared_files:
-                shared_files_content = stringify_file_contents(
-                    list(shared_files), "File context"
-                )
-                msgs.append(
-                    {
-                        "role": "user",
-                        "content": "\n".join(shared_files_content),
-                    }
-                )
+            if context is None:
+                context = self.prepare_context(instructions)
+            elif instructions:
+                raise ValueError("instructions belong in the prepared context")
+            body: list[dict[str, Any]] = []
             if prompt_files:
                 prompt_files_content = stringify_file_contents(prompt_files)
-                msgs.append(
+                body.append(
                     {
                         "role": "user",
                         "content": "\n".join(prompt_files_content),
                     }
                 )
-            prompts = get_latest_prompts()
-            if prompts:
-                msgs.append(
-                    {
-                        "role": "user",
-                        "content": "\n".join(prompts),
-                    }
-                )
+            msgs = context.messages(body)
             if final_prompt:
                 msgs.append(
                     {
@@ -1,29 +1,54 @@
+import dataclasses
+import importlib
 import os
-from typing import Callable, Optional
+import threading
+from typing import Any, Callable, Optional
 
 import typer
 
 from sasori.ai.ai_client_config import AIConfig
 
-from sasori.ai.ai_client import AIClient
-from sasori.ai.aws.anthropic.claude_client import ClaudeClient
-from sasori.ai.openai.openai_client import OpenAIClient
+from sasori.ai.ai_client import AIClient, connection_pool_size
+
+
+def _lazy(module: str, name: str) -> Callable[[Optional[AIConfig]], AIClient]:
+    """
+    Factory for `module.name` that imports the module on first call, so the
+    provider SDKs (openai, boto3) load only for the client actually chosen.
+    """
+
+    def build(config: Optional[AIConfig] = None) -> AIClient:
+        client_cls = getattr(importlib.import_module(module), name)
+        return client_cls(config)
+
+    return build
 
 
 AI_CLIENTS: dict[str, Callable[[Optional[AIConfig]], AIClient]] = {
-    "openai": OpenAIClient,
-    "claude": ClaudeClient,
+    "openai": _lazy("sasori.ai.openai.openai_client", "OpenAIClient"),
+    "claude": _lazy("sasori.ai.aws.anthropic.claude_client", "ClaudeClient"),
 }
 
 
+# ───── process-wide clients ──────────────────────────────────────
+
+_clients: dict[tuple[Any, ...], AIClient] = {}
+_clients_lock = threading.Lock()
+
+
 def get_ai_client(config: Optional[AIConfig] = None) -> AIClient:
+    """
+    The client for $AI_CLIENT and `config`. Clients are cached for the life
+    of the process, keyed by provider, config and pool size, so repeated
+    calls reuse the SDK client with its resolved credentials and warm
+    keep-alive connections instead of building a new one each time.
+    """
     client_name = (os.getenv("AI_CLIENT") or "").strip().lower()
     if not client_name:
         typer.secho("❌  AI_CLIENT environment variable not set.", fg="red", err=True)
         raise RuntimeError("⛔️  AI_CLIENT environment variable not set.")
     try:
-        client = AI_CLIENTS[client_name](config)
-        return client
+        build = AI_CLIENTS[client_name]
     except KeyError as exc:
         typer.secho(
             f'❌  Unsupported AI_CLIENT "{client_name}". '
@@ -35,3 +60,15 @@ def get_ai_client(config: Optional[AIConfig] = None) -> AIClient:
             f"❌ Unsupported AI_CLIENT '{client_name}'. "
             f"Supported: {list(AI_CLIENTS.keys())}"
         ) from exc
+    key = (client_name, build, _config_key(config), connection_pool_size())
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = build(config)
+        return _clients[key]
+
+
+def _config_key(config: Optional[AIConfig]) -> Any:
+    """Configs are mutable dataclasses, so they're keyed by their values."""
+    if dataclasses.is_dataclass(config) and not isinstance(config, type):
+        return type(config), dataclasses.astuple(config)
+    return config
@@ -5,27 +5,44 @@ from abc import ABC, abstractmethod
 from typing import Any, cast
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 from sasori.ai.ai_client_config import AIConfig
 from sasori.ai.aws.bedrock_client_config import BedrockClientConfig
+from sasori.ai.rate_limiter import estimate_tokens, get_throttle
 
-from sasori.ai.ai_client import AIClient
+from sasori.ai.ai_client import AIClient, connection_pool_size
 
 import typer
 
 
 class BedrockClient(AIClient, ABC):
     MAX_TOKENS = 4096
+    # boto3 has no async API: `aget_response` runs `invoke_model` on this
+    # many threads; the connection pool is never smaller
+    ASYNC_WORKERS = 10
 
     def __init__(self, config: AIConfig, region: str = "us-east-1") -> None:
         super().__init__(config)
         try:
-            self.client = boto3.client("bedrock-runtime", region_name=region)
+            self.client = boto3.client(
+                "bedrock-runtime",
+                region_name=region,
+                config=Config(
+                    max_pool_connections=max(
+                        connection_pool_size(), self.ASYNC_WORKERS
+                    ),
+                    tcp_keepalive=True,
+                    # one attempt: `throttle` owns retries and backoff
+                    retries={"total_max_attempts": 1},
+                ),
+            )
         except (BotoCoreError, ClientError) as exc:
             typer.secho(
                 f"❌ Unable to create Bedrock client: {exc}", fg="red", err=True
             )
             raise RuntimeError(f"Unable to create Bedrock client: {exc}") from exc
+        self.throttle = get_throttle(f"bedrock:{config.model}")
 
     @abstractmethod
     def _format_request_body(
@@ -45,11 +62,14 @@ class BedrockClient(AIClient, ABC):
             messages=messages,
         )
         try:
-            resp = self.client.invoke_model(
-                modelId=config.model,
-                body=json.dumps(body),
-                contentType="application/json",
-                accept="application/json",
+            resp = self.throttle.call(
+                lambda: self.client.invoke_model(
+                    modelId=config.model,
+                    body=json.dumps(body),
+                    contentType="application/json",
+                    accept="application/json",
+                ),
+                estimate_tokens(messages, config.max_tokens),
             )
             typer.secho("☑️ Received response from Bedrock", fg="green")
             payload = json.loads(resp["body"].read())
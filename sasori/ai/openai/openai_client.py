@@ -4,9 +4,16 @@ from typing import Iterable, Optional
 import typer
 
 from sasori.ai.ai_client_config import AIConfig
-from sasori.ai.ai_client import AIClient
+from sasori.ai.ai_client import AIClient, connection_pool_size
 from sasori.ai.openai.openai_config import OpenAIConfig
-from openai import OpenAI
+from sasori.ai.rate_limiter import estimate_tokens, get_throttle
+from openai import (
+    DEFAULT_CONNECTION_LIMITS,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+)
 from openai.types.chat import ChatCompletionMessageParam
 
 
@@ -19,19 +26,74 @@ class OpenAIClient(AIClient):
         if not api_key:
             typer.secho("❌ OPENAI_API_KEY is not set.", fg="red", err=True)
             raise RuntimeError("❌ OPENAI_API_KEY is not set.")
-        self.client = OpenAI(api_key=api_key)
+        pool = connection_pool_size()
+        # same class as the SDK's defaults, whichever httpx build it ships with
+        self._limits = type(DEFAULT_CONNECTION_LIMITS)(
+            max_connections=pool, max_keepalive_connections=pool
+        )
+        # retries are left to `throttle`, so it sees every 429 as it happens
+        self.client = OpenAI(
+            api_key=api_key,
+            max_retries=0,
+            http_client=DefaultHttpxClient(limits=self._limits),
+        )
+        self._api_key = api_key
+        self._async_client: Optional[AsyncOpenAI] = None
+        self.throttle = get_throttle(f"openai:{self.config.model}")
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """`AsyncOpenAI` twin of `client`, created on first async use."""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(limits=self._limits),
+            )
+        return self._async_client
 
     def get_response(
         self,
         messages: Iterable[ChatCompletionMessageParam],
     ) -> str:
+        messages = list(messages)  # sent again on a retry
+        try:
+            response = self.throttle.call(
+                lambda: self.client.chat.completions.create(
+                    model=self.config.model,
+                    temperature=self.config.temperature,
+                    max_tokens=self.config.max_tokens,
+                    top_p=self.config.top_p,
+                    messages=messages,
+                ),
+                estimate_tokens(messages, self.config.max_tokens),
+            )
+            result = response.choices[0].message.content or ""
+            typer.secho(f"✅ Response received from {self.config.model}", fg="green")
+            return result.strip()
+        except Exception as e:
+            typer.secho(
+                f"❌ Failed to get response from {self.config.model}: {e}",
+                fg="red",
+                err=True,
+            )
+            raise
+
+    async def aget_response(
+        self,
+        messages: Iterable[ChatCompletionMessageParam],
+    ) -> str:
+        messages = list(messages)
         try:
-            response = self.client.chat.completions.create(
-                model=self.config.model,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-                top_p=self.config.top_p,
-                messages=messages,
+            response = await self.throttle.acall(
+                lambda: self.async_client.chat.completions.create(
+                    model=self.config.model,
+                    temperature=self.config.temperature,
+                    max_tokens=self.config.max_tokens,
+                    top_p=self.config.top_p,
+                    messages=messages,
+                ),
+                estimate_tokens(messages, self.config.max_tokens),
             )
             result = response.choices[0].message.content or ""
             typer.secho(f"✅ Response received from {self.config.model}", fg="green")
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import typer
+
+R = TypeVar("R")
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_MAX_RETRIES = 8
+DEFAULT_BASE_DELAY_S = 1.0
+DEFAULT_MAX_DELAY_S = 60.0
+# error codes providers use for "slow down"
+THROTTLE_CODES = frozenset(
+    {"ThrottlingException", "TooManyRequestsException", "rate_limit_exceeded"}
+)
+_POLL_S = 0.05
+
+
+class TokenBucket:
+    """
+    Refills at `per_minute` tokens a minute up to `capacity` (one minute's
+    worth by default). `reserve(n)` takes `n` tokens at once, going into
+    debt if needed, and returns how long the caller must wait before using
+    them, so reservations queue up fairly without holding a lock while
+    sleeping. A request larger than the capacity is capped to it.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._stamp) * self.rate
+            )
+            self._stamp = now
+            self._tokens -= min(amount, self.capacity)
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit: each success raises the limit by `1 / limit`
+    (about +1 per round of requests), each throttle halves it, within
+    `[minimum, maximum]`. Other outcomes (errors, cancellation) free the
+    slot without moving the limit.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def try_enter(self) -> bool:
+        with self._cond:
+            if self.in_flight >= max(self.minimum, math.floor(self.limit)):
+                return False
+            self.in_flight += 1
+            return True
+
+    def enter(self) -> None:
+        with self._cond:
+            while self.in_flight >= max(self.minimum, math.floor(self.limit)):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def leave(self, throttled: Optional[bool]) -> None:
+        """Free a slot; `throttled` None leaves the limit as it is."""
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(float(self.minimum), self.limit / 2)
+            elif throttled is not None:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class Throttle:
+    """
+    Client-side flow control shared by every request to one provider
+    model: optional requests-per-minute and tokens-per-minute buckets, an
+    AIMD concurrency limit, and retries with full-jitter exponential
+    backoff when the provider throttles anyway (`is_throttle`). Other
+    errors are raised at once.
+    """
+
+    def __init__(
+        self,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY_S,
+        max_delay: float = DEFAULT_MAX_DELAY_S,
+    ) -> None:
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.concurrency = AdaptiveLimit(max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttled = 0
+
+    def call(self, request: Callable[[], R], tokens: int = 0) -> R:
+        """Run the blocking `request` under the limits, retrying throttles."""
+        for attempt in range(self.max_retries + 1):
+            time.sleep(self._reserve(tokens))
+            self.concurrency.enter()
+            outcome: Optional[bool] = None
+            failure: Optional[Exception] = None
+            try:
+                result = request()
+                outcome = False
+            except Exception as exc:
+                outcome = True if is_throttle(exc) else None
+                failure = exc
+            finally:
+                # runs on KeyboardInterrupt too, so the slot is never lost
+                self.concurrency.leave(outcome)
+            if failure is None:
+                return result
+            time.sleep(self._backoff(failure, attempt))
+        raise AssertionError("unreachable")
+
+    async def acall(self, request: Callable[[], Awaitable[R]], tokens: int = 0) -> R:
+        """Async `call`: waits without blocking the event loop."""
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self._reserve(tokens))
+            while not self.concurrency.try_enter():
+                await asyncio.sleep(_POLL_S)
+            outcome: Optional[bool] = None
+            failure: Optional[Exception] = None
+            try:
+                result = await request()
+                outcome = False
+            except Exception as exc:
+                outcome = True if is_throttle(exc) else None
+                failure = exc
+            finally:
+                # runs on cancellation too (timeouts, task.cancel())
+                self.concurrency.leave(outcome)
+            if failure is None:
+                return result
+            await asyncio.sleep(self._backoff(failure, attempt))
+        raise AssertionError("unreachable")
+
+    def _reserve(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.reserve(1)
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        return wait
+
+    def _backoff(self, exc: Exception, attempt: int) -> float:
+        """Delay before retry `attempt + 1`; re-raises `exc` if it's final."""
+        if not is_throttle(exc) or attempt >= self.max_retries:
+            raise exc
+        self.throttled += 1
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        delay = max(delay, _retry_after(exc))
+        typer.secho(
+            f"⚠️  Throttled by provider; retry {attempt + 1}/{self.max_retries} "
+            f"in {delay:.1f}s (concurrency {self.concurrency.limit:.1f}).",
+            fg="yellow",
+            err=True,
+        )
+        return delay
+
+
+def is_throttle(exc: BaseException) -> bool:
+    """
+    True for provider rate-limit errors: HTTP 429 (OpenAI `RateLimitError`)
+    or a botocore `ClientError` with a throttling code. Checked by shape, so
+    neither SDK needs importing.
+    """
+    if getattr(exc, "code", None) == "insufficient_quota":
+        return False  # a 429 too, but waiting won't help
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    response = getattr(exc, "response", None)
+    if isinstance(response, dict):
+        error = response.get("Error") or {}
+        meta = response.get("ResponseMetadata") or {}
+        return error.get("Code") in THROTTLE_CODES or meta.get("HTTPStatusCode") == 429
+    return getattr(exc, "code", None) in THROTTLE_CODES
+
+
+def _retry_after(exc: BaseException) -> float:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    try:
+        return float(headers.get("retry-after", 0)) if headers is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def estimate_tokens(messages: Any, max_tokens: int = 0) -> int:
+    """
+    Rough token cost of a request for TPM accounting: ~4 characters per
+    prompt token, plus the completion budget providers reserve up front.
+    """
+    chars = sum(len(str(m.get("content", ""))) for m in messages or ())
+    return chars // 4 + max_tokens
+
+
+# ───── process-wide throttles ────────────────────────────────────
+
+_throttles: dict[str, Throttle] = {}
+_throttles_lock = threading.Lock()
+
+
+def get_throttle(key: str) -> Throttle:
+    """
+    The `Throttle` shared by every client of `key` (e.g. "openai:gpt-4.1"),
+    configured from the environment on first use:
+
+      $AI_RPM / $AI_TPM        – requests / tokens per minute (unset: no cap)
+      $AI_MAX_CONCURRENCY      – ceiling for the adaptive limit
+      $AI_MAX_RETRIES          – retries after a throttling error
+    """
+    with _throttles_lock:
+        if key not in _throttles:
+            retries = _env_number("AI_MAX_RETRIES")
+            _throttles[key] = Throttle(
+                rpm=_env_number("AI_RPM"),
+                tpm=_env_number("AI_TPM"),
+                max_concurrency=int(
+                    _env_number("AI_MAX_CONCURRENCY") or DEFAULT_MAX_CONCURRENCY
+                ),
+                max_retries=DEFAULT_MAX_RETRIES if retries is None else int(retries),
+            )
+        return _throttles[key]
+
+
+def _env_number(name: str) -> Optional[float]:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {raw!r}") from None
@@ -4,10 +4,20 @@ from sasori.ai.ai_client_factory import get_ai_client
 
 from sasori.db.process_file_db import (
     clear_processing_files,
+    stats_processing_files,
     summary_processing_files,
 )
-from sasori.db.shared_file_db import clear_shared_files, summary_shared_files
-from sasori.db.prompt_db import append_prompt, clear_prompts, summary_prompts
+from sasori.db.shared_file_db import (
+    clear_shared_files,
+    stats_shared_files,
+    summary_shared_files,
+)
+from sasori.db.prompt_db import (
+    append_prompt,
+    clear_prompts,
+    stats_prompts,
+    summary_prompts,
+)
 
 import typer
 import pyperclip
@@ -61,6 +71,14 @@ def preview():
     typer.echo(summary_processing_files())
 
 
+@app.command(name="stats")
+def stats():
+    """Show undo depth and on-disk size of every history."""
+    typer.echo(stats_prompts())
+    typer.echo(stats_shared_files())
+    typer.echo(stats_processing_files())
+
+
 @app.command(name="clipboard")
 def add_prompt_from_clipboard():
     append_prompt(_clipboard_get())
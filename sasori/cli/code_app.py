@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Callable, Iterable, Optional, OrderedDict
 
 from sasori.instruction.instructions.typer_log import TYPER_LOG_INSTRUCTION
 from sasori.instruction.instructions.mypy import MYPY_INSTRUCTION
@@ -13,7 +14,9 @@ from sasori.instruction.instructions.response_format import (
     RESPONSE_FORMAT_INSTRUCTION,
 )
 from sasori.instruction.instructions.unit_test import UNIT_TEST_INSTRUCTION
+from sasori.ai.ai_client import AIClient, PreparedContext
 from sasori.ai.ai_client_factory import get_ai_client
+from sasori.util.job_util import run_jobs
 from sasori.util.string_util import parse_code_response
 import typer
 
@@ -23,6 +26,55 @@ code_app = typer.Typer(
 )
 
 
+_JOBS_OPTION = typer.Option(
+    1,
+    "--jobs",
+    "-j",
+    min=1,
+    help="Files to process concurrently (results are still written one by one).",
+)
+
+
+# ───── batch runner ──────────────────────────────────────────────
+
+
+def run_batch(
+    files: Iterable[str],
+    generate: Callable[[str], Optional[OrderedDict[str, str]]],
+    force: bool,
+    jobs: int,
+    action: str,
+) -> None:
+    """
+    Run `generate` (AI request → parsed file map, or None to skip) for every
+    file with up to `jobs` requests in flight, writing each result through
+    `rewrite_files` from this thread as soon as it arrives, so confirmation
+    prompts never overlap.
+    """
+    for filepath, file_map, err in run_jobs(files, generate, jobs):
+        try:
+            if err is not None:
+                raise err
+            if file_map is not None:
+                rewrite_files(files=file_map, force=force)
+        except Exception as e:
+            typer.secho(
+                f"❌ Failed to {action} for {filepath!r}: {e}",
+                fg="red",
+                err=True,
+            )
+
+
+def _skip_init(filepath: str) -> bool:
+    if filepath.endswith("__init__.py"):
+        typer.secho(f"⚠️  Skipping __init__.py file: {filepath}", fg="yellow")
+        return True
+    return False
+
+
+# ───── commands ──────────────────────────────────────────────────
+
+
 @code_app.command("unit-test")
 def create_tests(
     force: bool = typer.Option(
@@ -30,36 +82,62 @@ def create_tests(
         "--force",
         help="Skip prompts and overwrite tests unconditionally.",
     ),
+    jobs: int = _JOBS_OPTION,
 ):
     repo_root = find_repo_root()
-    for filepath in get_processing_files():
-        try:
-            create_test(force, filepath, repo_root)
-        except Exception as e:
-            typer.secho(
-                f"❌ Failed to create test for {filepath!r}: {e}",
-                fg="red",
-                err=True,
-            )
+    ai_client = get_ai_client()
+    context = ai_client.prepare_context(
+        [RESPONSE_FORMAT_INSTRUCTION, UNIT_TEST_INSTRUCTION]
+    )
+    run_batch(
+        get_processing_files(),
+        lambda filepath: generate_test(filepath, repo_root, ai_client, context),
+        force,
+        jobs,
+        "create test",
+    )
 
 
-def create_test(force: bool, filepath: str, repo_root: Path):
-    if filepath.endswith("__init__.py"):
-        typer.secho(f"⚠️  Skipping __init__.py file: {filepath}", fg="yellow")
-        return
+def create_test(
+    force: bool,
+    filepath: str,
+    repo_root: Path,
+    ai_client: Optional[AIClient] = None,
+    context: Optional[PreparedContext] = None,
+):
+    """Generate and write the test for one source file."""
+    file_map = generate_test(filepath, repo_root, ai_client, context)
+    if file_map is not None:
+        rewrite_files(files=file_map, force=force)
+
+
+def generate_test(
+    filepath: str,
+    repo_root: Path,
+    ai_client: Optional[AIClient] = None,
+    context: Optional[PreparedContext] = None,
+) -> Optional[OrderedDict[str, str]]:
+    """
+    Ask for the test of one source file; None when the file is skipped. A
+    batch passes its `ai_client` and the `context` prepared for it, so
+    shared files are read once.
+    """
+    if _skip_init(filepath):
+        return None
     src = Path(filepath)
     dest = source_to_test_path(src, repo_root)
-    ai_client = get_ai_client()
+    if ai_client is None:
+        ai_client = get_ai_client()
+    if context is None:
+        context = ai_client.prepare_context(
+            [RESPONSE_FORMAT_INSTRUCTION, UNIT_TEST_INSTRUCTION]
+        )
     response = ai_client.send_message(
-        instructions=[
-            RESPONSE_FORMAT_INSTRUCTION,
-            UNIT_TEST_INSTRUCTION,
-        ],
+        context=context,
         prompt_files=[src, dest],
         final_prompt=f'Focus only on creating a test for "{filepath}"',
     )
-    file_map = parse_code_response(response)
-    rewrite_files(files=file_map, force=force)
+    return parse_code_response(response)
 
 
 @code_app.command("readme")
@@ -97,26 +175,20 @@ def fix_mypy_errors(
         "--force",
         help="Skip prompts and overwrite tests unconditionally.",
     ),
+    jobs: int = _JOBS_OPTION,
 ):
     ai_client = get_ai_client()
-    for filepath in get_processing_files():
-        try:
-            response = ai_client.send_message(
-                instructions=[
-                    RESPONSE_FORMAT_INSTRUCTION,
-                    MYPY_INSTRUCTION,
-                ],
-                prompt_files=[filepath],
-                final_prompt=f"Focus on fixing only mypy errors related to {filepath}",
-            )
-            file_map = parse_code_response(response)
-            rewrite_files(files=file_map, force=force)
-        except Exception as e:
-            typer.secho(
-                f"❌ Failed to fix mypy errors for {filepath!r}: {e}",
-                fg="red",
-                err=True,
-            )
+    context = ai_client.prepare_context([RESPONSE_FORMAT_INSTRUCTION, MYPY_INSTRUCTION])
+
+    def generate(filepath: str) -> OrderedDict[str, str]:
+        response = ai_client.send_message(
+            context=context,
+            prompt_files=[filepath],
+            final_prompt=f"Focus on fixing only mypy errors related to {filepath}",
+        )
+        return parse_code_response(response)
+
+    run_batch(get_processing_files(), generate, force, jobs, "fix mypy errors")
 
 
 @code_app.command("typer-log")
@@ -126,26 +198,21 @@ def improve_typer_logs(
         "--force",
         help="Skip prompts and overwrite tests unconditionally.",
     ),
+    jobs: int = _JOBS_OPTION,
 ):
     ai_client = get_ai_client()
-    for filepath in get_processing_files():
-        if filepath.endswith("__init__.py"):
-            typer.secho(f"⚠️  Skipping __init__.py file: {filepath}", fg="yellow")
-            continue
-        try:
-            response = ai_client.send_message(
-                instructions=[
-                    RESPONSE_FORMAT_INSTRUCTION,
-                    TYPER_LOG_INSTRUCTION,
-                ],
-                prompt_files=[filepath],
-                final_prompt=f"Focus on only {filepath}",
-            )
-            file_map = parse_code_response(response)
-            rewrite_files(files=file_map, force=force)
-        except Exception as e:
-            typer.secho(
-                f"❌ Failed to improve typer logs for {filepath!r}: {e}",
-                fg="red",
-                err=True,
-            )
+    context = ai_client.prepare_context(
+        [RESPONSE_FORMAT_INSTRUCTION, TYPER_LOG_INSTRUCTION]
+    )
+
+    def generate(filepath: str) -> Optional[OrderedDict[str, str]]:
+        if _skip_init(filepath):
+            return None
+        response = ai_client.send_message(
+            context=context,
+            prompt_files=[filepath],
+            final_prompt=f"Focus on only {filepath}",
+        )
+        return parse_code_response(response)
+
+    run_batch(get_processing_files(), generate, force, jobs, "improve typer logs")
@@ -1,22 +1,44 @@
 from sasori.db.shared_file_db import (
-    append_shared_file,
+    append_shared_files,
     clear_shared_files,
     remove_shared_file,
     summary_shared_files,
     undo_shared_files,
 )
 import typer
-from sasori.util.file_util import get_all_files
+from sasori.util.file_util import iter_files, resolve_path
+from sasori.util.walk_util import Walker
 
 file_app = typer.Typer(name="file", help="Manage your shared-file history")
 
 
 @file_app.command("add")
-def add_file(path: str = typer.Argument(..., help="Path to append")):
+def add_file(
+    path: str = typer.Argument(..., help="Path to append"),
+    walker: Walker = typer.Option(
+        Walker.WALK,
+        "--walker",
+        help="File discovery: 'walk' (os.walk), 'scandir' (parallel) or 'git'"
+        " (git index).",
+    ),
+    untracked: bool = typer.Option(
+        False,
+        "--untracked",
+        help="With --walker git, also add untracked files that are not ignored.",
+    ),
+    cache: bool = typer.Option(
+        False,
+        "--cache",
+        help="Reuse cached listings of directories whose mtime is unchanged.",
+    ),
+):
     """Append a file to the shared history."""
     try:
-        for file in get_all_files(path):
-            append_shared_file(file)
+        append_shared_files(
+            iter_files(
+                path, walker=walker, include_untracked=untracked, use_cache=cache
+            )
+        )
     except Exception as e:
         typer.secho(f"❌ Failed to add file(s): {e}", fg="red", err=True)
         raise
@@ -24,9 +46,12 @@ def add_file(path: str = typer.Argument(..., help="Path to append")):
 
 @file_app.command("remove")
 def remove_file(path: str = typer.Argument(..., help="Path to remove")):
-    """Remove a file from the shared history."""
+    """
+    Remove a file, or every shared file under a directory, from the shared
+    history (matched against the history itself; nothing is walked).
+    """
     try:
-        remove_shared_file(path)
+        remove_shared_file(resolve_path(path))
     except Exception as e:
         typer.secho(f"❌ Failed to remove file: {e}", fg="red", err=True)
         raise
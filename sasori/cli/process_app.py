@@ -1,28 +1,50 @@
 from sasori.db.process_file_db import (
-    append_processing_file,
+    append_processing_files,
     clear_processing_files,
     remove_processing_file,
     summary_processing_files,
     undo_processing_files,
 )
 import typer
-from sasori.util.file_util import get_all_files
+from sasori.util.file_util import iter_files, resolve_path
+from sasori.util.walk_util import Walker
 
 process_app = typer.Typer(name="process", help="Manage your processing-file history")
 
 
 @process_app.command("add")
-def add_file(path: str = typer.Argument(..., help="Path to append")):
+def add_file(
+    path: str = typer.Argument(..., help="Path to append"),
+    walker: Walker = typer.Option(
+        Walker.WALK,
+        "--walker",
+        help="File discovery: 'walk' (os.walk), 'scandir' (parallel) or 'git'"
+        " (git index).",
+    ),
+    untracked: bool = typer.Option(
+        False,
+        "--untracked",
+        help="With --walker git, also add untracked files that are not ignored.",
+    ),
+    cache: bool = typer.Option(
+        False,
+        "--cache",
+        help="Reuse cached listings of directories whose mtime is unchanged.",
+    ),
+):
     """Append a file to the processing queue."""
-    for file in get_all_files(path):
-        append_processing_file(file)
+    append_processing_files(
+        iter_files(path, walker=walker, include_untracked=untracked, use_cache=cache)
+    )
 
 
 @process_app.command("remove")
 def remove_file(path: str = typer.Argument(..., help="Path to remove")):
-    """Remove a file from the processing queue."""
-    for file in get_all_files(path):
-        remove_processing_file(file)
+    """
+    Remove a file, or every queued file under a directory, from the
+    processing queue (matched against the queue itself; nothing is walked).
+    """
+    remove_processing_file(resolve_path(path))
 
 
 @process_app.command("clear")
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence
+
+import typer
+from sasori.db.history_codec import HistoryCodec
+from sasori.db.history_db import HistoryDB
+
+DEFAULT_CHECKPOINT_EVERY = 50
+_VERSION = 1
+
+Entry = dict[str, List[str]]
+
+
+class DeltaHistoryDB(HistoryDB[List[str]]):
+    """
+    History of list snapshots stored as checkpoints plus add/remove deltas.
+
+    The file holds the materialised latest snapshot (`head`) and a list of
+    entries, each either a full checkpoint `{"=": [...]}` or a delta
+    `{"+": added, "-": removed}`. A checkpoint is written every
+    `checkpoint_every` deltas, and instead of any delta that would not
+    round-trip exactly (e.g. a reordered prompt list) or would be larger
+    than the snapshot itself.
+
+    `latest()` returns `head` without replaying anything; `undo()` applies
+    the inverse of the last delta and only replays from the previous
+    checkpoint when the entry it pops is itself a checkpoint.
+    """
+
+    FILE_SUFFIX = ".delta.json"
+
+    def __init__(
+        self,
+        file_path: Path,
+        *,
+        empty: List[str],
+        normalise: Optional[Callable[[List[str]], List[str]]] = None,
+        pretty: Optional[Callable[[List[str]], str]] = None,
+        codec: Optional[HistoryCodec] = None,
+        max_depth: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    ) -> None:
+        self._checkpoint_every = max(1, checkpoint_every)
+        super().__init__(
+            file_path,
+            empty=empty,
+            normalise=normalise,
+            pretty=pretty,
+            codec=codec,
+            max_depth=max_depth,
+            max_bytes=max_bytes,
+        )
+
+    # ───── public API ────────────────────────────────────────────────
+
+    def latest(self) -> List[str]:
+        return self._load_doc()["head"]
+
+    def push(self, snapshot: List[str]) -> None:
+        new = self._normalise(snapshot)
+        with self.locked():
+            # copies: the loaded doc may be the cache's, and a failed save
+            # must leave it untouched
+            doc = dict(self._load_doc())
+            entries = doc["entries"] = list(doc["entries"])
+            entries.append(self._entry(doc["head"], new, _since_checkpoint(entries)))
+            doc["head"] = new
+            self._save_doc(doc)
+
+    def undo(self) -> bool:
+        with self.locked():
+            doc = dict(self._load_doc())
+            entries = doc["entries"] = list(doc["entries"])
+            if len(entries) <= 1:
+                typer.secho("⚠️  No more snapshots to undo.", fg="yellow")
+                return False
+            entry = entries.pop()
+            if "=" in entry:
+                doc["head"] = self._replay(entries)
+            else:
+                doc["head"] = self._apply(doc["head"], entry["+"], entry["-"])
+            self._save_doc(doc)
+            return True
+
+    def depth(self) -> int:
+        return len(self._load_doc()["entries"])
+
+    # ───── encoding ──────────────────────────────────────────────────
+
+    def _apply(
+        self, snapshot: Sequence[str], drop: Sequence[str], add: Sequence[str]
+    ) -> List[str]:
+        gone = set(drop)
+        return self._normalise([x for x in snapshot if x not in gone] + list(add))
+
+    def _entry(self, old: List[str], new: List[str], since: int) -> Entry:
+        """Delta from `old` to `new`, or a checkpoint when a delta won't do."""
+        if since >= self._checkpoint_every:
+            return {"=": new}
+        old_set, new_set = set(old), set(new)
+        added = [x for x in new if x not in old_set]
+        removed = [x for x in old if x not in new_set]
+        if (
+            len(added) + len(removed) > len(new)
+            or self._apply(old, removed, added) != new
+            or self._apply(new, added, removed) != old
+        ):
+            return {"=": new}
+        return {"+": added, "-": removed}
+
+    def _replay(self, entries: List[Entry]) -> List[str]:
+        """Rebuild the last snapshot from the newest checkpoint onwards."""
+        start = len(entries) - 1 - _since_checkpoint(entries)
+        snapshot = entries[start]["="]
+        for entry in entries[start + 1 :]:
+            snapshot = self._apply(snapshot, entry["-"], entry["+"])
+        return snapshot
+
+    def _trimmed(self, doc: dict[str, Any], keep: int) -> dict[str, Any]:
+        """`doc` with only its newest `keep` entries, the oldest a checkpoint."""
+        entries = doc["entries"]
+        if keep >= len(entries):
+            return doc
+        start = len(entries) - keep
+        base = self._replay(entries[: start + 1])
+        return {**doc, "entries": [{"=": base}] + entries[start + 1 :]}
+
+    def _encode(self, history: List[List[str]]) -> dict[str, Any]:
+        entries: List[Entry] = []
+        head: Optional[List[str]] = None
+        for snapshot in history:
+            entries.append(
+                {"=": snapshot}
+                if head is None
+                else self._entry(head, snapshot, _since_checkpoint(entries))
+            )
+            head = snapshot
+        return {"version": _VERSION, "head": head, "entries": entries}
+
+    # ───── private helpers ───────────────────────────────────────────
+
+    def _load(self) -> List[List[str]]:
+        """Expand every snapshot (O(history); the public API never needs it)."""
+        history: List[List[str]] = []
+        for entry in self._load_doc()["entries"]:
+            history.append(
+                entry["="]
+                if "=" in entry
+                else self._apply(history[-1], entry["-"], entry["+"])
+            )
+        return history
+
+    def _save(self, history: List[List[str]]) -> None:
+        self._save_doc(self._encode(history))
+
+    def _load_doc(self) -> dict[str, Any]:
+        try:
+            doc = self._read()
+            if not isinstance(doc, dict) or doc.get("version") != _VERSION:
+                raise ValueError("not a delta history file")
+            return doc
+        except FileNotFoundError:
+            return self._encode([self._empty])
+        except Exception as e:
+            typer.secho(
+                f"⚠️  Failed to load {self._file.name}; resetting. Error: {e}",
+                fg="yellow",
+                err=True,
+            )
+            return self._encode([self._empty])
+
+    def _save_doc(self, doc: dict[str, Any]) -> None:
+        try:
+            keep, data = self._fit(
+                len(doc["entries"]),
+                lambda k: self._codec.encode(self._trimmed(doc, k)),
+            )
+            self._write(self._trimmed(doc, keep), data)
+        except Exception as e:
+            typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+
+
+def _since_checkpoint(entries: List[Entry]) -> int:
+    """Number of deltas after the newest checkpoint."""
+    count = 0
+    for entry in reversed(entries):
+        if "=" in entry:
+            break
+        count += 1
+    return count
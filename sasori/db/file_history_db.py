@@ -1,24 +1,65 @@
 from __future__ import annotations
 
+import os
+from bisect import bisect_left, insort
+from functools import cached_property
+from typing import Iterable, Optional, Sequence
+
 import typer
+from sasori.db.history_codec import HistoryCodec
 from sasori.db.history_db import HistoryDB
+from sasori.db.history_db_factory import get_history_db
+from sasori.db.sqlite_history_db import SQLiteHistoryDB
 from sasori.util.session_util import create_session_file
 
 
 class FileHistoryStore:
-    def __init__(self, name: str, pretty_label: str):
+    """
+    History of a set of file paths, stored as a sorted list.
+
+    Keeping the snapshot sorted makes membership a binary search and puts a
+    directory's descendants in one contiguous slice, so `remove(dir)` drops
+    a whole subtree with two bisections and no directory walk. On most
+    backends a change still reads the latest snapshot and pushes a new one
+    (O(N)); on SQLite, lookups and changes go straight to the indexed rows
+    (O(log N) per path) and the snapshot is never materialised.
+    """
+
+    def __init__(
+        self, name: str, pretty_label: str, codec: Optional[HistoryCodec] = None
+    ):
         self.name = name
-        self._db: HistoryDB[list[str]] = HistoryDB(
-            create_session_file(name),
+        self._pretty_label = pretty_label
+        self._codec = codec
+
+    @cached_property
+    def _db(self) -> HistoryDB[list[str]]:
+        """Opened on first use, so importing a store resolves nothing."""
+        label = self._pretty_label
+        return get_history_db(
+            create_session_file(self.name),
             empty=[],
             normalise=lambda lst: sorted({p.strip() for p in lst if p.strip()}),
             pretty=lambda lst: (
-                f"{pretty_label}:\n" + "\n".join(f"- {p}" for p in lst) or "(none)"
+                f"{label}:\n" + "\n".join(f"- {p}" for p in lst) or "(none)"
             ),
+            codec=self._codec,
         )
 
     def _snap(self) -> list[str]:
-        return list(self._db.latest())
+        """Mutable, sorted copy of the latest snapshot (O(N) when sorted)."""
+        return sorted(self._db.latest())
+
+    @property
+    def _rows(self) -> Optional[SQLiteHistoryDB]:
+        """The backend, if it can look up and change single paths in place."""
+        return self._db if isinstance(self._db, SQLiteHistoryDB) else None
+
+    def contains(self, path: str) -> bool:
+        p = path.strip()
+        if self._rows is not None:
+            return self._rows.contains(p)
+        return _index(self._db.latest(), p) is not None
 
     def clear(self) -> None:
         self._db.clear()
@@ -28,25 +69,87 @@ class FileHistoryStore:
         if not p:
             typer.secho("⚠️  Empty path — nothing added.", fg="yellow")
             return
-        files = self._snap()
-        if p in files:
-            typer.secho(f"⚠️  Path already present: {p}", fg="yellow")
+        if self._rows is not None:
+            if not self._rows.add_items([p]):
+                typer.secho(f"⚠️  Path already present: {p}", fg="yellow")
             return
-        files.append(p)
-        self._db.push(files)
+        with self._db.locked():
+            files = self._snap()
+            if _index(files, p) is not None:
+                typer.secho(f"⚠️  Path already present: {p}", fg="yellow")
+                return
+            insort(files, p)
+            self._db.push(files)
 
-    def remove(self, path: str) -> None:
+    def remove(self, path: str) -> int:
+        """
+        Stop tracking `path`; a directory drops every tracked path under it.
+        Returns the number of paths removed.
+        """
         p = path.strip()
         if not p:
             typer.secho("⚠️  Empty path — nothing removed.", fg="yellow")
-            return
-        files = self._snap()
-        try:
-            files.remove(p)
-        except ValueError:
+            return 0
+        if self._rows is not None:
+            removed = self._rows.remove_items(
+                [p.rstrip(os.sep) or p], [_subtree_bounds(p)]
+            )
+        else:
+            with self._db.locked():
+                files = self._snap()
+                i = _index(files, p.rstrip(os.sep) or p)
+                lo, hi = _subtree(files, p)
+                removed = hi - lo + (i is not None)
+                if removed:
+                    if i is not None:
+                        # an exact match sorts before its own subtree
+                        del files[i]
+                        lo, hi = lo - 1, hi - 1
+                    del files[lo:hi]
+                    self._db.push(files)
+        if not removed:
             typer.secho(f"⚠️  Path not tracked: {p}", fg="yellow")
-            return
-        self._db.push(files)
+        return removed
+
+    def append_many(self, paths: Iterable[str]) -> int:
+        """
+        Add every new path in one snapshot (a single load/save). `paths` is
+        drained before the history is locked, so a slow directory walk never
+        holds the lock. Returns the number of paths added.
+        """
+        incoming = dict.fromkeys(p for p in (path.strip() for path in paths) if p)
+        if self._rows is not None:
+            added = self._rows.add_items(incoming)
+        else:
+            with self._db.locked():
+                files = self._snap()
+                known = set(files)
+                new = [p for p in incoming if p not in known]
+                if new:
+                    self._db.push(files + new)
+                added = len(new)
+        if not added:
+            typer.secho("⚠️  No new paths to add.", fg="yellow")
+        return added
+
+    def remove_many(self, paths: Iterable[str]) -> int:
+        """
+        Drop every tracked path in `paths` in one snapshot. Returns the
+        number of paths removed.
+        """
+        wanted = {p.strip() for p in paths}
+        if self._rows is not None:
+            removed = self._rows.remove_items(wanted)
+        else:
+            with self._db.locked():
+                files = self._snap()
+                drop = {p for p in wanted if _index(files, p) is not None}
+                if drop:
+                    self._db.push([p for p in files if p not in drop])
+                removed = len(drop)
+        if not removed:
+            typer.secho("⚠️  None of the paths are tracked.", fg="yellow")
+        return removed
 
     def undo(self) -> None:
         if self._db.undo():
@@ -57,5 +160,33 @@ class FileHistoryStore:
     def summary(self) -> str:
         return self._db.summary()
 
-    def latest_set(self) -> set[str]:
-        return set(self._db.latest())
+    def stats(self) -> str:
+        return self._db.stats()
+
+    def latest(self) -> Sequence[str]:
+        """
+        The tracked paths, sorted and unique. This is the backend's own
+        (possibly cached) snapshot, so treat it as read-only.
+        """
+        return self._db.latest()
+
+
+def _index(files: list[str], path: str) -> Optional[int]:
+    """Position of `path` in sorted `files`, or None."""
+    i = bisect_left(files, path)
+    return i if i < len(files) and files[i] == path else None
+
+
+def _subtree_bounds(path: str) -> tuple[str, str]:
+    """`[lo, hi)` holding exactly the paths strictly under `path`."""
+    base = path if path.endswith(os.sep) else path + os.sep
+    # every path under `base` sorts before `base` with its separator bumped
+    # by one character (e.g. "src/" .. "src0")
+    return base, base[:-1] + chr(ord(os.sep) + 1)
+
+
+def _subtree(files: list[str], path: str) -> tuple[int, int]:
+    """Slice of sorted `files` holding the paths strictly under `path`."""
+    lo_path, hi_path = _subtree_bounds(path)
+    lo = bisect_left(files, lo_path)
+    return lo, bisect_left(files, hi_path, lo)
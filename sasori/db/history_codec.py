@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import lzma
+import zlib
+from typing import Any, Literal, Optional
+
+Compression = Literal["zlib", "lzma"]
+
+# marks a front-coded list of strings: {"\u0000fc": [n, suffix, n, suffix, …]}
+_FRONT = "\x00fc"
+_FRONT_JSON = b'"\\u0000fc"'
+_LZMA_MAGIC = b"\xfd7zXZ\x00"
+
+
+class HistoryCodec:
+    """
+    Turns a history document into bytes and back; the default codec,
+    writing indented, human-readable JSON.
+
+    Decoding is shared by every codec and sniffs the format, so a store can
+    switch codecs without losing the history it wrote before.
+    """
+
+    name = "json"
+
+    def pack(self, doc: Any) -> Any:
+        """JSON-safe form of `doc` as this codec stores it."""
+        return doc
+
+    def encode(self, doc: Any) -> bytes:
+        return json.dumps(self.pack(doc), indent=2).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return unpack_doc(_decompress(data))
+
+
+class CompactCodec(HistoryCodec):
+    """
+    Compact encoding for large path lists: no indentation, every list of
+    strings front-coded (each item stores only what differs from the
+    previous one), and optionally `zlib` or `lzma` compression on top.
+    """
+
+    def __init__(self, compression: Optional[Compression] = None) -> None:
+        if compression not in (None, "zlib", "lzma"):
+            raise ValueError(f"Unsupported compression '{compression}'")
+        self.compression = compression
+        self.name = f"compact+{compression}" if compression else "compact"
+
+    def pack(self, doc: Any) -> Any:
+        if isinstance(doc, list):
+            if len(doc) > 1 and all(isinstance(x, str) for x in doc):
+                return {_FRONT: _front_code(doc)}
+            return [self.pack(x) for x in doc]
+        if isinstance(doc, dict):
+            return {k: self.pack(v) for k, v in doc.items()}
+        return doc
+
+    def encode(self, doc: Any) -> bytes:
+        data = json.dumps(
+            self.pack(doc), separators=(",", ":"), ensure_ascii=False
+        ).encode("utf-8")
+        if self.compression == "zlib":
+            return zlib.compress(data)
+        if self.compression == "lzma":
+            return lzma.compress(data)
+        return data
+
+
+def unpack_doc(data: bytes) -> Any:
+    """Parse JSON `data`, expanding any front-coded lists."""
+    doc = json.loads(data)
+    return _unpack(doc) if _FRONT_JSON in data else doc
+
+
+def _unpack(doc: Any) -> Any:
+    if isinstance(doc, dict):
+        if len(doc) == 1 and _FRONT in doc:
+            return _front_decode(doc[_FRONT])
+        return {k: _unpack(v) for k, v in doc.items()}
+    if isinstance(doc, list):
+        return [_unpack(x) for x in doc]
+    return doc
+
+
+def _front_code(items: list[str]) -> list[Any]:
+    flat: list[Any] = []
+    prev = ""
+    for item in items:
+        n = _shared_prefix(prev, item)
+        flat += (n, item[n:])
+        prev = item
+    return flat
+
+
+def _shared_prefix(a: str, b: str) -> int:
+    """Length of the common prefix, by binary search over slice compares."""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _front_decode(flat: list[Any]) -> list[str]:
+    items: list[str] = []
+    prev = ""
+    for i in range(0, len(flat), 2):
+        prev = prev[: flat[i]] + flat[i + 1]
+        items.append(prev)
+    return items
+
+
+def _decompress(data: bytes) -> bytes:
+    if data.startswith(_LZMA_MAGIC):
+        return lzma.decompress(data)
+    # zlib header: CMF 0x78 and (CMF·256 + FLG) divisible by 31
+    if len(data) > 1 and data[0] == 0x78 and (data[0] * 256 + data[1]) % 31 == 0:
+        return zlib.decompress(data)
+    return data
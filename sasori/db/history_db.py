@@ -1,8 +1,13 @@
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, Generic, List, Optional, TypeVar
+from typing import Any, Callable, Generic, Iterator, List, Optional, TypeVar
 import typer
 
+from sasori.db.history_codec import HistoryCodec
+from sasori.util.lock_util import ReentrantFileLock
+
 T = TypeVar("T")
 
 
@@ -10,8 +15,31 @@ class HistoryDB(Generic[T]):
     """
     JSON-file-backed stack of snapshots.
     `push()` adds a new snapshot; `undo()` pops the latest one.
+    `codec` decides the on-disk encoding (indented JSON by default).
+
+    The decoded file is cached per instance and keyed on the file's
+    mtime, size and inode, so repeated reads of an unchanged history skip
+    the load; this process's own writes refresh the cache. Every write
+    replaces the file, so the inode tells rewrites apart even within one
+    mtime tick on coarse-grained filesystems. Snapshots returned
+    from the cache are shared, so callers copy before mutating them.
+    `loads` / `loads_avoided` count real and skipped reads.
+
+    Writers hold an exclusive `flock` on `<file>.lock` and replace the file
+    atomically (temp file + `os.replace`), so concurrent processes never
+    interleave updates and readers never see a half-written file.
+
+    `max_depth` caps how many snapshots are kept and `max_bytes` the encoded
+    file size; the oldest snapshots are pruned on save (the latest one is
+    always kept), which also bounds how far `undo()` can go back.
+
+    Nothing touches disk until the first write: reading a history whose file
+    doesn't exist yet gives the empty snapshot, and the first `locked()`
+    section creates the file (and its directory) with that snapshot.
     """
 
+    FILE_SUFFIX = ".json"
+
     def __init__(
         self,
         file_path: Path,
@@ -19,16 +47,22 @@ class HistoryDB(Generic[T]):
         empty: T,
         normalise: Optional[Callable[[T], T]] = None,
         pretty: Optional[Callable[[T], str]] = None,
+        codec: Optional[HistoryCodec] = None,
+        max_depth: Optional[int] = None,
+        max_bytes: Optional[int] = None,
     ) -> None:
         self._file = file_path
+        self._codec = codec or HistoryCodec()
+        self._max_depth = max_depth
+        self._max_bytes = max_bytes
         self._empty = empty
         self._normalise = normalise or (lambda x: x)
         self._pretty = pretty or json.dumps
-
-        # bootstrap file with one empty snapshot
-        if not self._file.exists():
-            self._save([self._empty])
-            typer.secho(f"☑️ History file created: {self._file}", fg="green")
+        self._cache: Optional[tuple[tuple[int, int, int], Any]] = None
+        self.loads = 0
+        self.loads_avoided = 0
+        self._lock = ReentrantFileLock(self._file.with_name(self._file.name + ".lock"))
+        self._ready = False
 
     # ───── public API ────────────────────────────────────────────────
 
@@ -36,31 +70,75 @@ class HistoryDB(Generic[T]):
         return self._load()[-1]
 
     def push(self, snapshot: T) -> None:
-        history = self._load()
-        history.append(self._normalise(snapshot))
-        self._save(history)
+        with self.locked():
+            history = list(self._load())  # the loaded list may be the cache's
+            history.append(self._normalise(snapshot))
+            self._save(history)
 
     def undo(self) -> bool:
-        history = self._load()
-        if len(history) <= 1:
-            typer.secho("⚠️  No more snapshots to undo.", fg="yellow")
-            return False
-        history.pop()
-        self._save(history)
-        return True
+        with self.locked():
+            history = list(self._load())
+            if len(history) <= 1:
+                typer.secho("⚠️  No more snapshots to undo.", fg="yellow")
+                return False
+            history.pop()
+            self._save(history)
+            return True
 
     def clear(self) -> None:
-        self._save([self._empty])
+        with self.locked():
+            self._save([self._empty])
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Exclusive, re-entrant lock on this history across processes. Wrap a
+        whole read-modify-write (`latest()` … `push()`) in it so concurrent
+        writers can't lose each other's updates.
+        """
+        self._bootstrap()
+        with self._lock():
+            yield
 
     def summary(self) -> str:
         return self._pretty(self.latest())
 
+    def depth(self) -> int:
+        """Number of stored snapshots (the latest included)."""
+        return len(self._load())
+
+    def size_bytes(self) -> int:
+        """Bytes the history takes on disk."""
+        try:
+            return os.stat(self._file).st_size
+        except OSError:
+            return 0
+
+    def stats(self) -> str:
+        depth = f"{self.depth()}" + (f"/{self._max_depth}" if self._max_depth else "")
+        size = f"{self.size_bytes():,}" + (
+            f"/{self._max_bytes:,}" if self._max_bytes else ""
+        )
+        return f"🗄️  {self._file.name}: {depth} snapshot(s), {size} bytes"
+
     # ───── private helpers ───────────────────────────────────────────
 
+    def _bootstrap(self) -> None:
+        """Create the file with one empty snapshot, once, before a write."""
+        if self._ready:
+            return
+        self._file.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock():
+            if not self._file.exists():
+                self._save([self._empty])
+                typer.secho(f"☑️ History file created: {self._file}", fg="green")
+        self._ready = True
+
     def _load(self) -> List[T]:
         try:
-            with open(self._file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return self._read()
+        except FileNotFoundError:
+            return [self._empty]
         except Exception as e:
             typer.secho(
                 f"⚠️  Failed to load {self._file.name}; resetting. Error: {e}",
@@ -71,7 +149,83 @@ class HistoryDB(Generic[T]):
 
     def _save(self, history: List[T]) -> None:
         try:
-            with open(self._file, "w", encoding="utf-8") as f:
-                json.dump(history, f, indent=2)
+            keep, data = self._fit(
+                len(history), lambda k: self._codec.encode(history[-k:])
+            )
+            self._write(history[-keep:], data)
         except Exception as e:
             typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+
+    def _read(self) -> Any:
+        """Decode the whole history file (raises on a missing/corrupt file)."""
+        return self._cached(self._read_file)
+
+    def _read_file(self) -> Any:
+        with open(self._file, "rb") as f:
+            return self._codec.decode(f.read())
+
+    def _write(self, doc: Any, data: Optional[bytes] = None) -> None:
+        """
+        Write `doc` (already encoded as `data`, if given) as the whole
+        history file (raises on failure).
+        """
+        self._cache = None
+        self._replace_file(self._codec.encode(doc) if data is None else data)
+        self._remember(doc)
+
+    def _replace_file(self, data: bytes) -> None:
+        """Write `data` to a temp file, fsync it, then rename it over the file."""
+        tmp = self._file.with_name(self._file.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._file)
+
+    def _fit(self, count: int, encode: Callable[[int], bytes]) -> tuple[int, bytes]:
+        """
+        How many of the newest `count` items to keep, and their encoding
+        (`encode(k)` encodes the newest `k`), so that at most `max_depth`
+        items remain and the encoding fits in `max_bytes`. At least one item
+        is always kept.
+        """
+        keep = min(count, self._max_depth) if self._max_depth else count
+        data = encode(keep)
+        while self._max_bytes and len(data) > self._max_bytes and keep > 1:
+            # drop roughly the overflowing share, at least one item per round
+            drop = max(1, int(keep * (1 - self._max_bytes / len(data))))
+            keep = max(1, keep - drop)
+            data = encode(keep)
+        return keep, data
+
+    # ───── read cache ────────────────────────────────────────────────
+
+    def _cache_peek(self) -> Any:
+        """The cached document if the file is unchanged since, else None."""
+        if self._cache is not None and self._cache[0] == _stat_key(self._file):
+            return self._cache[1]
+        return None
+
+    def _cached(self, load: Callable[[], Any]) -> Any:
+        """Return the cached document, or `load()` it and cache it."""
+        key = _stat_key(self._file)
+        if key is not None and self._cache is not None and self._cache[0] == key:
+            self.loads_avoided += 1
+            return self._cache[1]
+        doc = load()
+        self.loads += 1
+        self._cache = None if key is None else (key, doc)
+        return doc
+
+    def _remember(self, doc: Any) -> None:
+        """Cache `doc` as the file's content right after writing it."""
+        key = _stat_key(self._file)
+        self._cache = None if key is None else (key, doc)
+
+
+def _stat_key(path: Path) -> Optional[tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
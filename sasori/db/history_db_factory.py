@@ -0,0 +1,101 @@
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+import typer
+
+from sasori.db.delta_history_db import DeltaHistoryDB
+from sasori.db.history_codec import CompactCodec, HistoryCodec
+from sasori.db.history_db import HistoryDB
+from sasori.db.journal_history_db import JournalHistoryDB
+from sasori.db.sqlite_history_db import SQLiteHistoryDB
+
+DEFAULT_HISTORY_BACKEND = "json"
+DEFAULT_HISTORY_CODEC = "json"
+DEFAULT_MAX_DEPTH = 100
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+HISTORY_BACKENDS: dict[str, type[HistoryDB[list[str]]]] = {
+    "json": HistoryDB,
+    "delta": DeltaHistoryDB,
+    "journal": JournalHistoryDB,
+    "sqlite": SQLiteHistoryDB,
+}
+
+HISTORY_CODECS: dict[str, Callable[[], HistoryCodec]] = {
+    "json": HistoryCodec,
+    "compact": CompactCodec,
+    "compact+zlib": lambda: CompactCodec("zlib"),
+    "compact+lzma": lambda: CompactCodec("lzma"),
+}
+
+
+def get_history_db(
+    file_path: Path,
+    *,
+    empty: list[str],
+    normalise: Optional[Callable[[list[str]], list[str]]] = None,
+    pretty: Optional[Callable[[list[str]], str]] = None,
+    codec: Optional[HistoryCodec] = None,
+) -> HistoryDB[list[str]]:
+    """
+    Open the history at `file_path` with the backend named by
+    $HISTORY_BACKEND (default: json). Each backend keeps its own file
+    suffix, so switching backends never misreads another one's file.
+    $HISTORY_MAX_DEPTH / $HISTORY_MAX_BYTES override the pruning limits
+    (0 disables a limit). Without an explicit `codec`, $HISTORY_CODEC picks
+    the encoding (default: indented json); every codec reads the others'
+    files.
+    """
+    backend = (os.getenv("HISTORY_BACKEND") or DEFAULT_HISTORY_BACKEND).strip().lower()
+    try:
+        db_cls = HISTORY_BACKENDS[backend]
+    except KeyError as exc:
+        typer.secho(
+            f'❌  Unsupported HISTORY_BACKEND "{backend}". '
+            f"Supported: {list(HISTORY_BACKENDS.keys())}",
+            fg="red",
+            err=True,
+        )
+        raise ValueError(
+            f"❌ Unsupported HISTORY_BACKEND '{backend}'. "
+            f"Supported: {list(HISTORY_BACKENDS.keys())}"
+        ) from exc
+    return db_cls(
+        file_path.with_suffix(db_cls.FILE_SUFFIX),
+        empty=empty,
+        normalise=normalise,
+        pretty=pretty,
+        codec=codec or _env_codec(),
+        max_depth=_env_limit("HISTORY_MAX_DEPTH", DEFAULT_MAX_DEPTH),
+        max_bytes=_env_limit("HISTORY_MAX_BYTES", DEFAULT_MAX_BYTES),
+    )
+
+
+def _env_codec() -> HistoryCodec:
+    name = (os.getenv("HISTORY_CODEC") or DEFAULT_HISTORY_CODEC).strip().lower()
+    try:
+        return HISTORY_CODECS[name]()
+    except KeyError as exc:
+        typer.secho(
+            f'❌  Unsupported HISTORY_CODEC "{name}". '
+            f"Supported: {list(HISTORY_CODECS.keys())}",
+            fg="red",
+            err=True,
+        )
+        raise ValueError(
+            f"❌ Unsupported HISTORY_CODEC '{name}'. "
+            f"Supported: {list(HISTORY_CODECS.keys())}"
+        ) from exc
+
+
+def _env_limit(name: str, default: int) -> Optional[int]:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        typer.secho(f'❌  {name} must be an integer, got "{raw}".', fg="red", err=True)
+        raise ValueError(f"❌ {name} must be an integer, got '{raw}'.") from exc
+    return value if value > 0 else None
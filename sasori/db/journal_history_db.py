@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import IO, Any, Callable, List, Optional
+
+import typer
+from sasori.db.history_codec import HistoryCodec, unpack_doc
+from sasori.db.history_db import HistoryDB
+
+DEFAULT_COMPACT_AFTER = 100
+_TAIL_CHUNK = 64 * 1024
+
+
+class JournalHistoryDB(HistoryDB[List[str]]):
+    """
+    History kept as an append-only JSON-lines journal.
+
+    `push()` appends one `{"push": snapshot}` line and `undo()` appends an
+    `{"undo": true}` tombstone, so neither rewrites earlier snapshots.
+    Replaying the journal rebuilds the stack. Once `compact_after` lines are
+    dead (undone pushes plus their tombstones), `undo()` rewrites the
+    journal with only the live stack. Compaction also applies `max_depth` /
+    `max_bytes`; `push()` triggers it once the file outgrows `max_bytes` (or,
+    when the stack is cached, `max_depth`).
+
+    A torn last line left by a crash mid-append is ignored when reading and
+    cut off before the next append. Lines are always plain JSON: a codec's
+    packing (e.g. front coding) applies per line, its compression does not.
+    """
+
+    FILE_SUFFIX = ".jsonl"
+
+    def __init__(
+        self,
+        file_path: Path,
+        *,
+        empty: List[str],
+        normalise: Optional[Callable[[List[str]], List[str]]] = None,
+        pretty: Optional[Callable[[List[str]], str]] = None,
+        codec: Optional[HistoryCodec] = None,
+        max_depth: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        compact_after: int = DEFAULT_COMPACT_AFTER,
+    ) -> None:
+        self._compact_after = max(1, compact_after)
+        super().__init__(
+            file_path,
+            empty=empty,
+            normalise=normalise,
+            pretty=pretty,
+            codec=codec,
+            max_depth=max_depth,
+            max_bytes=max_bytes,
+        )
+
+    # ───── public API ────────────────────────────────────────────────
+
+    def push(self, snapshot: List[str]) -> None:
+        new = self._normalise(snapshot)
+        with self.locked():
+            cached = self._cache_peek()
+            size = self._append({"push": new})
+            if size is None:
+                return
+            depth = 0
+            if cached is not None:
+                stack, lines = cached
+                depth = len(stack) + 1
+                self._remember((stack + [new], lines + 1))
+            if (self._max_bytes and size > self._max_bytes) or (
+                self._max_depth and depth > self._max_depth
+            ):
+                self._save(self._scan()[0])
+
+    def undo(self) -> bool:
+        with self.locked():
+            stack, lines = self._scan()
+            if len(stack) <= 1:
+                typer.secho("⚠️  No more snapshots to undo.", fg="yellow")
+                return False
+            stack = stack[:-1]
+            if lines + 1 - len(stack) >= self._compact_after or (
+                self._max_depth and len(stack) > self._max_depth
+            ):
+                self._save(stack)
+            elif self._append({"undo": True}) is not None:
+                self._remember((stack, lines + 1))
+            return True
+
+    def depth(self) -> int:
+        return len(self._scan()[0])
+
+    # ───── private helpers ───────────────────────────────────────────
+
+    def _scan(self) -> tuple[List[List[str]], int]:
+        """Replay the journal: (live stack, number of complete lines)."""
+        try:
+            return self._cached(self._replay)
+        except FileNotFoundError:
+            return [self._empty], 0
+        except Exception as e:
+            typer.secho(
+                f"⚠️  Failed to load {self._file.name}; resetting. Error: {e}",
+                fg="yellow",
+                err=True,
+            )
+            return [self._empty], 0
+
+    def _replay(self) -> tuple[List[List[str]], int]:
+        with open(self._file, "rb") as f:
+            data = f.read()
+        stack: List[List[str]] = []
+        # anything after the last newline is a torn append: skip it
+        lines = data.split(b"\n")[:-1]
+        for raw in lines:
+            record = unpack_doc(raw)
+            if "push" in record:
+                stack.append(record["push"])
+            elif record.get("undo") and len(stack) > 1:
+                stack.pop()
+        if not stack:
+            raise ValueError("journal holds no snapshot")
+        return stack, len(lines)
+
+    def _load(self) -> List[List[str]]:
+        return self._scan()[0]
+
+    def _save(self, history: List[List[str]]) -> None:
+        """Rewrite (compact) the journal to hold exactly `history`."""
+        self._cache = None
+        try:
+            lines = [self._line({"push": snap}) for snap in history]
+            keep, data = self._fit(len(lines), lambda k: b"".join(lines[-k:]))
+            self._replace_file(data)
+            self._remember((history[-keep:], keep))
+        except Exception as e:
+            typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+
+    def _append(self, record: dict[str, Any]) -> Optional[int]:
+        """Append one record; returns the new file size (None on failure)."""
+        self._cache = None
+        try:
+            with open(self._file, "a+b") as f:
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b"\n":
+                        f.truncate(_complete_end(f, end))
+                f.write(self._line(record))
+                return f.tell()
+        except Exception as e:
+            typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+            return None
+
+    def _line(self, record: dict[str, Any]) -> bytes:
+        """One journal line; the codec's packing applies, compression doesn't."""
+        packed = self._codec.pack(record)
+        return (json.dumps(packed, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _complete_end(f: IO[bytes], end: int) -> int:
+    """Offset just past the last newline before `end` (0 if there is none)."""
+    pos = end
+    while pos > 0:
+        step = min(_TAIL_CHUNK, pos)
+        pos -= step
+        f.seek(pos)
+        i = f.read(step).rfind(b"\n")
+        if i != -1:
+            return pos + i + 1
+    return 0
@@ -1,3 +1,5 @@
+from typing import Iterable, Sequence
+
 from sasori.db.file_history_db import FileHistoryStore
 import typer
 
@@ -15,8 +17,19 @@ def append_processing_file(path: str) -> None:
 
 
 def remove_processing_file(path: str) -> None:
-    _proc_store.remove(path)
-    typer.secho(f"☑️  Processing file removed: {path}", fg="green")
+    removed = _proc_store.remove(path)
+    if removed:
+        typer.secho(f"☑️  Processing file(s) removed: {path} ({removed})", fg="green")
+
+
+def append_processing_files(paths: Iterable[str]) -> None:
+    added = _proc_store.append_many(paths)
+    typer.secho(f"☑️  Processing files appended: {added}", fg="green")
+
+
+def remove_processing_files(paths: Iterable[str]) -> None:
+    removed = _proc_store.remove_many(paths)
+    typer.secho(f"☑️  Processing files removed: {removed}", fg="green")
 
 
 def undo_processing_files() -> None:
@@ -29,6 +42,10 @@ def summary_processing_files() -> str:
     return summary
 
 
-def get_processing_files() -> set[str]:
-    files = _proc_store.latest_set()
+def stats_processing_files() -> str:
+    return _proc_store.stats()
+
+
+def get_processing_files() -> Sequence[str]:
+    files = _proc_store.latest()
     return files
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
+from functools import cached_property
+
 import typer
 from sasori.db.history_db import HistoryDB
+from sasori.db.history_db_factory import get_history_db
 from sasori.util.session_util import create_session_file
 
 
 class PromptHistoryStore:
     def __init__(self, name: str, pretty_label: str):
         self.name = name
-        self._db: HistoryDB[list[str]] = HistoryDB(
+        self._pretty_label = pretty_label
+
+    @cached_property
+    def _db(self) -> HistoryDB[list[str]]:
+        """Opened on first use, so importing the store resolves nothing."""
+        label = self._pretty_label
+        return get_history_db(
             create_session_file(self.name),
             empty=[],
             normalise=lambda lines: [ln.strip() for ln in lines if ln.strip()],
             pretty=lambda lines: (
-                f"{pretty_label}:\n"
+                f"{label}:\n"
                 + ("\n".join(f"- {ln}" for ln in lines) if lines else "(none)")
             ),
         )
@@ -31,12 +40,13 @@ class PromptHistoryStore:
         if not p:
             typer.secho("⚠️  Empty prompt — nothing added.", fg="yellow")
             return
-        items = self._snap()
-        if p in items:
-            typer.secho(f"⚠️  Prompt already present: {p}", fg="yellow")
-            return
-        items.append(p)
-        self._db.push(items)
+        with self._db.locked():
+            items = self._snap()
+            if p in items:
+                typer.secho(f"⚠️  Prompt already present: {p}", fg="yellow")
+                return
+            items.append(p)
+            self._db.push(items)
         typer.secho(f"☑️  Added prompt: {p}", fg="green")
 
     def remove(self, prompt: str) -> None:
@@ -44,13 +54,14 @@ class PromptHistoryStore:
         if not p:
             typer.secho("⚠️  Empty prompt — nothing removed.", fg="yellow")
             return
-        items = self._snap()
-        try:
-            items.remove(p)
-        except ValueError:
-            typer.secho(f"⚠️  Prompt not tracked: {p}", fg="yellow")
-            return
-        self._db.push(items)
+        with self._db.locked():
+            items = self._snap()
+            try:
+                items.remove(p)
+            except ValueError:
+                typer.secho(f"⚠️  Prompt not tracked: {p}", fg="yellow")
+                return
+            self._db.push(items)
         typer.secho(f"☑️  Removed prompt: {p}", fg="green")
 
     def undo(self) -> None:
@@ -62,6 +73,9 @@ class PromptHistoryStore:
     def summary(self) -> str:
         return self._db.summary()
 
+    def stats(self) -> str:
+        return self._db.stats()
+
     def latest(self) -> list[str]:
         """Convenience for modules that need the current prompts."""
         return list(self._db.latest())
@@ -96,6 +110,10 @@ def summary_prompts() -> str:
     return summary
 
 
+def stats_prompts() -> str:
+    return _prompt_store.stats()
+
+
 def get_latest_prompts() -> list[str]:
     latest = _prompt_store.latest()
     return latest
@@ -1,3 +1,5 @@
+from typing import Iterable, Sequence
+
 from sasori.db.file_history_db import FileHistoryStore
 import typer
 
@@ -15,8 +17,19 @@ def append_shared_file(path: str) -> None:
 
 
 def remove_shared_file(path: str) -> None:
-    _shared_store.remove(path)
-    typer.secho(f"✅ Shared file removed: {path}", fg="green")
+    removed = _shared_store.remove(path)
+    if removed:
+        typer.secho(f"✅ Shared file(s) removed: {path} ({removed})", fg="green")
+
+
+def append_shared_files(paths: Iterable[str]) -> None:
+    added = _shared_store.append_many(paths)
+    typer.secho(f"✅ Shared files appended: {added}", fg="green")
+
+
+def remove_shared_files(paths: Iterable[str]) -> None:
+    removed = _shared_store.remove_many(paths)
+    typer.secho(f"✅ Shared files removed: {removed}", fg="green")
 
 
 def undo_shared_files() -> None:
@@ -29,6 +42,10 @@ def summary_shared_files() -> str:
     return summary
 
 
-def get_shared_files() -> set[str]:
-    files = _shared_store.latest_set()
+def stats_shared_files() -> str:
+    return _shared_store.stats()
+
+
+def get_shared_files() -> Sequence[str]:
+    files = _shared_store.latest()
     return files
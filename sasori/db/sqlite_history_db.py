@@ -0,0 +1,471 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import typer
+from sasori.db.history_codec import HistoryCodec
+from sasori.db.history_db import HistoryDB
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS versions (version INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    item TEXT NOT NULL,
+    added INTEGER NOT NULL,
+    removed INTEGER,
+    pos REAL NOT NULL DEFAULT 0
+);
+"""
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS items_live ON items (item) WHERE removed IS NULL;
+CREATE INDEX IF NOT EXISTS items_order ON items (pos) WHERE removed IS NULL;
+CREATE INDEX IF NOT EXISTS items_added ON items (added);
+CREATE INDEX IF NOT EXISTS items_removed ON items (removed);
+"""
+
+_LIVE = "SELECT id, item, pos FROM items WHERE removed IS NULL ORDER BY pos, id"
+# rough per-row storage cost on top of the item text (ids, versions, indexes)
+_ROW_OVERHEAD = 32
+
+
+class SQLiteHistoryDB(HistoryDB[List[str]]):
+    """
+    History of list snapshots in a SQLite database (WAL mode).
+
+    Every item is one row that is live from version `added` until version
+    `removed`, so a push only inserts the new items and stamps the dropped
+    ones, and `undo()` deletes or un-stamps the rows of the head version.
+    Each row has a position; the latest snapshot is the live rows in
+    position order, and new items get positions between their neighbours,
+    so inserting into a sorted list only adds rows too. A change that
+    keeps items but reorders them (e.g. a reshuffled prompt list) replaces
+    every live row in the new version. A push reads every live row to diff
+    against, so it is O(N) in reads and O(changes) in writes. Items are
+    stored as rows, so `codec` has no effect here.
+
+    For histories whose snapshots are kept sorted (the file stores), the
+    item-level operations skip the snapshot altogether: `contains`,
+    `add_items` and `remove_items` are index lookups on the live rows,
+    O(log N) per item.
+
+    Pruning drops the oldest versions together with every row that is dead
+    in all remaining ones. `max_bytes` is checked against the pages in use
+    (freed pages are reused, the file itself doesn't shrink).
+    """
+
+    FILE_SUFFIX = ".sqlite3"
+
+    def __init__(
+        self,
+        file_path: Path,
+        *,
+        empty: List[str],
+        normalise: Optional[Callable[[List[str]], List[str]]] = None,
+        pretty: Optional[Callable[[List[str]], str]] = None,
+        codec: Optional[HistoryCodec] = None,
+        max_depth: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self._local = threading.local()
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        super().__init__(
+            file_path,
+            empty=empty,
+            normalise=normalise,
+            pretty=pretty,
+            codec=codec,
+            max_depth=max_depth,
+            max_bytes=max_bytes,
+        )
+
+    # ───── public API ────────────────────────────────────────────────
+
+    def latest(self) -> List[str]:
+        if self._absent():
+            return self._empty
+        try:
+            return [item for _, item, _ in self._connect().execute(_LIVE)]
+        except sqlite3.Error as e:
+            self._load_failed(e)
+            return self._empty
+
+    def contains(self, item: str) -> bool:
+        """Indexed membership test against the latest snapshot."""
+        if self._absent():
+            return False
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT 1 FROM items WHERE item = ? AND removed IS NULL LIMIT 1",
+                    (item,),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            self._load_failed(e)
+            return False
+        return row is not None
+
+    def push(self, snapshot: List[str]) -> None:
+        self._bootstrap()
+        try:
+            with self._transaction() as conn:
+                self._push(conn, self._normalise(snapshot))
+                self._prune(conn)
+        except sqlite3.Error as e:
+            typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+
+    def add_items(self, items: Iterable[str]) -> int:
+        """
+        Push a version with `items` added in sort order; the live rows must
+        already be sorted. Each new row goes between its live neighbours,
+        found through the index; items already live are skipped. Returns
+        how many were added (no version is pushed for none).
+        """
+        new = sorted(set(items))
+        self._bootstrap()
+        try:
+            with self._transaction() as conn:
+                added = self._add_sorted(conn, new)
+                if added:
+                    self._prune(conn)
+                return added
+        except _NoRoom:
+            pass  # two neighbours too close to split: rewrite the live rows
+        except sqlite3.Error as e:
+            typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+            return 0
+        latest = self.latest()
+        added = len(set(new) - set(latest))
+        if added:
+            self.push(latest + new)
+        return added
+
+    def remove_items(
+        self, items: Iterable[str] = (), ranges: Iterable[tuple[str, str]] = ()
+    ) -> int:
+        """
+        Push a version without `items` and without every live item in each
+        `[lo, hi)` of `ranges`, all through the index. Returns how many
+        were removed (no version is pushed for none).
+        """
+        self._bootstrap()
+        try:
+            with self._transaction() as conn:
+                version = self._next_version(conn)
+                removed = 0
+                for item in items:
+                    removed += conn.execute(
+                        "UPDATE items SET removed = ? "
+                        "WHERE item = ? AND removed IS NULL",
+                        (version, item),
+                    ).rowcount
+                for lo, hi in ranges:
+                    removed += conn.execute(
+                        "UPDATE items SET removed = ? "
+                        "WHERE item >= ? AND item < ? AND removed IS NULL",
+                        (version, lo, hi),
+                    ).rowcount
+                if removed:
+                    conn.execute("INSERT INTO versions VALUES (?)", (version,))
+                    self._prune(conn)
+                return removed
+        except sqlite3.Error as e:
+            typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+            return 0
+
+    def undo(self) -> bool:
+        self._bootstrap()
+        try:
+            with self._transaction() as conn:
+                count, head = conn.execute(
+                    "SELECT COUNT(*), MAX(version) FROM versions"
+                ).fetchone()
+                if count <= 1:
+                    typer.secho("⚠️  No more snapshots to undo.", fg="yellow")
+                    return False
+                conn.execute("DELETE FROM items WHERE added = ?", (head,))
+                conn.execute(
+                    "UPDATE items SET removed = NULL WHERE removed = ?", (head,)
+                )
+                conn.execute("DELETE FROM versions WHERE version = ?", (head,))
+        except sqlite3.Error as e:
+            typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+            return False
+        return True
+
+    def depth(self) -> int:
+        if self._absent():
+            return 1
+        try:
+            (count,) = (
+                self._connect().execute("SELECT COUNT(*) FROM versions").fetchone()
+            )
+        except sqlite3.Error as e:
+            self._load_failed(e)
+            return 0
+        return count
+
+    def size_bytes(self) -> int:
+        if self._absent():
+            return 0
+        try:
+            return self._used_bytes(self._connect())
+        except sqlite3.Error as e:
+            self._load_failed(e)
+            return 0
+
+    def close(self) -> None:
+        """Close every thread's connection; the next use reopens one."""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            self._local = threading.local()
+        for conn in conns:
+            conn.close()
+
+    # ───── private helpers ───────────────────────────────────────────
+
+    def _absent(self) -> bool:
+        """True until the database exists; reads then must not create it."""
+        return getattr(self._local, "conn", None) is None and not self._file.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        This thread's connection. sqlite3 connections can't be shared across
+        threads, and `asend_message` reads histories from worker threads.
+        """
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            # used by this thread only; the flag just lets close() run anywhere
+            conn = sqlite3.connect(
+                self._file, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_TABLES)
+            _migrate(conn)
+            conn.executescript(_INDEXES)
+            local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def _next_version(self, conn: sqlite3.Connection) -> int:
+        (head,) = conn.execute("SELECT MAX(version) FROM versions").fetchone()
+        return 0 if head is None else head + 1
+
+    def _add_sorted(self, conn: sqlite3.Connection, new: List[str]) -> int:
+        """Insert the `new` items not yet live; raises `_NoRoom` if stuck."""
+        version = self._next_version(conn)
+        added = 0
+        for item in new:
+            if conn.execute(
+                "SELECT 1 FROM items WHERE item = ? AND removed IS NULL", (item,)
+            ).fetchone():
+                continue
+            lo = conn.execute(
+                "SELECT pos FROM items WHERE item < ? AND removed IS NULL "
+                "ORDER BY item DESC LIMIT 1",
+                (item,),
+            ).fetchone()
+            hi = conn.execute(
+                "SELECT pos FROM items WHERE item > ? AND removed IS NULL "
+                "ORDER BY item LIMIT 1",
+                (item,),
+            ).fetchone()
+            between = _spread(
+                1, None if lo is None else lo[0], None if hi is None else hi[0]
+            )
+            if between is None:
+                raise _NoRoom
+            conn.execute(
+                "INSERT INTO items (item, added, pos) VALUES (?, ?, ?)",
+                (item, version, between[0]),
+            )
+            added += 1
+        if added:
+            conn.execute("INSERT INTO versions VALUES (?)", (version,))
+        return added
+
+    def _push(self, conn: sqlite3.Connection, new: List[str]) -> None:
+        version = self._next_version(conn)
+        conn.execute("INSERT INTO versions VALUES (?)", (version,))
+
+        live = conn.execute(_LIVE).fetchall()
+        old_set = {item for _, item, _ in live}
+        new_set = set(new)
+        kept = [(item, pos) for _, item, pos in live if item in new_set]
+        placed = None
+        if [item for item, _ in kept] == [x for x in new if x in old_set]:
+            placed = _place(new, old_set, [pos for _, pos in kept])
+        if placed is None:
+            dropped = [row_id for row_id, _, _ in live]
+            placed = [(item, float(i + 1)) for i, item in enumerate(new)]
+        else:
+            dropped = [row_id for row_id, item, _ in live if item not in new_set]
+        conn.executemany(
+            "UPDATE items SET removed = ? WHERE id = ?",
+            ((version, row_id) for row_id in dropped),
+        )
+        conn.executemany(
+            "INSERT INTO items (item, added, pos) VALUES (?, ?, ?)",
+            ((item, version, pos) for item, pos in placed),
+        )
+
+    def _used_bytes(self, conn: sqlite3.Connection) -> int:
+        (pages,) = conn.execute("PRAGMA page_count").fetchone()
+        (free,) = conn.execute("PRAGMA freelist_count").fetchone()
+        (page_size,) = conn.execute("PRAGMA page_size").fetchone()
+        return (pages - free) * page_size
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Drop the oldest versions beyond `max_depth` / `max_bytes`."""
+        count, first, head = conn.execute(
+            "SELECT COUNT(*), MIN(version), MAX(version) FROM versions"
+        ).fetchone()
+        if not count:
+            return
+        cut = first
+        if self._max_depth and count > self._max_depth:
+            cut = head - self._max_depth + 1
+        excess = self._max_bytes and self._used_bytes(conn) - self._max_bytes
+        if excess and excess > 0:
+            # versions < cut are dropped with the rows removed at or before cut
+            freed = 0
+            for removed, size in conn.execute(
+                "SELECT removed, SUM(LENGTH(item) + ?) FROM items "
+                "WHERE removed IS NOT NULL GROUP BY removed ORDER BY removed",
+                (_ROW_OVERHEAD,),
+            ).fetchall():
+                if removed > cut:
+                    if freed >= excess:
+                        break
+                    cut = removed
+                freed += size
+        if cut > first:
+            conn.execute(
+                "DELETE FROM items WHERE removed IS NOT NULL AND removed <= ?", (cut,)
+            )
+            conn.execute("DELETE FROM versions WHERE version < ?", (cut,))
+
+    def _load(self) -> List[List[str]]:
+        """Materialise every version (O(history); the public API never needs it)."""
+        if self._absent():
+            return [self._empty]
+        try:
+            conn = self._connect()
+            versions = [v for (v,) in conn.execute("SELECT version FROM versions")]
+            return [
+                [
+                    item
+                    for (item,) in conn.execute(
+                        "SELECT item FROM items WHERE added <= ? "
+                        "AND (removed IS NULL OR removed > ?) ORDER BY pos, id",
+                        (v, v),
+                    )
+                ]
+                for v in sorted(versions)
+            ] or [self._empty]
+        except sqlite3.Error as e:
+            self._load_failed(e)
+            return [self._empty]
+
+    def _save(self, history: List[List[str]]) -> None:
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM items")
+                conn.execute("DELETE FROM versions")
+                for snapshot in history:
+                    self._push(conn, snapshot)
+                self._prune(conn)
+        except sqlite3.Error as e:
+            typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+
+    def _load_failed(self, e: Exception) -> None:
+        typer.secho(
+            f"⚠️  Failed to load {self._file.name}; using empty. Error: {e}",
+            fg="yellow",
+            err=True,
+        )
+
+
+class _NoRoom(Exception):
+    """No position is left between two neighbouring rows."""
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Give databases from before the `pos` column their insertion order."""
+    if "pos" in {col for _, col, *_ in conn.execute("PRAGMA table_info(items)")}:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        columns = {col for _, col, *_ in conn.execute("PRAGMA table_info(items)")}
+        if "pos" not in columns:
+            conn.execute("ALTER TABLE items ADD COLUMN pos REAL NOT NULL DEFAULT 0")
+            conn.execute("UPDATE items SET pos = id")
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def _place(
+    new: List[str], old: set[str], kept: List[float]
+) -> Optional[List[tuple[str, float]]]:
+    """
+    Positions for the items of `new` not in `old`: each run of them goes
+    between the positions of the kept items around it (`kept`, in order).
+    None if a gap is too narrow to split.
+    """
+    placed: List[tuple[str, float]] = []
+    run: List[str] = []
+    lo: Optional[float] = None
+    positions = iter(kept)
+    for item in new:
+        if item not in old:
+            run.append(item)
+            continue
+        hi = next(positions)
+        between = _spread(len(run), lo, hi)
+        if between is None:
+            return None
+        placed += zip(run, between)
+        run, lo = [], hi
+    between = _spread(len(run), lo, None)
+    assert between is not None  # nothing above the last item to collide with
+    return placed + list(zip(run, between))
+
+
+def _spread(n: int, lo: Optional[float], hi: Optional[float]) -> Optional[List[float]]:
+    """`n` increasing positions strictly between `lo` and `hi` (open if None)."""
+    if n == 0:
+        return []
+    if hi is None:
+        start = 0.0 if lo is None else lo
+        return [start + i + 1 for i in range(n)]
+    if lo is None:
+        return [hi - n + i for i in range(n)]
+    step = (hi - lo) / (n + 1)
+    out = [lo + step * (i + 1) for i in range(n)]
+    bounds = [lo] + out + [hi]
+    if any(a >= b for a, b in zip(bounds, bounds[1:])):
+        return None
+    return out
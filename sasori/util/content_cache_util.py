@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+import typer
+
+from sasori.util import session_util
+
+CONTENT_CACHE_DIR = "content_cache"
+DEFAULT_MEMORY_BYTES = 32 * 1024 * 1024
+DEFAULT_DISK_BYTES = 64 * 1024 * 1024
+# files modified this recently may change again within the same mtime tick
+_RACY_NS = 2_000_000_000
+
+StatKey = tuple[int, int, int]
+
+
+class ContentCache:
+    """
+    Cache of file contents keyed by (path, mtime, size, inode).
+
+    Each entry holds the decoded, stripped text and its rendered
+    `File: …` block. Entries live in an in-process LRU capped at
+    `memory_bytes`; with `disk_dir`, they are also written there, one file
+    per (path, stat) key, so later runs skip re-reading unchanged files.
+    The directory is trimmed to `disk_bytes`, least recently used first.
+    Safe to share between the threads of one process.
+    """
+
+    def __init__(
+        self,
+        memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        disk_dir: Optional[Path] = None,
+        disk_bytes: int = DEFAULT_DISK_BYTES,
+    ) -> None:
+        self._memory_bytes = memory_bytes
+        self._disk_dir = disk_dir
+        self._disk_bytes = disk_bytes
+        self._disk_total: Optional[int] = None
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[StatKey, str, str]] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ───── lookup ────────────────────────────────────────────────────
+
+    def get(self, path: Union[str, Path]) -> Optional[tuple[str, str]]:
+        """`(text, block)` for `path` if cached and unchanged, else None."""
+        name = str(path)
+        key = stat_key(name)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return entry[1], entry[2]
+        text = self._disk_get(name, key)
+        if text is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        block = render_block(name, text)
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(name, key, text, block)
+        return text, block
+
+    def put(self, path: Union[str, Path], key: StatKey, text: str) -> str:
+        """
+        Cache `text` read from `path` while it had stat `key` (taken before
+        reading); returns the rendered block. Files modified within the last
+        couple of seconds are not cached, since a same-tick rewrite would go
+        unnoticed.
+        """
+        name = str(path)
+        block = render_block(name, text)
+        if time.time_ns() - key[0] <= _RACY_NS:
+            return block
+        with self._lock:
+            self._remember(name, key, text, block)
+        self._disk_put(name, key, text)
+        return block
+
+    def summary(self) -> str:
+        return (
+            f"♻️  Content cache: {self.hits} hit(s), {self.disk_hits} disk hit(s), "
+            f"{self.misses} miss(es)"
+        )
+
+    # ───── memory layer ──────────────────────────────────────────────
+
+    def _remember(self, name: str, key: StatKey, text: str, block: str) -> None:
+        old = self._entries.pop(name, None)
+        if old is not None:
+            self._size -= _cost(name, old[1], old[2])
+        cost = _cost(name, text, block)
+        if cost > self._memory_bytes:
+            return
+        self._entries[name] = (key, text, block)
+        self._size += cost
+        while self._size > self._memory_bytes:
+            old_name, (_, old_text, old_block) = self._entries.popitem(last=False)
+            self._size -= _cost(old_name, old_text, old_block)
+
+    # ───── disk layer ────────────────────────────────────────────────
+
+    def _disk_file(self, name: str, key: StatKey) -> Optional[Path]:
+        if self._disk_dir is None:
+            return None
+        digest = hashlib.sha1(f"{name}\0{key}".encode("utf-8", "surrogateescape"))
+        return self._disk_dir / f"{digest.hexdigest()}.json"
+
+    def _disk_get(self, name: str, key: StatKey) -> Optional[str]:
+        file = self._disk_file(name, key)
+        if file is None:
+            return None
+        try:
+            with open(file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("path") != name or tuple(data.get("key", ())) != key:
+                return None
+            os.utime(file)  # mark as recently used for eviction
+            return data["text"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            typer.secho(
+                f"⚠️  Ignoring unreadable cache entry {file.name}: {e}",
+                fg="yellow",
+                err=True,
+            )
+            return None
+
+    def _disk_put(self, name: str, key: StatKey, text: str) -> None:
+        file = self._disk_file(name, key)
+        if file is None:
+            return
+        data = json.dumps({"path": name, "key": list(key), "text": text})
+        tmp = file.with_name(f"{file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, file)
+        except Exception as e:
+            typer.secho(f"❌ Failed to cache {name}: {e}", fg="red", err=True)
+            return
+        with self._lock:
+            if self._disk_total is None:
+                self._disk_total = _dir_size(file.parent)
+            else:
+                self._disk_total += len(data)
+            if self._disk_total > self._disk_bytes:
+                self._disk_total = _trim_dir(file.parent, self._disk_bytes)
+
+
+def render_block(path: Union[str, Path], text: str) -> str:
+    """The `File: …` block a file's text is sent to the AI as."""
+    return f"File: {path}\n```\n{text}\n```"
+
+
+def stat_key(path: Union[str, Path]) -> Optional[StatKey]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _cost(name: str, text: str, block: str) -> int:
+    """Rough memory footprint of one entry."""
+    return len(name) + len(text) + len(block) + 64
+
+
+def _dir_size(path: Path) -> int:
+    try:
+        with os.scandir(path) as it:
+            return sum(e.stat().st_size for e in it if e.name.endswith(".json"))
+    except OSError:
+        return 0
+
+
+def _trim_dir(path: Path, max_bytes: int) -> int:
+    """Delete the least recently used entries until `path` fits; new total."""
+    try:
+        with os.scandir(path) as it:
+            entries = [
+                (e.stat().st_mtime_ns, e.stat().st_size, e.path)
+                for e in it
+                if e.name.endswith(".json")
+            ]
+    except OSError:
+        return 0
+    total = sum(size for _, size, _ in entries)
+    for _, size, file in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(file)
+            total -= size
+        except OSError:
+            pass
+    return total
+
+
+# ───── process-wide instance ─────────────────────────────────────
+
+_cache: Optional[ContentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_content_cache() -> Optional[ContentCache]:
+    """
+    The process-wide cache, configured from the environment on first use
+    (None when disabled):
+
+      $CONTENT_CACHE            – memory (default) | disk | off
+      $CONTENT_CACHE_MAX_BYTES  – size of the on-disk layer
+    """
+    global _cache
+    mode = (os.getenv("CONTENT_CACHE") or "memory").strip().lower()
+    if mode == "off":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            if mode not in ("memory", "disk"):
+                typer.secho(
+                    f"⚠️  Unknown CONTENT_CACHE '{mode}'; using memory.",
+                    fg="yellow",
+                    err=True,
+                )
+            disk_dir = (
+                session_util.CACHE_DIR / CONTENT_CACHE_DIR if mode == "disk" else None
+            )
+            _cache = ContentCache(
+                disk_dir=disk_dir,
+                disk_bytes=int(
+                    os.getenv("CONTENT_CACHE_MAX_BYTES") or DEFAULT_DISK_BYTES
+                ),
+            )
+        return _cache
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+
+from sasori.util import session_util
+from sasori.util.ignore_util import IgnoreScope
+from sasori.util.walk_util import filter_listing, list_dir
+
+DIR_CACHE_NAME = "dir_cache.json"
+DEFAULT_MAX_AGE_S = 14 * 24 * 3600
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+# listings younger than this may miss a same-tick change; don't trust them
+_RACY_NS = 2_000_000_000
+_TOUCH_EVERY_S = 24 * 3600
+
+
+class DirCache:
+    """
+    On-disk cache of directory listings keyed by directory mtime.
+
+    Each entry stores the directory's `st_mtime_ns`, when it was last used,
+    and its file / subdirectory names. A directory is re-listed only when its
+    mtime changed; ignore rules are re-applied to the cached names on every
+    walk, so editing an ignore file never serves a stale filter. Entries
+    unused for `max_age_s` are evicted, then the least recently used ones
+    until the file fits in `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        file_path: Optional[Path] = None,
+        max_age_s: int = DEFAULT_MAX_AGE_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self._file = file_path or session_util.CACHE_DIR / DIR_CACHE_NAME
+        self._max_age_s = max_age_s
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, list[Any]] = self._load()
+
+    # ───── listing ───────────────────────────────────────────────────
+
+    def scan(self, scope: IgnoreScope) -> tuple[list[str], list[IgnoreScope]]:
+        """Drop-in replacement for `walk_util.scan_dir` backed by the cache."""
+        path = scope.path
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return [], []
+
+        now = int(time.time())
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == mtime:
+            with self._lock:
+                self.hits += 1
+                if now - entry[1] > _TOUCH_EVERY_S:
+                    entry[1] = now
+                    self._dirty = True
+            files, dirs = entry[2], entry[3]
+        else:
+            files, dirs = list_dir(path)
+            with self._lock:
+                self.misses += 1
+                if time.time_ns() - mtime > _RACY_NS:
+                    self._entries[path] = [mtime, now, files, dirs]
+                    self._dirty = True
+
+        return filter_listing(scope, files, dirs)
+
+    # ───── persistence ───────────────────────────────────────────────
+
+    def summary(self) -> str:
+        return f"♻️  Discovery cache: {self.hits} hit(s), {self.misses} miss(es)"
+
+    def save(self) -> None:
+        """Evict old / oversized entries and write the cache if it changed."""
+        if not self._dirty:
+            return
+        self._evict(int(time.time()))
+        try:
+            self._file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._file.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": self._entries}, f)
+            os.replace(tmp, self._file)
+            self._dirty = False
+        except Exception as e:
+            typer.secho(f"❌ Failed to save {self._file.name}: {e}", fg="red", err=True)
+
+    def _evict(self, now: int) -> None:
+        entries = {
+            k: v for k, v in self._entries.items() if now - v[1] <= self._max_age_s
+        }
+        sizes = {k: len(k) + len(json.dumps(v)) + 8 for k, v in entries.items()}
+        total = sum(sizes.values())
+        if total > self._max_bytes:
+            for key in sorted(entries, key=lambda k: entries[k][1]):
+                if total <= self._max_bytes:
+                    break
+                total -= sizes[key]
+                del entries[key]
+        self._entries = entries
+
+    def _load(self) -> dict[str, list[Any]]:
+        try:
+            with open(self._file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == 1:
+                return data["entries"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            typer.secho(
+                f"⚠️  Failed to load {self._file.name}; starting empty. Error: {e}",
+                fg="yellow",
+                err=True,
+            )
+        return {}
@@ -1,12 +1,24 @@
 from __future__ import annotations
 import os
 import subprocess
+import threading
 import typer
 
-from fnmatch import fnmatch
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import OrderedDict, Sequence, Union
-
+from typing import Iterable, Iterator, Optional, OrderedDict, Sequence, Union
+
+from sasori.util.content_cache_util import get_content_cache, render_block, stat_key
+from sasori.util.dir_cache_util import DirCache
+from sasori.util.ignore_util import IgnoreScope, compile_ignore_patterns
+from sasori.util.walk_util import (
+    DEFAULT_WORKERS,
+    Walker,
+    walk_git,
+    walk_scandir,
+    walk_tree,
+)
 
 DEFAULT_IGNORES: tuple[str, ...] = (
     "__pycache__",
@@ -34,36 +46,102 @@ def should_ignore(name: str, patterns: Sequence[str] = DEFAULT_IGNORES) -> bool:
     Returns True if `name` (a single path component or filename)
     matches any of the glob patterns.
     """
-    return any(fnmatch(name, pat) for pat in patterns)
+    return compile_ignore_patterns(patterns)(name)
 
 
 # ────────────────────────────────────────────────────────────────────
 # file discovery
 # ────────────────────────────────────────────────────────────────────
-def get_all_files(
+def resolve_path(path: Union[str, Path]) -> str:
+    """
+    `path` as the file histories store it: absolute and resolved, like
+    `iter_files` yields. A trailing separator (directory only) is kept.
+    """
+    resolved = str(Path(path).expanduser().resolve())
+    if str(path).endswith(os.sep) and not resolved.endswith(os.sep):
+        resolved += os.sep
+    return resolved
+
+
+def iter_files(
     root: Union[str, Path],
     ignore_patterns: Sequence[str] = DEFAULT_IGNORES,
-) -> list[str]:
+    use_ignore_files: bool = True,
+    walker: Walker = Walker.WALK,
+    max_workers: Optional[int] = None,
+    include_untracked: bool = False,
+    use_cache: bool = False,
+) -> Iterator[str]:
+    """
+    Yield every file under `root` in sorted depth-first order, as soon as
+    it is discovered. Skips names matching `ignore_patterns` and, when
+    `use_ignore_files` is set, anything excluded by `.gitignore` /
+    `.sasoriignore` files (including the enclosing repo's). Ignored
+    directories are pruned before descent.
+
+    `walker` picks the traversal: `walk` (single-threaded `os.walk`),
+    `scandir` (`os.scandir` on a pool of `max_workers` threads) or `git`
+    (the git index, plus untracked files if `include_untracked`; falls back
+    to `walk` outside a git work tree). With `use_cache`, directory listings
+    come from the on-disk `DirCache` and only directories whose mtime
+    changed are re-listed.
+    """
     root = Path(root).expanduser().resolve()
 
     if not root.exists():
         typer.secho(f"❌  Path does not exist: {root}", fg="red", err=True)
-        return []
+        return
 
     if root.is_file():
-        return [str(root)]
-
-    results: list[str] = []
-
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if not should_ignore(d, ignore_patterns)]
+        yield str(root)
+        return
+
+    scope = IgnoreScope.for_root(str(root), ignore_patterns, use_ignore_files)
+    if walker == Walker.GIT:
+        tracked = walk_git(str(root), scope, include_untracked)
+        if tracked is not None:
+            yield from tracked
+            return
+        typer.secho(
+            f"⚠️  {root} is not in a git work tree; walking instead.",
+            fg="yellow",
+            err=True,
+        )
+    if use_cache:
+        cache = DirCache()
+        workers = max_workers if walker == Walker.SCANDIR else 1
+        try:
+            yield from walk_scandir(scope, workers, cache.scan)
+        finally:
+            cache.save()
+            typer.secho(cache.summary(), fg="green")
+    elif walker == Walker.SCANDIR:
+        yield from walk_scandir(scope, max_workers)
+    else:
+        yield from walk_tree(str(root), scope)
 
-        for fname in filenames:
-            if should_ignore(fname, ignore_patterns):
-                continue
-            full = Path(dirpath) / fname
-            results.append(str(full))
 
+def get_all_files(
+    root: Union[str, Path],
+    ignore_patterns: Sequence[str] = DEFAULT_IGNORES,
+    use_ignore_files: bool = True,
+    walker: Walker = Walker.WALK,
+    max_workers: Optional[int] = None,
+    include_untracked: bool = False,
+    use_cache: bool = False,
+) -> list[str]:
+    """List form of `iter_files`."""
+    results = list(
+        iter_files(
+            root,
+            ignore_patterns,
+            use_ignore_files,
+            walker,
+            max_workers,
+            include_untracked,
+            use_cache,
+        )
+    )
     typer.secho(f"☑️ Found {len(results)} file(s) under {root}", fg="green")
     return results
 
@@ -75,26 +153,109 @@ _MAX_MB = 1
 
 
 def stringify_file_contents(
-    files: Union[list[str], list[Path]], label: str = "Files"
+    files: Union[Iterable[str], Iterable[Path]],
+    label: str = "Files",
+    max_workers: Optional[int] = None,
+    max_bytes: Optional[int] = None,
 ) -> list[str]:
     """
-    Read files into memory (≤ 1 MiB each). Returns {path: contents}.
+    Read files into memory (≤ 1 MiB each) and render one `File: …` block
+    per non-empty file, in input order.
+
+    `files` may be any iterable (e.g. `iter_files(...)`); it is consumed
+    lazily and files are read on a pool of `max_workers` threads (1 reads
+    in the calling thread). A file that fails is reported and skipped.
+    With `max_bytes`, reading stops before the first block that would take
+    the total (UTF-8) size past the budget.
     """
-    if len(files) == 0:
-        typer.secho("⚠️  No files to read.", fg="yellow")
-        return []
     string_list = [f"📁 {label}:"]
-    for filepath in files:
-        try:
-            text = stringify_file_content(filepath)
-            if text != "":
-                string_list.append(f"File: {filepath}\n```\n{text}\n```")
-        except Exception as err:
+    seen = 0
+    total = 0
+    for filepath, block, err in read_file_blocks(files, max_workers):
+        seen += 1
+        if err is not None:
             typer.secho(f"❌  Error reading {filepath}: {err}", fg="red", err=True)
+            continue
+        if block == "":
+            continue
+        if max_bytes is not None:
+            total += len(block.encode("utf-8"))
+            if total > max_bytes:
+                typer.secho(
+                    f"⚠️  Byte budget of {max_bytes:,} reached at {filepath}; "
+                    "remaining files skipped.",
+                    fg="yellow",
+                )
+                break
+        string_list.append(block)
+    if seen == 0:
+        typer.secho("⚠️  No files to read.", fg="yellow")
+        return []
     typer.secho(f"☑️ Read {len(string_list) - 1} file(s)", fg="green")
     return string_list
 
 
+def read_file_blocks(
+    files: Union[Iterable[str], Iterable[Path]],
+    max_workers: Optional[int] = None,
+) -> Iterator[tuple[Union[str, Path], str, Optional[Exception]]]:
+    """
+    Yield `(path, block, error)` for every file, in input order, where
+    `block` is the rendered `File: …` block ("" for an empty or skipped
+    file). Files are read ahead on a thread pool; at most twice
+    `max_workers` reads are in flight, so a lazy `files` is not drained up
+    front and stopping early (closing the generator) cancels the reads not
+    yet started.
+    """
+    workers = max_workers or DEFAULT_WORKERS
+    if workers <= 1:
+        for path in files:
+            try:
+                yield path, read_file_block(path), None
+            except Exception as err:
+                yield path, "", err
+        return
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        pending: deque[tuple[Union[str, Path], Future[str]]] = deque()
+        it: Iterator[Union[str, Path]] = iter(files)
+        for path in it:
+            pending.append((path, pool.submit(read_file_block, path)))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            path, future = pending.popleft()
+            try:
+                yield path, future.result(), None
+            except Exception as err:
+                yield path, "", err
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append((nxt, pool.submit(read_file_block, nxt)))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def read_file_block(path: Union[str, Path]) -> str:
+    """
+    Rendered `File: …` block for `path` ("" when it has no text), served
+    from the content cache when the file is unchanged.
+    """
+    cache = get_content_cache()
+    if cache is None:
+        text = stringify_file_content(path)
+        return render_block(path, text) if text else ""
+    hit = cache.get(path)
+    if hit is not None:
+        return hit[1]
+    key = stat_key(path)
+    text = stringify_file_content(path)
+    if not text:
+        return ""
+    return render_block(path, text) if key is None else cache.put(path, key, text)
+
+
 def stringify_file_content(path: Union[str, Path]) -> str:
     try:
         if isinstance(path, str):
@@ -114,18 +275,27 @@ def stringify_file_content(path: Union[str, Path]) -> str:
 # ────────────────────────────────────────────────────────────────────
 
 
+_REWRITE_LOCK = threading.Lock()
+
+
 def rewrite_files(
     files: OrderedDict[str, str],
     force: bool = False,
 ) -> None:
-    for path, content in files.items():
-        if not force:
-            if not typer.confirm(f"Overwrite {path}?"):
-                typer.secho(f"✋  Skipped {path}", fg="cyan")
-                continue
-        rewrite_file(path, content)
-        typer.secho(f"☑️ Wrote {path}", fg="green")
-    typer.secho("☑️ All file rewrites complete.", fg="green")
+    """
+    Write every file in `files`, asking first unless `force`. Safe to call
+    from several threads: one call's prompts and writes finish before the
+    next call starts.
+    """
+    with _REWRITE_LOCK:
+        for path, content in files.items():
+            if not force:
+                if not typer.confirm(f"Overwrite {path}?"):
+                    typer.secho(f"✋  Skipped {path}", fg="cyan")
+                    continue
+            rewrite_file(path, content)
+            typer.secho(f"☑️ Wrote {path}", fg="green")
+        typer.secho("☑️ All file rewrites complete.", fg="green")
 
 
 def rewrite_file(file_path: str, content: str) -> None:
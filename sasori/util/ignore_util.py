@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import os
+import re
+from fnmatch import translate
+from functools import lru_cache
+from typing import Iterable, Optional, Pattern, Sequence
+
+_GLOB_CHARS = frozenset("*?[")
+
+IGNORE_FILES: tuple[str, ...] = (".gitignore", ".sasoriignore")
+
+
+# ────────────────────────────────────────────────────────────────────
+# compiled name matcher
+# ────────────────────────────────────────────────────────────────────
+
+
+class NameMatcher:
+    """
+    Pre-compiled form of a list of `fnmatch` patterns.
+
+    Patterns are split into three buckets so that most names are decided
+    without touching the regex engine:
+      • literals  – `venv`, `.git`           → set lookup
+      • suffixes  – `*.egg-info`, `*.webp`   → one `str.endswith(tuple)`
+      • globs     – everything else          → one combined regex
+    """
+
+    __slots__ = ("literals", "suffixes", "regex")
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        literals: set[str] = set()
+        suffixes: list[str] = []
+        globs: list[str] = []
+        for pat in patterns:
+            pat = os.path.normcase(pat)
+            if not _GLOB_CHARS.intersection(pat):
+                literals.add(pat)
+            elif pat.startswith("*") and not _GLOB_CHARS.intersection(pat[1:]):
+                suffixes.append(pat[1:])
+            else:
+                globs.append(pat)
+
+        self.literals = frozenset(literals)
+        self.suffixes = tuple(suffixes)
+        self.regex: Optional[Pattern[str]] = (
+            re.compile("|".join(f"(?:{translate(g)})" for g in globs))
+            if globs
+            else None
+        )
+
+    def __call__(self, name: str) -> bool:
+        name = os.path.normcase(name)
+        if name in self.literals:
+            return True
+        if self.suffixes and name.endswith(self.suffixes):
+            return True
+        return self.regex is not None and self.regex.match(name) is not None
+
+
+@lru_cache(maxsize=32)
+def _compile(patterns: tuple[str, ...]) -> NameMatcher:
+    return NameMatcher(patterns)
+
+
+def compile_ignore_patterns(patterns: Sequence[str]) -> NameMatcher:
+    """Return a (cached) `NameMatcher` for `patterns`."""
+    return _compile(tuple(patterns))
+
+
+# ────────────────────────────────────────────────────────────────────
+# .gitignore-style rule files
+# ────────────────────────────────────────────────────────────────────
+
+
+def _translate_class(pattern: str, i: int) -> tuple[str, int]:
+    """Translate the `[...]` starting at `pattern[i]`; return (regex, next index)."""
+    j = i + 1
+    if j < len(pattern) and pattern[j] in "!^":
+        j += 1
+    if j < len(pattern) and pattern[j] == "]":
+        j += 1
+    j = pattern.find("]", j)
+    if j == -1:
+        return re.escape("["), i + 1
+    body = pattern[i + 1 : j].replace("\\", "\\\\")
+    if body[0] in "!^":
+        body = "^" + body[1:]
+    return f"[{body}]", j + 1
+
+
+def _translate_gitignore(pattern: str) -> str:
+    """Translate one gitignore glob (no leading/trailing `/`) into a regex."""
+    res: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+                end = i + 2
+                if end == n:
+                    res.append(".*")
+                    i = end
+                    continue
+                if pattern[end] == "/":
+                    res.append("(?:.*/)?")
+                    i = end + 1
+                    continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            res.append("[^/]*")
+            continue
+        if c == "?":
+            res.append("[^/]")
+        elif c == "[":
+            chunk, i = _translate_class(pattern, i)
+            res.append(chunk)
+            continue
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            res.append(re.escape(pattern[i]))
+        else:
+            res.append(re.escape(c))
+        i += 1
+    return "".join(res)
+
+
+class IgnoreRules:
+    """
+    Parsed rules of one `.gitignore`-style file.
+
+    Supports comments, `!` negation, trailing-`/` directory-only rules,
+    anchored rules (any pattern containing a `/`) and `**` wildcards.
+    Paths passed to `match` are relative to the directory holding the file.
+    """
+
+    __slots__ = ("rules",)
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        rules: list[tuple[Pattern[str], bool, bool]] = []
+        for line in lines:
+            line = line.rstrip("\n\r")
+            if line.endswith("\\ "):
+                line = line.rstrip(" ") + " "
+            else:
+                line = line.rstrip(" ")
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            body = _translate_gitignore(line.lstrip("/"))
+            prefix = "" if anchored else "(?:.*/)?"
+            rules.append((re.compile(rf"{prefix}{body}\Z", re.S), negated, dir_only))
+        self.rules = tuple(rules)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Return True (ignored), False (re-included by a `!` rule) or None
+        when no rule in this file mentions `rel_path`. Last match wins.
+        """
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negated
+        return None
+
+
+def load_ignore_rules(dirpath: str) -> Optional[IgnoreRules]:
+    """Parse every file of `IGNORE_FILES` found in `dirpath` (None if none)."""
+    lines: list[str] = []
+    for fname in IGNORE_FILES:
+        try:
+            with open(
+                os.path.join(dirpath, fname), "r", encoding="utf-8", errors="replace"
+            ) as f:
+                lines.extend(f)
+        except OSError:
+            continue
+    if not lines:
+        return None
+    rules = IgnoreRules(lines)
+    return rules if rules.rules else None
+
+
+class IgnoreScope:
+    """
+    Ignore rules in effect inside one directory of a walk.
+
+    A scope combines the static name patterns with every ignore file from
+    the enclosing directories. Child scopes share their parent's parsed
+    rules, so each ignore file is read once per walk.
+    """
+
+    __slots__ = ("path", "names", "chain", "read_files", "_bases")
+
+    def __init__(
+        self,
+        path: str,
+        names: NameMatcher,
+        chain: tuple[tuple[str, IgnoreRules], ...] = (),
+        read_files: bool = True,
+    ) -> None:
+        self.path = path
+        self.names = names
+        self.read_files = read_files
+        # (path of the scope dir relative to the rule file's dir, rules)
+        self.chain = tuple(
+            (path[len(base) + 1 :] if path != base else "", rules)
+            for base, rules in chain
+        )
+        self._bases = chain
+
+    @classmethod
+    def for_root(
+        cls, root: str, patterns: Sequence[str], read_files: bool = True
+    ) -> IgnoreScope:
+        """
+        Build the scope for `root`, including ignore files of the enclosing
+        git work tree (if any) so that nested roots honour the repo rules.
+        """
+        names = compile_ignore_patterns(patterns)
+        if not read_files:
+            return cls(root, names, read_files=False)
+        chain: list[tuple[str, IgnoreRules]] = []
+        for base in _ancestors_within_repo(root):
+            rules = load_ignore_rules(base)
+            if rules is not None:
+                chain.append((base, rules))
+        return cls(root, names, tuple(chain))
+
+    def ignored(self, name: str, is_dir: bool) -> bool:
+        if self.names(name):
+            return True
+        for prefix, rules in reversed(self.chain):
+            verdict = rules.match(f"{prefix}/{name}" if prefix else name, is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+
+    def child(self, name: str) -> IgnoreScope:
+        path = os.path.join(self.path, name)
+        chain = self._bases
+        if self.read_files:
+            rules = load_ignore_rules(path)
+            if rules is not None:
+                chain = chain + ((path, rules),)
+        return IgnoreScope(path, self.names, chain, self.read_files)
+
+
+def _ancestors_within_repo(root: str) -> list[str]:
+    """`root` plus its parents up to the nearest one holding `.git`, top-down."""
+    chain = [root]
+    current = root
+    while not os.path.exists(os.path.join(current, ".git")):
+        parent = os.path.dirname(current)
+        if parent == current:
+            return [root]
+        chain.append(parent)
+        current = parent
+    return chain[::-1]
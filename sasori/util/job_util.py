@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def run_jobs(
+    items: Iterable[T],
+    work: Callable[[T], R],
+    jobs: int = 1,
+) -> Iterator[tuple[T, Optional[R], Optional[Exception]]]:
+    """
+    Run `work` on every item, at most `jobs` at a time on a thread pool, and
+    yield `(item, result, error)` as each one finishes.
+
+    Results are handed back to the calling thread, so whatever it does with
+    them (writing files, asking for confirmation) stays serialized. No new
+    item is started while the caller is busy with a result, which keeps the
+    work in flight bounded. `jobs=1` runs everything in the calling thread,
+    in input order.
+    """
+    if jobs <= 1:
+        for item in items:
+            try:
+                yield item, work(item), None
+            except Exception as err:
+                yield item, None, err
+        return
+
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        it = iter(items)
+        running: dict[Future[R], T] = {}
+
+        def submit() -> None:
+            for item in it:
+                running[pool.submit(work, item)] = item
+                if len(running) >= jobs:
+                    return
+
+        submit()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = running.pop(future)
+                exc = future.exception()
+                if exc is None:
+                    yield item, future.result(), None
+                elif isinstance(exc, Exception):
+                    yield item, None, exc
+                else:
+                    raise exc
+            submit()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
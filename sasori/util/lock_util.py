@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; writes are still atomic
+    fcntl = None  # type: ignore[assignment]
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive `flock` on `path` (created if missing) for the block.
+
+    The lock belongs to the open file description, so it excludes other
+    processes as well as other threads that open the same path. It is not
+    re-entrant; see `ReentrantFileLock`. A no-op where `fcntl` is missing.
+    """
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # closing the descriptor releases the lock
+
+
+class ReentrantFileLock:
+    """
+    `file_lock` that the holding thread may enter again.
+
+    Threads of one process are serialised by an `RLock`; the file lock is
+    taken by the outermost `with` only, so nested sections (e.g. a store's
+    read-modify-write around `HistoryDB.push`) don't deadlock.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._rlock = threading.RLock()
+        self._depth = 0
+
+    @contextmanager
+    def __call__(self) -> Iterator[None]:
+        with self._rlock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+            with file_lock(self.path):
+                self._depth = 1
+                try:
+                    yield
+                finally:
+                    self._depth = 0
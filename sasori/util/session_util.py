@@ -1,3 +1,4 @@
+import functools
 import hashlib
 import os
 from pathlib import Path
@@ -5,12 +6,15 @@ import sys
 from typing import Union
 import typer
 
+# created by whoever first writes into it, not at import
 CACHE_DIR = Path.home() / ".cache" / "cli_history"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def create_session_file(name: str) -> Path:
-    """Return a file path under ~/.cache/cli_history/ incorporating the session id."""
+    """
+    Return a file path under ~/.cache/cli_history/ incorporating the session
+    id. Only builds the path; nothing is created on disk.
+    """
     session_file = CACHE_DIR / f"{name}.{get_session_id()}.json"
     return session_file
 
@@ -19,9 +23,11 @@ def _hash(text: str) -> str:
     return hashlib.md5(text.encode()).hexdigest()[:8]
 
 
+@functools.lru_cache(maxsize=None)
 def get_session_id() -> str:
     """
-    Return a stable hash for the current *terminal* session/pane.
+    Return a stable hash for the current *terminal* session/pane, resolved
+    once per process (`get_session_id.cache_clear()` forces a re-read).
 
     Order of precedence:
       1. $HISTORY_SESSION_ID   – explicit override (great for tests)
@@ -44,8 +50,8 @@ def get_session_id() -> str:
 
 
 def _try_pty() -> Union[str, None]:
+    # no TTY (pipes, CI, IDE runners) is normal: fall through quietly
     try:
         return os.ttyname(sys.stdin.fileno())
-    except Exception as e:
-        typer.secho(f"⚠️  Could not get TTY name: {e}", fg="yellow", err=True)
+    except Exception:
         return None
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, Iterator, Optional
+
+from sasori.util.ignore_util import IgnoreScope
+
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+class Walker(str, Enum):
+    """Directory-walking strategy used by file discovery."""
+
+    WALK = "walk"
+    SCANDIR = "scandir"
+    GIT = "git"
+
+
+# ────────────────────────────────────────────────────────────────────
+# os.walk
+# ────────────────────────────────────────────────────────────────────
+
+
+def walk_tree(root: str, scope: IgnoreScope) -> Iterator[str]:
+    """Single-threaded `os.walk`, pruning ignored directories before descent."""
+    scopes = {root: scope}
+    for dirpath, dirnames, filenames in os.walk(root):
+        current = scopes.pop(dirpath)
+        dirnames[:] = sorted(d for d in dirnames if not current.ignored(d, True))
+        for d in dirnames:
+            scopes[os.path.join(dirpath, d)] = current.child(d)
+        for fname in sorted(filenames):
+            if not current.ignored(fname, False):
+                yield os.path.join(dirpath, fname)
+
+
+# ────────────────────────────────────────────────────────────────────
+# parallel os.scandir
+# ────────────────────────────────────────────────────────────────────
+
+
+def list_dir(path: str) -> tuple[list[str], list[str]]:
+    """
+    Return the sorted file names and subdirectory names of `path` using
+    `os.scandir`. `DirEntry` type information is used as-is, so no extra
+    `stat` is issued on most filesystems. Symlinked directories are left
+    out, as with `os.walk(followlinks=False)`.
+    """
+    files: list[str] = []
+    dirs: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.name)
+                elif not entry.is_symlink():
+                    dirs.append(entry.name)
+    except OSError:
+        return [], []
+    files.sort()
+    dirs.sort()
+    return files, dirs
+
+
+def filter_listing(
+    scope: IgnoreScope, files: list[str], dirs: list[str]
+) -> tuple[list[str], list[IgnoreScope]]:
+    """Apply `scope` to a listing: kept file paths and kept subdirectory scopes."""
+    path = scope.path
+    return (
+        [os.path.join(path, f) for f in files if not scope.ignored(f, False)],
+        [scope.child(d) for d in dirs if not scope.ignored(d, True)],
+    )
+
+
+def scan_dir(scope: IgnoreScope) -> tuple[list[str], list[IgnoreScope]]:
+    """List and filter one directory."""
+    return filter_listing(scope, *list_dir(scope.path))
+
+
+def walk_scandir(
+    scope: IgnoreScope,
+    max_workers: Optional[int] = None,
+    scan: Callable[[IgnoreScope], tuple[list[str], list[IgnoreScope]]] = scan_dir,
+) -> Iterator[str]:
+    """
+    Walk with a bounded pool of `os.scandir` workers, one task per directory.
+
+    Subdirectories are submitted as soon as their parent is listed, but
+    results are consumed depth-first in sorted order, so the output is the
+    same as `walk_tree` regardless of scheduling. `scan` lists one
+    directory (e.g. `DirCache.scan`).
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers or DEFAULT_WORKERS)
+    try:
+        stack: list[Future[tuple[list[str], list[IgnoreScope]]]] = [
+            pool.submit(scan, scope)
+        ]
+        while stack:
+            files, children = stack.pop().result()
+            yield from files
+            stack.extend(reversed([pool.submit(scan, c) for c in children]))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+# ────────────────────────────────────────────────────────────────────
+# git index
+# ────────────────────────────────────────────────────────────────────
+
+
+def _git_ls_files(root: str, *args: str) -> list[str]:
+    out = subprocess.check_output(
+        ["git", "-C", root, "ls-files", "-z", *args], stderr=subprocess.DEVNULL
+    )
+    return [os.fsdecode(p) for p in out.split(b"\0") if p]
+
+
+def _walk_order(rel: str) -> list[tuple[int, str]]:
+    """Sort key that puts a directory's files before its subdirectories."""
+    parts = rel.split("/")
+    return [(1, p) for p in parts[:-1]] + [(0, parts[-1])]
+
+
+def walk_git(
+    root: str, scope: IgnoreScope, include_untracked: bool = False
+) -> Optional[list[str]]:
+    """
+    List files from the git index (`git ls-files`) instead of walking.
+
+    Deleted-but-tracked files are dropped, and `include_untracked` adds
+    untracked files that git does not ignore. The result is filtered with
+    `scope` and sorted like the walkers' output. Returns None when `root`
+    is not inside a git work tree (or git is unavailable).
+    """
+    try:
+        args = ["--cached", "--others", "--exclude-standard"]
+        paths = set(_git_ls_files(root, *(args if include_untracked else args[:1])))
+        paths.difference_update(_git_ls_files(root, "--deleted"))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    scopes: dict[str, Optional[IgnoreScope]] = {"": scope}
+
+    def dir_scope(rel_dir: str) -> Optional[IgnoreScope]:
+        if rel_dir not in scopes:
+            parent_rel, _, name = rel_dir.rpartition("/")
+            parent = dir_scope(parent_rel)
+            scopes[rel_dir] = (
+                None
+                if parent is None or parent.ignored(name, True)
+                else parent.child(name)
+            )
+        return scopes[rel_dir]
+
+    results: list[str] = []
+    for rel in sorted(paths, key=_walk_order):
+        rel_dir, _, name = rel.rpartition("/")
+        current = dir_scope(rel_dir)
+        if current is not None and not current.ignored(name, False):
+            results.append(os.path.join(root, rel))
+    return results
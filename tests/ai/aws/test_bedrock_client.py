@@ -37,6 +37,7 @@ import sasori.ai.aws.bedrock_client as bedrock_client_mod
 
 class DummyConfig:
     model = "dummy-model"
+    max_tokens = 16
 
 
 class DummyBedrockClient(bedrock_client_mod.BedrockClient):
@@ -60,9 +61,25 @@ def test_init_success(monkeypatch, dummy_config):
     monkeypatch.setattr(bedrock_client_mod, "boto3", mock_boto3)
     client = DummyBedrockClient(config=dummy_config)
     assert hasattr(client, "client")
-    mock_boto3.client.assert_called_once_with(
-        "bedrock-runtime", region_name="us-east-1"
-    )
+    mock_boto3.client.assert_called_once()
+    args, kwargs = mock_boto3.client.call_args
+    assert args == ("bedrock-runtime",)
+    assert kwargs["region_name"] == "us-east-1"
+
+
+def test_init_sizes_connection_pool(monkeypatch, dummy_config):
+    mock_boto3 = MagicMock()
+    monkeypatch.setattr(bedrock_client_mod, "boto3", mock_boto3)
+    monkeypatch.setenv("AI_MAX_CONNECTIONS", "32")
+    DummyBedrockClient(config=dummy_config)
+    config = mock_boto3.client.call_args.kwargs["config"]
+    assert config.max_pool_connections == 32
+    assert config.tcp_keepalive is True
+    assert config.retries == {"total_max_attempts": 1}
+    monkeypatch.setenv("AI_MAX_CONNECTIONS", "2")
+    DummyBedrockClient(config=dummy_config)
+    config = mock_boto3.client.call_args.kwargs["config"]
+    assert config.max_pool_connections == DummyBedrockClient.ASYNC_WORKERS
 
 
 def test_init_failure(monkeypatch, dummy_config):
@@ -137,3 +154,32 @@ def test_get_response_boto_error(monkeypatch, dummy_config):
     with pytest.raises(RuntimeError) as excinfo:
         client.get_response([{"role": "user", "content": "fail"}])
     assert "Bedrock request failed" in str(excinfo.value)
+
+
+def test_aget_response_runs_invoke_model_in_executor(monkeypatch, dummy_config):
+    import asyncio
+    import json
+
+    mock_client = MagicMock()
+    mock_resp = {"body": MagicMock()}
+    mock_resp["body"].read.return_value = json.dumps({"output": "async!"})
+    mock_client.invoke_model.return_value = mock_resp
+    monkeypatch.setattr(
+        bedrock_client_mod,
+        "boto3",
+        MagicMock(client=MagicMock(return_value=mock_client)),
+    )
+    monkeypatch.setattr(bedrock_client_mod, "BedrockClientConfig", type(dummy_config))
+    client = DummyBedrockClient(config=dummy_config)
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                client.aget_response([{"role": "user", "content": "hi"}])
+                for _ in range(3)
+            )
+        )
+
+    assert asyncio.run(main()) == ["async!"] * 3
+    assert mock_client.invoke_model.call_count == 3
+    assert client._executor._max_workers == DummyBedrockClient.ASYNC_WORKERS
@@ -27,7 +27,7 @@ def dummy_openai(monkeypatch):
         chat = DummyChat()
 
     monkeypatch.setattr(
-        "sasori.ai.openai.openai_client.OpenAI", lambda api_key: DummyClient()
+        "sasori.ai.openai.openai_client.OpenAI", lambda api_key, **kwargs: DummyClient()
     )
 
 
@@ -45,7 +45,7 @@ def test_init_raises_if_no_api_key(monkeypatch):
 def test_init_sets_client(monkeypatch, set_openai_api_key):
     dummy_client = object()
     monkeypatch.setattr(
-        "sasori.ai.openai.openai_client.OpenAI", lambda api_key: dummy_client
+        "sasori.ai.openai.openai_client.OpenAI", lambda api_key, **kwargs: dummy_client
     )
     client = OpenAIClient()
     assert client.client is dummy_client
@@ -85,10 +85,58 @@ def test_get_response_returns_empty_string_if_no_content(
         chat = DummyChat()
 
     monkeypatch.setattr(
-        "sasori.ai.openai.openai_client.OpenAI", lambda api_key: DummyClient()
+        "sasori.ai.openai.openai_client.OpenAI", lambda api_key, **kwargs: DummyClient()
     )
     client = OpenAIClient()
     # Use the correct type for messages to satisfy mypy
     messages: List[Any] = [{"role": "user", "content": "Say hi"}]
     result = client.get_response(messages)
     assert result == ""
+
+
+def test_aget_response_uses_async_client(monkeypatch, set_openai_api_key):
+    import asyncio
+
+    class DummyAsyncCompletions:
+        async def create(self, **kwargs):
+            assert kwargs["messages"] == [{"role": "user", "content": "hi"}]
+            return DummyResponse()
+
+    class DummyAsyncClient:
+        def __init__(self, api_key, max_retries=None, http_client=None):
+            self.chat = type("Chat", (), {"completions": DummyAsyncCompletions()})()
+
+    monkeypatch.setattr(
+        "sasori.ai.openai.openai_client.OpenAI", lambda api_key, **kwargs: object()
+    )
+    monkeypatch.setattr("sasori.ai.openai.openai_client.AsyncOpenAI", DummyAsyncClient)
+    client = OpenAIClient()
+    result = asyncio.run(client.aget_response([{"role": "user", "content": "hi"}]))
+    assert result == "Hello, world!"
+    assert client.async_client is client.async_client
+
+
+def test_init_sizes_connection_pool(monkeypatch, set_openai_api_key):
+    monkeypatch.setenv("AI_MAX_CONNECTIONS", "4")
+    seen = {}
+    monkeypatch.setattr(
+        "sasori.ai.openai.openai_client.OpenAI",
+        lambda api_key, max_retries, http_client: seen.update(
+            max_retries=max_retries, http_client=http_client
+        )
+        or http_client,
+    )
+    client = OpenAIClient()
+    assert client._limits.max_connections == 4
+    assert client._limits.max_keepalive_connections == 4
+    assert seen["http_client"] is client.client
+    assert seen["max_retries"] == 0
+
+
+def test_sdk_retries_are_disabled(monkeypatch, set_openai_api_key):
+    import openai
+
+    client = OpenAIClient()
+    assert client.client.max_retries == 0
+    assert client.async_client.max_retries == 0
+    assert isinstance(client.async_client, openai.AsyncOpenAI)
@@ -209,3 +209,85 @@ def test_format_messages_with_all_sections(ai_client):
         assert msgs[2]["content"] == "sf:p.txt"
         assert msgs[3]["content"] == "promptA"
         assert msgs[4]["content"] == "final!"
+
+
+def test_prepared_context_reads_shared_files_once(ai_client):
+    with (
+        patch("sasori.ai.ai_client.get_instruction_strings", return_value=["sys"]),
+        patch(
+            "sasori.ai.ai_client.get_shared_files", return_value=["s.txt"]
+        ) as mock_shared,
+        patch(
+            "sasori.ai.ai_client.stringify_file_contents",
+            side_effect=lambda files, *args, **kwargs: [f"sf:{f}" for f in files],
+        ) as mock_stringify,
+        patch("sasori.ai.ai_client.get_latest_prompts", return_value=["promptA"]),
+    ):
+        instructions = [MagicMock(spec=DummyInstruction)]
+        expected = ai_client._format_messages(
+            instructions=instructions, prompt_files=["p1.txt"], final_prompt="go"
+        )
+        mock_shared.reset_mock()
+        mock_stringify.reset_mock()
+
+        context = ai_client.prepare_context(instructions)
+        batch = [
+            ai_client._format_messages(
+                prompt_files=[f"p{i}.txt"], final_prompt="go", context=context
+            )
+            for i in (1, 2, 3)
+        ]
+        assert batch[0] == expected
+        assert batch[2][2]["content"] == "sf:p3.txt"
+        mock_shared.assert_called_once()
+        # one call for the shared files, then one per processed file
+        assert mock_stringify.call_count == 1 + 3
+
+
+def test_prepared_context_rejects_instructions(ai_client):
+    with pytest.raises(ValueError):
+        ai_client._format_messages(
+            instructions=[MagicMock(spec=DummyInstruction)],
+            context=ai_client.prepare_context(),
+        )
+
+
+def test_aget_response_runs_blocking_call_on_client_pool(ai_client):
+    import asyncio
+    import threading
+
+    seen = []
+
+    def get_response(messages):
+        seen.append(threading.current_thread().name)
+        return f"echo:{messages}"
+
+    ai_client.get_response = get_response
+
+    async def main():
+        return await asyncio.gather(*(ai_client.aget_response(i) for i in range(5)))
+
+    assert asyncio.run(main()) == [f"echo:{i}" for i in range(5)]
+    assert all(name.startswith("DummyAIClient") for name in seen)
+
+
+def test_asend_message_uses_context(monkeypatch, ai_client):
+    import asyncio
+
+    calls = {}
+
+    def fake_format(**kwargs):
+        calls.update(kwargs)
+        return ["msg"]
+
+    async def fake_aget(messages):
+        return f"async:{messages}"
+
+    monkeypatch.setattr(ai_client, "_format_messages", fake_format)
+    monkeypatch.setattr(ai_client, "aget_response", fake_aget)
+    context = object()
+    result = asyncio.run(
+        ai_client.asend_message(prompt_files=["a.py"], context=context)
+    )
+    assert result == "async:['msg']"
+    assert calls["context"] is context and calls["prompt_files"] == ["a.py"]
@@ -1,3 +1,4 @@
+import dataclasses
 import pytest
 import types
 
@@ -15,6 +16,7 @@ def patch_ai_clients(monkeypatch):
     )
     monkeypatch.setitem(ai_client_factory.AI_CLIENTS, "openai", dummy_openai)
     monkeypatch.setitem(ai_client_factory.AI_CLIENTS, "claude", dummy_claude)
+    monkeypatch.setattr(ai_client_factory, "_clients", {})
     yield
 
 
@@ -50,3 +52,60 @@ def test_get_ai_client_unsupported_client(monkeypatch):
     assert "unknown_client" in str(excinfo.value)
     assert "openai" in str(excinfo.value)
     assert "claude" in str(excinfo.value)
+
+
+def test_lazy_factory_imports_module_on_call(monkeypatch):
+    imported = []
+
+    def fake_import(module):
+        imported.append(module)
+        return types.SimpleNamespace(Client=lambda config: ("built", config))
+
+    monkeypatch.setattr(ai_client_factory.importlib, "import_module", fake_import)
+    build = ai_client_factory._lazy("some.provider", "Client")
+    assert imported == []
+    assert build("cfg") == ("built", "cfg")
+    assert imported == ["some.provider"]
+
+
+@dataclasses.dataclass
+class DummyConfig:
+    model: str = "m"
+    temperature: float = 0.5
+
+
+def test_get_ai_client_reuses_instance(monkeypatch):
+    monkeypatch.setenv("AI_CLIENT", "openai")
+    built = []
+    monkeypatch.setitem(
+        ai_client_factory.AI_CLIENTS,
+        "openai",
+        lambda config=None: built.append(config) or types.SimpleNamespace(),
+    )
+    first = ai_client_factory.get_ai_client()
+    assert ai_client_factory.get_ai_client() is first
+    assert ai_client_factory.get_ai_client(DummyConfig()) is not first
+    assert ai_client_factory.get_ai_client(
+        DummyConfig()
+    ) is ai_client_factory.get_ai_client(DummyConfig())
+    assert ai_client_factory.get_ai_client(
+        DummyConfig(temperature=0.1)
+    ) is not ai_client_factory.get_ai_client(DummyConfig())
+    assert len(built) == 3
+
+
+def test_get_ai_client_keys_on_provider_and_pool_size(monkeypatch):
+    monkeypatch.setenv("AI_CLIENT", "openai")
+    openai = ai_client_factory.get_ai_client()
+    monkeypatch.setenv("AI_CLIENT", "claude")
+    assert ai_client_factory.get_ai_client() is not openai
+    monkeypatch.setenv("AI_CLIENT", "openai")
+    monkeypatch.setenv("AI_MAX_CONNECTIONS", "4")
+    assert ai_client_factory.get_ai_client() is not openai
+
+
+def test_get_ai_client_rejects_bad_pool_size(monkeypatch):
+    monkeypatch.setenv("AI_CLIENT", "openai")
+    monkeypatch.setenv("AI_MAX_CONNECTIONS", "many")
+    with pytest.raises(ValueError, match="AI_MAX_CONNECTIONS"):
+        ai_client_factory.get_ai_client()
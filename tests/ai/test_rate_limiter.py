@@ -0,0 +1,232 @@
+import asyncio
+
+import pytest
+
+import sasori.ai.rate_limiter as rate_limiter
+from sasori.ai.rate_limiter import (
+    AdaptiveLimit,
+    Throttle,
+    TokenBucket,
+    estimate_tokens,
+    get_throttle,
+    is_throttle,
+)
+
+
+class Throttled(Exception):
+    status_code = 429
+
+
+class ClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    slept = []
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limiter.time, "sleep", slept.append)
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda lo, hi: hi)
+    return now, slept
+
+
+@pytest.fixture
+def fresh_throttles(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_throttles", {})
+
+
+def test_token_bucket_waits_for_refill(clock):
+    now, _ = clock
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    assert bucket.reserve(1) == pytest.approx(2.0)
+    now[0] += 10
+    assert bucket.reserve(1) == 0.0
+
+
+def test_token_bucket_caps_oversized_request(clock):
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.reserve(1000) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_adaptive_limit_halves_on_throttle_and_grows_back():
+    limit = AdaptiveLimit(maximum=8)
+    assert limit.try_enter()
+    limit.leave(throttled=True)
+    assert limit.limit == 4
+    for _ in range(4):
+        assert limit.try_enter()
+    assert not limit.try_enter()
+    for _ in range(4):
+        limit.leave(throttled=False)
+    assert 4 < limit.limit <= 8
+
+
+def test_adaptive_limit_never_below_minimum():
+    limit = AdaptiveLimit(maximum=2)
+    for _ in range(5):
+        limit.enter()
+        limit.leave(throttled=True)
+    assert limit.limit == 1
+    assert limit.try_enter()
+
+
+def test_call_retries_throttles_with_backoff(clock):
+    _, slept = clock
+    outcomes = [Throttled("slow down"), ClientError("ThrottlingException"), "ok"]
+
+    def request():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    throttle = Throttle(max_concurrency=4, base_delay=1.0)
+    assert throttle.call(request) == "ok"
+    assert throttle.throttled == 2
+    assert [s for s in slept if s] == [1.0, 2.0]
+    assert throttle.concurrency.limit < 4
+    assert throttle.concurrency.in_flight == 0
+
+
+def test_call_raises_other_errors_immediately(clock):
+    calls = []
+
+    def request():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    throttle = Throttle()
+    with pytest.raises(ValueError):
+        throttle.call(request)
+    assert calls == [1]
+    assert throttle.concurrency.in_flight == 0
+
+
+def test_call_gives_up_after_max_retries(clock):
+    def request():
+        raise Throttled("still throttled")
+
+    with pytest.raises(Throttled):
+        Throttle(max_retries=2).call(request)
+
+
+def test_call_waits_for_request_budget(clock):
+    _, slept = clock
+    throttle = Throttle(rpm=60)
+    for _ in range(61):
+        throttle.call(lambda: None)
+    assert slept[-1] == pytest.approx(1.0)
+
+
+def test_acall_retries_throttles(monkeypatch):
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", no_sleep)
+    monkeypatch.setattr(rate_limiter.typer, "secho", lambda *a, **k: None)
+    attempts = []
+
+    async def request():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise Throttled("slow down")
+        return "ok"
+
+    throttle = Throttle()
+    assert asyncio.run(throttle.acall(request)) == "ok"
+    assert len(attempts) == 2
+    assert throttle.concurrency.in_flight == 0
+
+
+def test_cancelled_acall_frees_its_slot():
+    async def slow():
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "ok"
+
+    async def main(throttle):
+        for _ in range(2):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(throttle.acall(slow), 0.05)
+        return await asyncio.wait_for(throttle.acall(fast), 1)
+
+    throttle = Throttle(max_concurrency=2)
+    assert asyncio.run(main(throttle)) == "ok"
+    assert throttle.concurrency.in_flight == 0
+    assert throttle.concurrency.limit == 2
+
+
+def test_interrupted_call_frees_its_slot(clock):
+    def request():
+        raise KeyboardInterrupt
+
+    throttle = Throttle(max_concurrency=1)
+    with pytest.raises(KeyboardInterrupt):
+        throttle.call(request)
+    assert throttle.concurrency.in_flight == 0
+    assert throttle.call(lambda: "ok") == "ok"
+
+
+def test_other_errors_leave_the_limit_alone(clock):
+    throttle = Throttle(max_concurrency=8)
+    throttle.concurrency.limit = 4.0
+
+    def request():
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        throttle.call(request)
+    assert throttle.concurrency.limit == 4.0
+    assert throttle.concurrency.in_flight == 0
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (Throttled("429"), True),
+        (ClientError("ThrottlingException"), True),
+        (ClientError("ValidationException"), False),
+        (ValueError("nope"), False),
+    ],
+)
+def test_is_throttle(exc, expected):
+    assert is_throttle(exc) is expected
+
+
+def test_is_throttle_ignores_exhausted_quota():
+    exc = Throttled("quota")
+    exc.code = "insufficient_quota"
+    assert not is_throttle(exc)
+
+
+def test_estimate_tokens():
+    messages = [{"role": "user", "content": "x" * 400}]
+    assert estimate_tokens(messages, max_tokens=50) == 150
+
+
+def test_get_throttle_shared_per_key_and_configured_from_env(
+    monkeypatch, fresh_throttles
+):
+    monkeypatch.setenv("AI_RPM", "120")
+    monkeypatch.setenv("AI_MAX_CONCURRENCY", "3")
+    monkeypatch.setenv("AI_MAX_RETRIES", "0")
+    throttle = get_throttle("openai:gpt")
+    assert get_throttle("openai:gpt") is throttle
+    assert get_throttle("bedrock:claude") is not throttle
+    assert throttle.requests is not None and throttle.requests.capacity == 120
+    assert throttle.tokens is None
+    assert throttle.concurrency.maximum == 3
+    assert throttle.max_retries == 0
+
+
+def test_get_throttle_rejects_non_numbers(monkeypatch, fresh_throttles):
+    monkeypatch.setenv("AI_TPM", "lots")
+    with pytest.raises(ValueError, match="AI_TPM"):
+        get_throttle("openai:gpt")
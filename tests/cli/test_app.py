@@ -83,3 +83,17 @@ def test_clipboard_get_unavailable():
         result = runner.invoke(app, ["clipboard"])
         assert result.exit_code != 0
         assert "Clipboard not available on this system." in result.output
+
+
+def test_stats_command():
+    with (
+        patch("sasori.cli.app.stats_prompts", return_value="P stats"),
+        patch("sasori.cli.app.stats_shared_files", return_value="S stats"),
+        patch("sasori.cli.app.stats_processing_files", return_value="Q stats"),
+    ):
+        result = runner.invoke(app, ["stats"])
+
+    assert result.exit_code == 0
+    assert "P stats" in result.output
+    assert "S stats" in result.output
+    assert "Q stats" in result.output
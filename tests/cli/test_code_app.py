@@ -58,7 +58,39 @@ def test_create_tests(
         "/repo/root/tests/file1_test.py": "test content"
     }
 
-    create_tests(force=True)
+    create_tests(force=True, jobs=1)
 
     assert mock_ai_client.send_message.call_count == 2
+    mock_ai_client.prepare_context.assert_called_once()
+    context = mock_ai_client.prepare_context.return_value
+    for call in mock_ai_client.send_message.call_args_list:
+        assert call.kwargs["context"] is context
     mock_rewrite_files.assert_called()
+
+
+def test_create_tests_with_jobs_writes_from_calling_thread(
+    mock_ai_client,
+    mock_get_processing_files,
+    mock_find_repo_root,
+    mock_source_to_test_path,
+    mock_rewrite_files,
+    mock_parse_code_response,
+):
+    import threading
+
+    files = [f"file{i}.py" for i in range(6)] + ["pkg/__init__.py"]
+    mock_get_processing_files.return_value = files
+    mock_find_repo_root.return_value = Path("/repo/root")
+    mock_source_to_test_path.side_effect = lambda src, repo_root: src
+    mock_parse_code_response.side_effect = lambda response: {response: "x"}
+    mock_ai_client.send_message.side_effect = lambda **kw: kw["final_prompt"]
+    writer_threads = []
+    mock_rewrite_files.side_effect = lambda **kw: writer_threads.append(
+        threading.get_ident()
+    )
+
+    create_tests(force=True, jobs=3)
+
+    assert mock_ai_client.send_message.call_count == 6
+    assert mock_rewrite_files.call_count == 6
+    assert set(writer_threads) == {threading.get_ident()}
@@ -9,7 +9,7 @@ runner = CliRunner()
 @pytest.fixture(autouse=True)
 def mock_dependencies():
     with (
-        patch("sasori.cli.file_app.append_shared_file") as mock_append,
+        patch("sasori.cli.file_app.append_shared_files") as mock_append,
         patch("sasori.cli.file_app.remove_shared_file") as mock_remove,
         patch("sasori.cli.file_app.clear_shared_files") as mock_clear,
         patch(
@@ -29,13 +29,14 @@ def mock_dependencies():
 
 def test_add_file(mock_dependencies):
     with patch(
-        "sasori.cli.file_app.get_all_files",
+        "sasori.cli.file_app.iter_files",
         return_value=["/path/to/file1", "/path/to/file2"],
     ):
         result = runner.invoke(file_app, ["add", "/path/to"])
         assert result.exit_code == 0
-        mock_dependencies["append"].assert_any_call("/path/to/file1")
-        mock_dependencies["append"].assert_any_call("/path/to/file2")
+        mock_dependencies["append"].assert_called_once_with(
+            ["/path/to/file1", "/path/to/file2"]
+        )
 
 
 def test_remove_file(mock_dependencies):
@@ -44,6 +45,13 @@ def test_remove_file(mock_dependencies):
     mock_dependencies["remove"].assert_called_once_with("/path/to/file1")
 
 
+def test_remove_resolves_relative_path(mock_dependencies, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = runner.invoke(file_app, ["remove", "src"])
+    assert result.exit_code == 0
+    mock_dependencies["remove"].assert_called_once_with(str(tmp_path.resolve() / "src"))
+
+
 def test_clear_files(mock_dependencies):
     result = runner.invoke(file_app, ["clear"])
     assert result.exit_code == 0
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import pytest
+
+# generous budget for `import sasori.main`: ~70 ms locally, ~500 ms back when
+# both provider SDKs were imported eagerly
+IMPORT_BUDGET_US = 250_000
+PROVIDER_SDKS = ("openai", "boto3", "botocore")
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Cumulative import time (µs) per module, from `python -X importtime`."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture(scope="module")
+def startup():
+    return _importtime("sasori.main")
+
+
+def test_startup_skips_provider_sdks(startup):
+    loaded = [m for m in startup if m.split(".")[0] in PROVIDER_SDKS]
+    assert loaded == []
+
+
+def test_startup_within_budget(startup):
+    assert startup["sasori.main"] < IMPORT_BUDGET_US
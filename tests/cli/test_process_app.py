@@ -1,7 +1,11 @@
+import os
+from pathlib import Path
+
 import pytest
 from typer.testing import CliRunner
 from sasori.cli.process_app import process_app
-from unittest.mock import patch, call
+from sasori.util.walk_util import Walker
+from unittest.mock import patch
 
 runner = CliRunner()
 
@@ -9,32 +13,65 @@ runner = CliRunner()
 @pytest.fixture(autouse=True)
 def mock_file_operations():
     with (
-        patch("sasori.cli.process_app.get_all_files") as mock_get_all_files,
-        patch("sasori.cli.process_app.append_processing_file") as mock_append,
+        patch("sasori.cli.process_app.iter_files") as mock_iter_files,
+        patch("sasori.cli.process_app.append_processing_files") as mock_append,
         patch("sasori.cli.process_app.remove_processing_file") as mock_remove,
         patch("sasori.cli.process_app.clear_processing_files") as mock_clear,
         patch("sasori.cli.process_app.summary_processing_files") as mock_summary,
         patch("sasori.cli.process_app.undo_processing_files") as mock_undo,
     ):
-        mock_get_all_files.return_value = ["file1.txt", "file2.txt"]
+        mock_iter_files.return_value = ["file1.txt", "file2.txt"]
         mock_summary.return_value = "Current files: file1.txt, file2.txt"
-        yield mock_get_all_files, mock_append, mock_remove, mock_clear, mock_summary, mock_undo
+        yield mock_iter_files, mock_append, mock_remove, mock_clear, mock_summary, mock_undo
+
 
+@pytest.fixture
+def mock_iter_files(mock_file_operations):
+    return mock_file_operations[0]
 
-def test_add_file(mock_file_operations):
-    mock_get_all_files, mock_append, _, _, _, _ = mock_file_operations
+
+def test_add_file(mock_file_operations, mock_iter_files):
+    _, mock_append, _, _, _, _ = mock_file_operations
     result = runner.invoke(process_app, ["add", "dummy_path"])
     assert result.exit_code == 0
-    mock_get_all_files.assert_called_once_with("dummy_path")
-    mock_append.assert_has_calls([call("file1.txt"), call("file2.txt")])
+    mock_iter_files.assert_called_once_with(
+        "dummy_path", walker=Walker.WALK, include_untracked=False, use_cache=False
+    )
+    mock_append.assert_called_once_with(["file1.txt", "file2.txt"])
+
+
+def test_add_file_with_scandir_walker(mock_iter_files):
+    result = runner.invoke(process_app, ["add", "dummy_path", "--walker", "scandir"])
+    assert result.exit_code == 0
+    mock_iter_files.assert_called_once_with(
+        "dummy_path", walker=Walker.SCANDIR, include_untracked=False, use_cache=False
+    )
 
 
 def test_remove_file(mock_file_operations):
-    mock_get_all_files, _, mock_remove, _, _, _ = mock_file_operations
+    mock_iter_files, _, mock_remove, _, _, _ = mock_file_operations
     result = runner.invoke(process_app, ["remove", "path"])
     assert result.exit_code == 0
-    mock_get_all_files.assert_called_once_with("path")
-    mock_remove.assert_has_calls([call("file1.txt"), call("file2.txt")])
+    mock_iter_files.assert_not_called()
+    mock_remove.assert_called_once_with(str(Path("path").resolve()))
+
+
+def test_remove_resolves_relative_path(mock_file_operations, tmp_path, monkeypatch):
+    _, _, mock_remove, _, _, _ = mock_file_operations
+    (tmp_path / "src").mkdir()
+    monkeypatch.chdir(tmp_path)
+    result = runner.invoke(process_app, ["remove", "./src/a.py"])
+    assert result.exit_code == 0
+    mock_remove.assert_called_once_with(str(tmp_path.resolve() / "src" / "a.py"))
+
+
+def test_remove_keeps_trailing_separator(mock_file_operations, tmp_path, monkeypatch):
+    _, _, mock_remove, _, _, _ = mock_file_operations
+    (tmp_path / "src").mkdir()
+    monkeypatch.chdir(tmp_path)
+    result = runner.invoke(process_app, ["remove", f"src{os.sep}"])
+    assert result.exit_code == 0
+    mock_remove.assert_called_once_with(str(tmp_path.resolve() / "src") + os.sep)
 
 
 def test_clear_files(mock_file_operations):
@@ -57,3 +94,13 @@ def test_undo_file(mock_file_operations):
     result = runner.invoke(process_app, ["undo"])
     assert result.exit_code == 0
     mock_undo.assert_called_once()
+
+
+def test_add_file_with_git_walker_and_untracked(mock_iter_files):
+    result = runner.invoke(
+        process_app, ["add", "dummy_path", "--walker", "git", "--untracked"]
+    )
+    assert result.exit_code == 0
+    mock_iter_files.assert_called_once_with(
+        "dummy_path", walker=Walker.GIT, include_untracked=True, use_cache=False
+    )
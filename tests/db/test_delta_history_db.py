@@ -0,0 +1,137 @@
+import json
+
+import pytest
+
+from sasori.db.delta_history_db import DeltaHistoryDB
+
+
+def _sorted_set(lst):
+    return sorted({p.strip() for p in lst if p.strip()})
+
+
+def _dedupe(lines):
+    return [ln.strip() for ln in lines if ln.strip()]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "history.delta.json"
+
+
+def _db(path, normalise=_sorted_set, checkpoint_every=50):
+    return DeltaHistoryDB(
+        path, empty=[], normalise=normalise, checkpoint_every=checkpoint_every
+    )
+
+
+def test_bootstrap_writes_single_checkpoint(db_path):
+    db = _db(db_path)
+    assert not db_path.exists()
+    assert db.latest() == []
+    db.clear()
+    doc = json.loads(db_path.read_text())
+    assert doc["head"] == []
+    assert doc["entries"] == [{"=": []}]
+    assert db.latest() == []
+
+
+def test_push_stores_deltas_and_head(db_path):
+    db = _db(db_path)
+    db.push(["b", "a"])
+    db.push(["a", "b", "c"])
+    db.push(["a", "c"])
+    doc = json.loads(db_path.read_text())
+    assert doc["head"] == ["a", "c"]
+    assert doc["entries"][1:] == [
+        {"+": ["a", "b"], "-": []},
+        {"+": ["c"], "-": []},
+        {"+": [], "-": ["b"]},
+    ]
+    assert db.latest() == ["a", "c"]
+
+
+def test_undo_applies_inverse_delta(db_path):
+    db = _db(db_path)
+    db.push(["a", "b"])
+    db.push(["a", "b", "c"])
+    db.push(["a", "c"])
+    assert db.undo() is True
+    assert db.latest() == ["a", "b", "c"]
+    assert db.undo() is True
+    assert db.latest() == ["a", "b"]
+    assert db.undo() is True
+    assert db.latest() == []
+    assert db.undo() is False
+
+
+def test_checkpoint_every_bounds_replay(db_path):
+    db = _db(db_path, checkpoint_every=2)
+    for i in range(6):
+        db.push([str(n) for n in range(i + 1)])
+    entries = json.loads(db_path.read_text())["entries"]
+    kinds = ["=" if "=" in e else "+" for e in entries]
+    assert kinds == ["=", "+", "+", "=", "+", "+", "="]
+    # popping a checkpoint replays from the previous one
+    assert db.undo() is True
+    assert db.latest() == [str(n) for n in range(5)]
+
+
+def test_non_invertible_change_is_checkpointed(db_path):
+    db = _db(db_path, normalise=_dedupe)
+    db.push(["one", "two", "three"])
+    db.push(["one", "three"])
+    entries = json.loads(db_path.read_text())["entries"]
+    # re-adding "two" on undo would append it at the end, so keep a full copy
+    assert entries[-1] == {"=": ["one", "three"]}
+    db.undo()
+    assert db.latest() == ["one", "two", "three"]
+
+
+def test_load_expands_full_history(db_path):
+    db = _db(db_path)
+    snapshots = [[], ["a"], ["a", "b"], ["b"], ["b", "c", "d"]]
+    for snap in snapshots[1:]:
+        db.push(snap)
+    assert db._load() == snapshots
+
+
+def test_clear_resets(db_path):
+    db = _db(db_path)
+    db.push(["a"])
+    db.clear()
+    assert db.latest() == []
+    assert db.undo() is False
+
+
+def test_corrupt_file_resets(db_path, capsys):
+    db_path.write_text("[]")
+    db = _db(db_path)
+    assert db.latest() == []
+    assert "Failed to load" in capsys.readouterr().err
+
+
+def test_pruning_rebases_on_a_checkpoint(db_path):
+    db = DeltaHistoryDB(db_path, empty=[], normalise=_sorted_set, max_depth=3)
+    for i in range(6):
+        db.push([str(n) for n in range(i + 1)])
+    entries = json.loads(db_path.read_text())["entries"]
+    assert entries[0] == {"=": ["0", "1", "2", "3"]}
+    assert db.depth() == 3
+    assert db._load()[-1] == ["0", "1", "2", "3", "4", "5"]
+
+
+def test_failed_save_leaves_cache_untouched(db_path, monkeypatch, capsys):
+    db = _db(db_path)
+    db.push(["a"])
+
+    def fail(doc):
+        raise ValueError("cannot encode")
+
+    monkeypatch.setattr(db._codec, "encode", fail)
+    db.push(["a", "b"])
+    assert "Failed to save" in capsys.readouterr().err
+    assert db.latest() == ["a"]
+    assert db.depth() == 2
+    db.undo()
+    assert db.latest() == ["a"]
+    assert db.depth() == 2
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 
 # Patch external dependencies at the top of the module
-patch("sasori.db.file_history_db.HistoryDB", autospec=True).start()
+patch("sasori.db.file_history_db.get_history_db", autospec=True).start()
 patch(
     "sasori.db.file_history_db.create_session_file",
     return_value="mocked_session_file",
@@ -22,7 +22,9 @@ def cleanup_patches():
 def mock_historydb(monkeypatch):
     # Patch HistoryDB instance methods for each test
     mock_db = MagicMock()
-    monkeypatch.setattr("sasori.db.file_history_db.HistoryDB", lambda *a, **kw: mock_db)
+    monkeypatch.setattr(
+        "sasori.db.file_history_db.get_history_db", lambda *a, **kw: mock_db
+    )
     return mock_db
 
 
@@ -108,7 +110,124 @@ def test_summary_returns_db_summary(store, mock_historydb):
     assert store.summary() == "summary text"
 
 
-def test_latest_set_returns_set(store, mock_historydb):
-    mock_historydb.latest.return_value = ["a.txt", "b.txt"]
-    result = store.latest_set()
-    assert result == {"a.txt", "b.txt"}
+def test_latest_returns_the_snapshot_without_copying(store, mock_historydb):
+    snapshot = ["a.txt", "b.txt"]
+    mock_historydb.latest.return_value = snapshot
+    assert store.latest() is snapshot
+
+
+def test_append_many_pushes_once(store, mock_historydb):
+    mock_historydb.latest.return_value = ["a.txt"]
+    added = store.append_many(iter([" b.txt ", "a.txt", "", "c.txt", "b.txt"]))
+    assert added == 2
+    mock_historydb.push.assert_called_once_with(["a.txt", "b.txt", "c.txt"])
+
+
+def test_append_many_nothing_new(store, mock_historydb, capsys):
+    mock_historydb.latest.return_value = ["a.txt"]
+    assert store.append_many(["a.txt", "  "]) == 0
+    assert not mock_historydb.push.called
+    assert "No new paths" in capsys.readouterr().out
+
+
+def test_remove_many_pushes_once(store, mock_historydb):
+    mock_historydb.latest.return_value = ["a.txt", "b.txt", "c.txt"]
+    removed = store.remove_many(["a.txt", "c.txt ", "zzz.txt"])
+    assert removed == 2
+    mock_historydb.push.assert_called_once_with(["b.txt"])
+
+
+def test_remove_many_nothing_tracked(store, mock_historydb, capsys):
+    mock_historydb.latest.return_value = ["a.txt"]
+    assert store.remove_many(["b.txt"]) == 0
+    assert not mock_historydb.push.called
+    assert "None of the paths are tracked" in capsys.readouterr().out
+
+
+def test_append_many_pushes_under_lock(store, mock_historydb):
+    mock_historydb.latest.return_value = []
+    store.append_many(["a"])
+    mock_historydb.locked.assert_called_once()
+    mock_historydb.locked.return_value.__enter__.assert_called_once()
+
+
+FILES = [
+    "/repo/README.md",
+    "/repo/src",
+    "/repo/src-old/x.py",
+    "/repo/src/a.py",
+    "/repo/src/pkg/b.py",
+    "/repo/srcs.txt",
+]
+
+
+@pytest.mark.parametrize("target", ["/repo/src", "/repo/src/"])
+def test_remove_directory_drops_subtree(store, mock_historydb, target):
+    mock_historydb.latest.return_value = FILES
+    assert store.remove(target) == 3
+    mock_historydb.push.assert_called_once_with(
+        ["/repo/README.md", "/repo/src-old/x.py", "/repo/srcs.txt"]
+    )
+
+
+def test_remove_directory_without_exact_entry(store, mock_historydb):
+    mock_historydb.latest.return_value = FILES
+    assert store.remove("/repo/src/pkg") == 1
+    (pushed,), _ = mock_historydb.push.call_args
+    assert "/repo/src/pkg/b.py" not in pushed and "/repo/src/a.py" in pushed
+
+
+def test_append_keeps_snapshot_sorted(store, mock_historydb):
+    mock_historydb.latest.return_value = ["b.txt", "d.txt"]
+    store.append("c.txt")
+    mock_historydb.push.assert_called_once_with(["b.txt", "c.txt", "d.txt"])
+
+
+def test_contains_bisects_the_snapshot(store, mock_historydb):
+    mock_historydb.latest.return_value = FILES
+    assert store.contains(" /repo/src/a.py ")
+    assert not store.contains("/repo/src/missing.py")
+    mock_historydb.contains.assert_not_called()
+
+
+@pytest.fixture
+def sqlite_store(tmp_path, monkeypatch):
+    from sasori.db.sqlite_history_db import SQLiteHistoryDB
+
+    monkeypatch.setattr(
+        "sasori.db.file_history_db.get_history_db",
+        lambda _file, codec=None, **kw: SQLiteHistoryDB(tmp_path / "h.sqlite3", **kw),
+    )
+    store = FileHistoryStore("test_name", "Test Label")
+    yield store
+    store._db.close()
+
+
+def test_sqlite_store_changes_rows_without_snapshots(sqlite_store, monkeypatch):
+    db = sqlite_store._db
+    db.push(FILES)
+    monkeypatch.setattr(db, "push", MagicMock(side_effect=AssertionError))
+    monkeypatch.setattr(db, "latest", MagicMock(side_effect=AssertionError))
+    sqlite_store.append("/repo/src/c.py")
+    assert sqlite_store.contains("/repo/src/c.py")
+    assert sqlite_store.remove("/repo/src/") == 4
+    assert sqlite_store.append_many(["/repo/a", "/repo/b", "/repo/a"]) == 2
+    assert sqlite_store.remove_many(["/repo/a", "/repo/missing"]) == 1
+    monkeypatch.undo()
+    assert db.latest() == [
+        "/repo/README.md",
+        "/repo/b",
+        "/repo/src-old/x.py",
+        "/repo/srcs.txt",
+    ]
+    assert db.depth() == 6
+
+
+def test_sqlite_store_reports_no_change(sqlite_store, capsys):
+    sqlite_store.append_many(["a.txt"])
+    sqlite_store.append("a.txt")
+    assert sqlite_store.remove("b.txt") == 0
+    out = capsys.readouterr().out
+    assert "Path already present: a.txt" in out
+    assert "Path not tracked: b.txt" in out
+    assert sqlite_store._db.depth() == 2
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from sasori.db.history_codec import CompactCodec, HistoryCodec
+from sasori.db.history_db import HistoryDB
+from sasori.db.journal_history_db import JournalHistoryDB
+
+PATHS = ["/repo/src/a.py", "/repo/src/ab.py", "/repo/tests/test_a.py", ""]
+DOC = {"head": PATHS, "entries": [{"=": PATHS}, {"+": ["x"], "-": []}], "n": 1}
+
+CODECS = [
+    HistoryCodec(),
+    CompactCodec(),
+    CompactCodec("zlib"),
+    CompactCodec("lzma"),
+]
+
+
+@pytest.mark.parametrize("codec", CODECS, ids=lambda c: c.name)
+def test_round_trip(codec):
+    assert codec.decode(codec.encode(DOC)) == DOC
+    assert codec.decode(codec.encode([PATHS, []])) == [PATHS, []]
+
+
+@pytest.mark.parametrize("writer", CODECS, ids=lambda c: c.name)
+def test_any_codec_reads_any_format(writer):
+    assert HistoryCodec().decode(writer.encode(DOC)) == DOC
+
+
+def test_compact_front_codes_string_lists():
+    packed = CompactCodec().pack(["/repo/src/a.py", "/repo/src/b.py"])
+    assert packed == {"\x00fc": [0, "/repo/src/a.py", 10, "b.py"]}
+    assert b"\n" not in CompactCodec().encode(DOC)
+
+
+def test_compact_is_smaller():
+    paths = [f"/home/user/project/src/pkg{i % 20}/module_{i}.py" for i in range(500)]
+    sizes = [len(c.encode([paths])) for c in CODECS]
+    assert sizes[1] < sizes[0] / 2
+    assert sizes[2] < sizes[1] and sizes[3] < sizes[1]
+
+
+def test_unknown_compression_rejected():
+    with pytest.raises(ValueError):
+        CompactCodec("bz2")  # type: ignore[arg-type]
+
+
+def test_history_db_uses_codec(tmp_path):
+    path = tmp_path / "h.json"
+    db = HistoryDB(path, empty=[], codec=CompactCodec("zlib"))
+    db.push(PATHS)
+    assert not path.read_bytes().startswith(b"[")
+    reopened = HistoryDB(path, empty=[])
+    assert reopened.latest() == PATHS
+
+
+def test_journal_lines_stay_plain_json(tmp_path):
+    path = tmp_path / "h.jsonl"
+    db = JournalHistoryDB(path, empty=[], codec=CompactCodec("lzma"))
+    db.push(PATHS)
+    for line in path.read_text().splitlines():
+        json.loads(line)
+    assert JournalHistoryDB(path, empty=[]).latest() == PATHS
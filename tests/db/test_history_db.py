@@ -1,4 +1,6 @@
+import os
 import pytest
+import threading
 import json
 from pathlib import Path
 from unittest.mock import patch, mock_open
@@ -31,19 +33,40 @@ def history_db(tmp_history_file):
     )
 
 
-def test_init_bootstraps_file_if_not_exists(tmp_path, monkeypatch):
+def test_first_write_bootstraps_file_if_not_exists(tmp_path, monkeypatch):
     file_path = tmp_path / "new_history.json"
     # Simulate file not existing
     monkeypatch.setattr(Path, "exists", lambda self: False)
     m = mock_open()
-    with patch("sasori.db.history_db.open", m):
+    with (
+        patch("sasori.db.history_db.open", m),
+        patch("sasori.db.history_db.os.fsync") as mock_fsync,
+        patch("sasori.db.history_db.os.replace") as mock_replace,
+    ):
         db = HistoryDB(
             file_path=file_path,
             empty={"foo": "empty"},
         )
-    m.assert_called_once_with(file_path, "w", encoding="utf-8")
+        m.assert_not_called()
+        db._bootstrap()
+    tmp = file_path.with_name(file_path.name + ".tmp")
+    m.assert_called_once_with(tmp, "wb")
     handle = m()
     handle.write.assert_called()  # Should write initial snapshot
+    mock_fsync.assert_called_once()
+    mock_replace.assert_called_once_with(tmp, file_path)
+
+
+def test_reads_before_first_write_touch_nothing(tmp_path, capsys):
+    cache_dir = tmp_path / "cache"
+    db = HistoryDB(file_path=cache_dir / "history.json", empty={"foo": "empty"})
+    assert db.latest() == {"foo": "empty"}
+    assert db.depth() == 1
+    assert db.size_bytes() == 0
+    assert not cache_dir.exists()
+    assert capsys.readouterr().err == ""
+    db.push({"foo": "x"})
+    assert db.depth() == 2
 
 
 def test_latest_returns_last_snapshot(history_db, tmp_history_file):
@@ -112,3 +135,110 @@ def test_save_handles_write_exception(tmp_path, capsys, monkeypatch):
     db._save([{"foo": "fail"}])
     captured = capsys.readouterr()
     assert "Failed to save" in captured.err
+
+
+def test_read_cache_skips_unchanged_file(history_db):
+    history_db.latest()
+    loads = history_db.loads
+    history_db.latest()
+    history_db.summary()
+    assert history_db.loads == loads
+    assert history_db.loads_avoided >= 2
+
+
+def test_read_cache_updated_by_own_writes(history_db):
+    history_db.latest()
+    loads = history_db.loads
+    history_db.push({"foo": "one"})
+    history_db.undo()
+    history_db.clear()
+    # push/undo each read once from cache; nothing is re-read from disk
+    assert history_db.loads == loads
+    assert history_db.latest() == {"foo": "empty"}
+
+
+def test_read_cache_reloads_after_external_change(history_db, tmp_history_file):
+    history_db.latest()
+    tmp_history_file.write_text(json.dumps([{"foo": "bar"}, {"foo": "external!"}]))
+    assert history_db.latest() == {"foo": "external!"}
+
+
+def test_read_cache_sees_same_size_rewrite_in_one_mtime_tick(
+    history_db, tmp_history_file
+):
+    history_db.latest()
+    st = tmp_history_file.stat()
+    other = tmp_history_file.with_name("other.json")
+    other.write_text(json.dumps([{"foo": "baz"}]))  # same size as the original
+    os.utime(other, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(other, tmp_history_file)
+    assert tmp_history_file.stat().st_size == st.st_size
+    assert history_db.latest() == {"foo": "baz"}
+
+
+def test_failed_save_leaves_cache_untouched(history_db, monkeypatch, capsys):
+    history_db.push({"foo": "one"})
+    depth = history_db.depth()
+
+    def fail(doc):
+        raise ValueError("cannot encode")
+
+    monkeypatch.setattr(history_db._codec, "encode", fail)
+    history_db.push({"foo": "two"})
+    assert "Failed to save" in capsys.readouterr().err
+    assert history_db.latest() == {"foo": "ONE"}
+    assert history_db.depth() == depth
+
+
+def test_save_is_atomic_and_leaves_no_temp_file(history_db, tmp_history_file):
+    history_db.push({"foo": "new"})
+    assert json.loads(tmp_history_file.read_text())[-1] == {"foo": "NEW"}
+    assert not tmp_history_file.with_name(tmp_history_file.name + ".tmp").exists()
+
+
+def test_concurrent_read_modify_write_loses_nothing(tmp_path):
+    path = tmp_path / "shared.json"
+    dbs = [
+        HistoryDB(path, empty=[], normalise=lambda lst: sorted(lst)) for _ in range(4)
+    ]
+
+    def worker(db, n):
+        for i in range(10):
+            with db.locked():
+                db.push(db.latest() + [f"{n}-{i}"])
+
+    threads = [
+        threading.Thread(target=worker, args=(db, n)) for n, db in enumerate(dbs)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(dbs[0].latest()) == 40
+
+
+def test_max_depth_prunes_oldest(tmp_path):
+    db = HistoryDB(tmp_path / "h.json", empty=[], max_depth=3)
+    for i in range(5):
+        db.push([i])
+    assert json.loads((tmp_path / "h.json").read_text()) == [[2], [3], [4]]
+    assert db.depth() == 3
+    assert db.undo() and db.undo()
+    assert db.undo() is False
+
+
+def test_max_bytes_prunes_until_it_fits(tmp_path):
+    path = tmp_path / "h.json"
+    db = HistoryDB(path, empty=[], max_bytes=400)
+    for i in range(20):
+        db.push([f"/some/fairly/long/path/{i}.py"])
+    assert path.stat().st_size <= 400
+    assert db.latest() == ["/some/fairly/long/path/19.py"]
+    assert 1 < db.depth() < 20
+
+
+def test_stats_reports_depth_and_bytes(tmp_path):
+    path = tmp_path / "h.json"
+    db = HistoryDB(path, empty=[], max_depth=10)
+    db.push(["a"])
+    assert db.stats() == f"🗄️  h.json: 2/10 snapshot(s), {path.stat().st_size:,} bytes"
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+
+import sasori.db.history_db_factory as history_db_factory
+from sasori.db.delta_history_db import DeltaHistoryDB
+from sasori.db.history_codec import HistoryCodec
+from sasori.db.history_db import HistoryDB
+from sasori.db.journal_history_db import JournalHistoryDB
+from sasori.db.sqlite_history_db import SQLiteHistoryDB
+
+
+@pytest.mark.parametrize(
+    "env_value,expected_cls,suffix",
+    [
+        (None, HistoryDB, ".json"),
+        ("json", HistoryDB, ".json"),
+        (" Delta ", DeltaHistoryDB, ".delta.json"),
+        ("journal", JournalHistoryDB, ".jsonl"),
+        ("sqlite", SQLiteHistoryDB, ".sqlite3"),
+    ],
+)
+def test_get_history_db_backends(
+    monkeypatch, tmp_path, env_value, expected_cls, suffix
+):
+    if env_value is None:
+        monkeypatch.delenv("HISTORY_BACKEND", raising=False)
+    else:
+        monkeypatch.setenv("HISTORY_BACKEND", env_value)
+    db = history_db_factory.get_history_db(tmp_path / "files.abc.json", empty=[])
+    assert type(db) is expected_cls
+    assert Path(db._file).name == f"files.abc{suffix}"
+    assert db.latest() == []
+
+
+def test_get_history_db_unsupported(monkeypatch, tmp_path):
+    monkeypatch.setenv("HISTORY_BACKEND", "nope")
+    with pytest.raises(ValueError) as excinfo:
+        history_db_factory.get_history_db(tmp_path / "x.json", empty=[])
+    assert "Unsupported HISTORY_BACKEND" in str(excinfo.value)
+
+
+def test_get_history_db_limits_from_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("HISTORY_BACKEND", raising=False)
+    monkeypatch.setenv("HISTORY_MAX_DEPTH", "5")
+    monkeypatch.setenv("HISTORY_MAX_BYTES", "0")
+    db = history_db_factory.get_history_db(tmp_path / "x.json", empty=[])
+    assert db._max_depth == 5
+    assert db._max_bytes is None
+
+
+def test_get_history_db_default_limits(monkeypatch, tmp_path):
+    monkeypatch.delenv("HISTORY_MAX_DEPTH", raising=False)
+    monkeypatch.delenv("HISTORY_MAX_BYTES", raising=False)
+    db = history_db_factory.get_history_db(tmp_path / "x.json", empty=[])
+    assert db._max_depth == history_db_factory.DEFAULT_MAX_DEPTH
+    assert db._max_bytes == history_db_factory.DEFAULT_MAX_BYTES
+
+
+def test_get_history_db_bad_limit(monkeypatch, tmp_path):
+    monkeypatch.setenv("HISTORY_MAX_DEPTH", "lots")
+    with pytest.raises(ValueError) as excinfo:
+        history_db_factory.get_history_db(tmp_path / "x.json", empty=[])
+    assert "HISTORY_MAX_DEPTH" in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    "env_value,name",
+    [(None, "json"), ("compact", "compact"), (" Compact+ZLIB ", "compact+zlib")],
+)
+def test_get_history_db_codec_from_env(monkeypatch, tmp_path, env_value, name):
+    monkeypatch.delenv("HISTORY_BACKEND", raising=False)
+    if env_value is None:
+        monkeypatch.delenv("HISTORY_CODEC", raising=False)
+    else:
+        monkeypatch.setenv("HISTORY_CODEC", env_value)
+    db = history_db_factory.get_history_db(tmp_path / "x.json", empty=[])
+    assert db._codec.name == name
+
+
+def test_get_history_db_explicit_codec_wins(monkeypatch, tmp_path):
+    monkeypatch.setenv("HISTORY_CODEC", "compact")
+    codec = HistoryCodec()
+    db = history_db_factory.get_history_db(tmp_path / "x.json", empty=[], codec=codec)
+    assert db._codec is codec
+
+
+def test_get_history_db_unsupported_codec(monkeypatch, tmp_path):
+    monkeypatch.setenv("HISTORY_CODEC", "gzip")
+    with pytest.raises(ValueError, match="Unsupported HISTORY_CODEC"):
+        history_db_factory.get_history_db(tmp_path / "x.json", empty=[])
+
+
+def test_file_stores_leave_the_codec_to_the_factory():
+    import sasori.db.process_file_db as process_file_db
+    import sasori.db.shared_file_db as shared_file_db
+
+    assert shared_file_db._shared_store._codec is None
+    assert process_file_db._proc_store._codec is None
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from sasori.db.journal_history_db import JournalHistoryDB
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "history.jsonl"
+
+
+def _db(path, compact_after=100):
+    return JournalHistoryDB(
+        path,
+        empty=[],
+        normalise=lambda lst: sorted(set(lst)),
+        compact_after=compact_after,
+    )
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_bootstrap_writes_empty_snapshot(db_path):
+    db = _db(db_path)
+    assert not db_path.exists()
+    db.clear()
+    assert _records(db_path) == [{"push": []}]
+    assert db.latest() == []
+
+
+def test_push_appends_one_line(db_path):
+    db = _db(db_path)
+    db.push(["b", "a"])
+    db.push(["c"])
+    assert _records(db_path) == [{"push": []}, {"push": ["a", "b"]}, {"push": ["c"]}]
+    assert db.latest() == ["c"]
+
+
+def test_undo_appends_tombstone(db_path):
+    db = _db(db_path)
+    db.push(["a"])
+    db.push(["a", "b"])
+    assert db.undo() is True
+    assert _records(db_path)[-1] == {"undo": True}
+    assert db.latest() == ["a"]
+    assert db.undo() is True
+    assert db.latest() == []
+    assert db.undo() is False
+
+
+def test_compaction_drops_dead_lines(db_path):
+    db = _db(db_path, compact_after=4)
+    for i in range(3):
+        db.push([str(i)])
+    db.undo()
+    db.undo()
+    assert _records(db_path) == [{"push": []}, {"push": ["0"]}]
+    assert db.latest() == ["0"]
+
+
+def test_torn_last_line_is_ignored_and_repaired(db_path):
+    db = _db(db_path)
+    db.push(["a"])
+    with open(db_path, "a", encoding="utf-8") as f:
+        f.write('{"push": ["a", "b"')
+    assert db.latest() == ["a"]
+    db.push(["c"])
+    assert _records(db_path) == [{"push": []}, {"push": ["a"]}, {"push": ["c"]}]
+
+
+def test_clear_compacts_to_empty(db_path):
+    db = _db(db_path)
+    db.push(["a"])
+    db.clear()
+    assert _records(db_path) == [{"push": []}]
+
+
+def test_corrupt_journal_resets(db_path, capsys):
+    db_path.write_text("garbage\n")
+    db = _db(db_path)
+    assert db.latest() == []
+    assert "Failed to load" in capsys.readouterr().err
+
+
+def test_read_cache_follows_appends(db_path):
+    db = _db(db_path)
+    db.latest()
+    loads = db.loads
+    db.push(["a"])
+    db.push(["b"])
+    db.undo()
+    assert db.latest() == ["a"]
+    assert db.loads == loads
+
+
+def test_push_compacts_past_max_depth(db_path):
+    db = JournalHistoryDB(db_path, empty=[], max_depth=3)
+    for i in range(5):
+        db.push([str(i)])
+    assert db.depth() == 3
+    assert len(_records(db_path)) == 3
+    assert db.latest() == ["4"]
+
+
+def test_push_compacts_past_max_bytes(db_path):
+    db = JournalHistoryDB(db_path, empty=[], max_bytes=200)
+    for i in range(30):
+        db.push([f"/path/number/{i}.py"])
+    assert db_path.stat().st_size <= 200 + 40
+    assert db.latest() == ["/path/number/29.py"]
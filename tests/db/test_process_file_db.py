@@ -27,6 +27,18 @@ def test_remove_processing_file_calls_remove(patch_file_history_store):
     patch_file_history_store.remove.assert_called_once_with("bar.txt")
 
 
+def test_remove_processing_file_reports_count(patch_file_history_store, capsys):
+    patch_file_history_store.remove.return_value = 3
+    process_file_db.remove_processing_file("src")
+    assert "Processing file(s) removed: src (3)" in capsys.readouterr().out
+
+
+def test_remove_processing_file_silent_when_untracked(patch_file_history_store, capsys):
+    patch_file_history_store.remove.return_value = 0
+    process_file_db.remove_processing_file("src")
+    assert "removed" not in capsys.readouterr().out
+
+
 def test_undo_processing_files_calls_undo(patch_file_history_store):
     process_file_db.undo_processing_files()
     patch_file_history_store.undo.assert_called_once_with()
@@ -39,8 +51,23 @@ def test_summary_processing_files_returns_summary(patch_file_history_store):
     assert result == "summary!"
 
 
-def test_get_processing_files_returns_latest_set(patch_file_history_store):
-    patch_file_history_store.latest_set.return_value = {"a.txt", "b.txt"}
+def test_get_processing_files_returns_latest(patch_file_history_store):
+    patch_file_history_store.latest.return_value = ["a.txt", "b.txt"]
     result = process_file_db.get_processing_files()
-    patch_file_history_store.latest_set.assert_called_once_with()
-    assert result == {"a.txt", "b.txt"}
+    patch_file_history_store.latest.assert_called_once_with()
+    assert result == ["a.txt", "b.txt"]
+
+
+def test_append_processing_files_calls_append_many(patch_file_history_store):
+    process_file_db.append_processing_files(["a.txt", "b.txt"])
+    patch_file_history_store.append_many.assert_called_once_with(["a.txt", "b.txt"])
+
+
+def test_remove_processing_files_calls_remove_many(patch_file_history_store):
+    process_file_db.remove_processing_files(["a.txt"])
+    patch_file_history_store.remove_many.assert_called_once_with(["a.txt"])
+
+
+def test_stats_processing_files_returns_stats(patch_file_history_store):
+    patch_file_history_store.stats.return_value = "stats!"
+    assert process_file_db.stats_processing_files() == "stats!"
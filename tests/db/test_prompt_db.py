@@ -5,7 +5,7 @@ import builtins
 
 # Patch external dependencies at the top-level of the module under test
 patch_target_create_session_file = "sasori.db.prompt_db.create_session_file"
-patch_target_HistoryDB = "sasori.db.prompt_db.HistoryDB"
+patch_target_HistoryDB = "sasori.db.prompt_db.get_history_db"
 
 
 # Import the module under test after patching dependencies
@@ -17,7 +17,7 @@ def patch_external_deps(monkeypatch):
     )
     # Patch HistoryDB with a MagicMock
     mock_history_db_cls = MagicMock()
-    monkeypatch.setattr("sasori.db.prompt_db.HistoryDB", mock_history_db_cls)
+    monkeypatch.setattr("sasori.db.prompt_db.get_history_db", mock_history_db_cls)
     yield
 
 
@@ -41,8 +41,23 @@ def test_summary_shared_files_returns_summary(patch_file_history_store):
     assert result == "summary string"
 
 
-def test_get_shared_files_returns_latest_set(patch_file_history_store):
-    patch_file_history_store.latest_set.return_value = {"a.txt", "b.txt"}
+def test_get_shared_files_returns_latest(patch_file_history_store):
+    patch_file_history_store.latest.return_value = ["a.txt", "b.txt"]
     result = shared_file_db.get_shared_files()
-    patch_file_history_store.latest_set.assert_called_once_with()
-    assert result == {"a.txt", "b.txt"}
+    patch_file_history_store.latest.assert_called_once_with()
+    assert result == ["a.txt", "b.txt"]
+
+
+def test_append_shared_files_calls_append_many(patch_file_history_store):
+    shared_file_db.append_shared_files(["a.txt", "b.txt"])
+    patch_file_history_store.append_many.assert_called_once_with(["a.txt", "b.txt"])
+
+
+def test_remove_shared_files_calls_remove_many(patch_file_history_store):
+    shared_file_db.remove_shared_files(["a.txt"])
+    patch_file_history_store.remove_many.assert_called_once_with(["a.txt"])
+
+
+def test_stats_shared_files_returns_stats(patch_file_history_store):
+    patch_file_history_store.stats.return_value = "stats string"
+    assert shared_file_db.stats_shared_files() == "stats string"
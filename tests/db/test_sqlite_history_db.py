@@ -0,0 +1,225 @@
+import pytest
+
+from sasori.db.sqlite_history_db import SQLiteHistoryDB
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = SQLiteHistoryDB(
+        tmp_path / "history.sqlite3",
+        empty=[],
+        normalise=lambda lines: [ln.strip() for ln in lines if ln.strip()],
+    )
+    yield db
+    db.close()
+
+
+def test_bootstrap_and_wal_mode(db):
+    assert db.latest() == []
+    assert db.depth() == 1
+    assert not db._file.exists()
+    db.push(["a"])
+    db.undo()
+    assert db.latest() == []
+    (mode,) = db._connect().execute("PRAGMA journal_mode").fetchone()
+    assert mode == "wal"
+
+
+def test_push_only_touches_changed_rows(db):
+    db.push(["a", "b"])
+    db.push(["a", "b", "c"])
+    db.push(["a", "c"])
+    assert db.latest() == ["a", "c"]
+    rows = db._connect().execute("SELECT item, added, removed FROM items").fetchall()
+    assert sorted(rows) == [("a", 1, None), ("b", 1, 3), ("c", 2, None)]
+
+
+def test_sorted_inserts_only_add_rows(tmp_path):
+    db = SQLiteHistoryDB(tmp_path / "h.sqlite3", empty=[], normalise=sorted)
+    paths = [f"/src/{i:04d}.py" for i in range(0, 2000, 2)]
+    db.push(paths)
+    db.push(paths + ["/src/0501.py"])
+    db.push(paths + ["/src/0501.py", "/src/0003.py", "/src/zzzz.py"])
+    assert db.latest() == sorted(
+        paths + ["/src/0501.py", "/src/0003.py", "/src/zzzz.py"]
+    )
+    (rows,) = db._connect().execute("SELECT COUNT(*) FROM items").fetchone()
+    assert rows == len(paths) + 3
+    db.undo()
+    assert db.latest() == sorted(paths + ["/src/0501.py"])
+    db.close()
+
+
+def test_narrow_gap_falls_back_to_rewrite(db):
+    db.push(["a", "z"])
+    for i in range(80):  # keep splitting the gap right after "a"
+        db.push([db.latest()[0], f"b{80 - i:03d}"] + db.latest()[1:])
+    assert db.latest()[:3] == ["a", "b001", "b002"]
+    assert db.latest()[-1] == "z"
+    assert len(db.latest()) == 82
+    (rows,) = db._connect().execute("SELECT COUNT(*) FROM items").fetchone()
+    assert rows > 82  # the live rows were re-inserted once the gap ran out
+
+
+def test_migrates_databases_without_positions(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "h.sqlite3"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE versions (version INTEGER PRIMARY KEY);"
+        "CREATE TABLE items (id INTEGER PRIMARY KEY, item TEXT NOT NULL, "
+        "added INTEGER NOT NULL, removed INTEGER);"
+        "INSERT INTO versions VALUES (0);"
+        "INSERT INTO items (item, added) VALUES ('b', 0), ('a', 0);"
+    )
+    conn.commit()
+    conn.close()
+    db = SQLiteHistoryDB(path, empty=[])
+    assert db.latest() == ["b", "a"]
+    db.push(["b", "a", "c"])
+    assert db.latest() == ["b", "a", "c"]
+    db.close()
+
+
+def test_undo_restores_previous_versions(db):
+    db.push(["a", "b"])
+    db.push(["a", "c"])
+    assert db.undo() is True
+    assert db.latest() == ["a", "b"]
+    assert db.undo() is True
+    assert db.latest() == []
+    assert db.undo() is False
+
+
+def test_reorder_replaces_live_rows(db):
+    db.push(["one", "two"])
+    db.push(["two", "one"])
+    assert db.latest() == ["two", "one"]
+    db.undo()
+    assert db.latest() == ["one", "two"]
+
+
+def test_contains_uses_live_rows(db):
+    db.push(["a", "b"])
+    db.push(["a"])
+    assert db.contains("a")
+    assert not db.contains("b")
+    plan = " ".join(
+        str(row)
+        for row in db._connect().execute(
+            "EXPLAIN QUERY PLAN SELECT 1 FROM items "
+            "WHERE item = ? AND removed IS NULL LIMIT 1",
+            ("a",),
+        )
+    )
+    assert "items_live" in plan
+
+
+def test_add_items_inserts_between_neighbours(tmp_path):
+    db = SQLiteHistoryDB(tmp_path / "h.sqlite3", empty=[], normalise=sorted)
+    db.push(["a", "c", "e"])
+    assert db.add_items(["d", "b", "c"]) == 2
+    assert db.latest() == ["a", "b", "c", "d", "e"]
+    (rows,) = db._connect().execute("SELECT COUNT(*) FROM items").fetchone()
+    assert rows == 5
+    assert db.add_items(["a"]) == 0
+    assert db.depth() == 3
+    db.undo()
+    assert db.latest() == ["a", "c", "e"]
+    db.close()
+
+
+def test_add_items_falls_back_when_the_gap_runs_out(tmp_path):
+    db = SQLiteHistoryDB(tmp_path / "h.sqlite3", empty=[], normalise=sorted)
+    db.push(["a", "z"])
+    for i in range(80):  # keep splitting the gap right after "a"
+        assert db.add_items([f"b{80 - i:03d}"]) == 1
+    assert db.latest()[:3] == ["a", "b001", "b002"]
+    assert len(db.latest()) == 82
+    db.close()
+
+
+def test_remove_items_drops_items_and_ranges(tmp_path):
+    db = SQLiteHistoryDB(tmp_path / "h.sqlite3", empty=[], normalise=sorted)
+    db.push(["src", "src-old/x", "src/a", "src/b/c", "z"])
+    assert db.remove_items(["src", "z"], [("src/", "src0")]) == 4
+    assert db.latest() == ["src-old/x"]
+    assert db.remove_items(["missing"]) == 0
+    assert db.depth() == 3
+    db.undo()
+    assert db.latest() == ["src", "src-old/x", "src/a", "src/b/c", "z"]
+    db.close()
+
+
+def test_reads_from_other_threads(db):
+    from concurrent.futures import ThreadPoolExecutor
+
+    db.push(["a", "b"])
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: (db.latest(), db.contains("a")), range(8)))
+        pool.submit(db.push, ["a", "b", "c"]).result()
+    assert results == [(["a", "b"], True)] * 8
+    assert db.latest() == ["a", "b", "c"]
+    assert len(db._conns) > 1
+    db.close()
+    assert db._conns == []
+    assert db.latest() == ["a", "b", "c"]
+
+
+def test_load_and_clear(db):
+    db.push(["a"])
+    db.push(["a", "b"])
+    assert db._load() == [[], ["a"], ["a", "b"]]
+    db.clear()
+    assert db._load() == [[]]
+    assert db.undo() is False
+
+
+def test_state_survives_reopen(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    first = SQLiteHistoryDB(path, empty=[])
+    first.push(["x"])
+    first.close()
+    second = SQLiteHistoryDB(path, empty=[])
+    assert second.latest() == ["x"]
+    second.close()
+
+
+def test_broken_database_reports_load_failure(tmp_path, capsys):
+    path = tmp_path / "history.sqlite3"
+    path.write_text("not a database" * 100)
+    db = SQLiteHistoryDB(path, empty=[])
+    assert db.latest() == []
+    assert "Failed to load" in capsys.readouterr().err
+
+
+def test_max_depth_drops_old_versions_and_dead_rows(tmp_path):
+    db = SQLiteHistoryDB(tmp_path / "h.sqlite3", empty=[], max_depth=2)
+    db.push(["a", "b"])
+    db.push(["a"])
+    db.push(["a", "c"])
+    assert db.depth() == 2
+    assert db._load() == [["a"], ["a", "c"]]
+    items = [i for (i,) in db._connect().execute("SELECT item FROM items")]
+    assert sorted(items) == ["a", "c"]
+    assert db.undo() is True
+    assert db.undo() is False
+    db.close()
+
+
+def test_max_bytes_drops_old_versions(tmp_path):
+    db = SQLiteHistoryDB(tmp_path / "h.sqlite3", empty=[])
+    for i in range(200):
+        db.push([f"/path/{i}/" + "x" * 200])
+    pages = db.size_bytes()
+    db._max_bytes = pages // 2
+    db.push(["last"])
+    assert db.depth() < 200
+    assert db.latest() == ["last"]
+    db.close()
+
+
+def test_stats_uses_versions_and_pages(db):
+    db.push(["a"])
+    assert db.stats().startswith("🗄️  history.sqlite3: 2 snapshot(s), ")
@@ -0,0 +1,111 @@
+import os
+import time
+
+import pytest
+
+import sasori.util.content_cache_util as content_cache_util
+import sasori.util.file_util as file_util
+from sasori.util.content_cache_util import ContentCache, render_block, stat_key
+
+
+def _old_file(path, text):
+    path.write_text(text)
+    old = time.time_ns() - 10 * 1_000_000_000
+    os.utime(path, ns=(old, old))
+    return path
+
+
+def test_put_then_get_returns_text_and_block(tmp_path):
+    f = _old_file(tmp_path / "a.py", "x = 1")
+    cache = ContentCache()
+    block = cache.put(f, stat_key(f), "x = 1")
+    assert block == render_block(f, "x = 1")
+    assert cache.get(f) == ("x = 1", block)
+    assert cache.hits == 1
+
+
+def test_changed_file_misses(tmp_path):
+    f = _old_file(tmp_path / "a.py", "x = 1")
+    cache = ContentCache()
+    cache.put(f, stat_key(f), "x = 1")
+    _old_file(f, "x = 22")
+    assert cache.get(f) is None
+    assert cache.misses == 1
+
+
+def test_recently_modified_file_is_not_cached(tmp_path):
+    f = tmp_path / "a.py"
+    f.write_text("fresh")
+    cache = ContentCache()
+    cache.put(f, stat_key(f), "fresh")
+    assert cache.get(f) is None
+
+
+def test_memory_layer_evicts_least_recently_used(tmp_path):
+    files = [_old_file(tmp_path / f"{i}.py", "y" * 100) for i in range(3)]
+    one = content_cache_util._cost(
+        str(files[0]), "y" * 100, render_block(files[0], "y" * 100)
+    )
+    cache = ContentCache(memory_bytes=one * 2 + one // 2)
+    for f in files[:2]:
+        cache.put(f, stat_key(f), "y" * 100)
+    cache.get(files[0])  # now files[1] is the oldest
+    cache.put(files[2], stat_key(files[2]), "y" * 100)
+    assert cache.get(files[1]) is None
+    assert cache.get(files[0]) is not None
+    assert cache.get(files[2]) is not None
+
+
+def test_disk_layer_survives_new_instance(tmp_path):
+    f = _old_file(tmp_path / "a.py", "x = 1")
+    disk = tmp_path / "cache"
+    ContentCache(disk_dir=disk).put(f, stat_key(f), "x = 1")
+    cache = ContentCache(disk_dir=disk)
+    assert cache.get(f) == ("x = 1", render_block(f, "x = 1"))
+    assert cache.disk_hits == 1
+    _old_file(f, "x = 2")
+    assert ContentCache(disk_dir=disk).get(f) is None
+
+
+def test_disk_layer_trims_to_budget(tmp_path):
+    disk = tmp_path / "cache"
+    cache = ContentCache(disk_dir=disk, disk_bytes=1500)
+    for i in range(10):
+        f = _old_file(tmp_path / f"{i}.py", "z" * 400)
+        cache.put(f, stat_key(f), "z" * 400)
+    sizes = [p.stat().st_size for p in disk.glob("*.json")]
+    assert sum(sizes) <= 1500
+    assert 0 < len(sizes) < 10
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(content_cache_util, "_cache", None)
+    yield
+    content_cache_util._cache = None
+
+
+def test_get_content_cache_modes(monkeypatch, tmp_path, fresh_cache):
+    monkeypatch.setattr(content_cache_util.session_util, "CACHE_DIR", tmp_path)
+    monkeypatch.setenv("CONTENT_CACHE", "off")
+    assert content_cache_util.get_content_cache() is None
+    monkeypatch.setenv("CONTENT_CACHE", "disk")
+    cache = content_cache_util.get_content_cache()
+    assert cache is not None and cache._disk_dir == tmp_path / "content_cache"
+    assert content_cache_util.get_content_cache() is cache
+
+
+def test_stringify_file_contents_reads_unchanged_files_once(
+    monkeypatch, tmp_path, fresh_cache
+):
+    monkeypatch.delenv("CONTENT_CACHE", raising=False)
+    f = _old_file(tmp_path / "a.py", "x = 1")
+    reads = []
+    real = file_util.stringify_file_content
+    monkeypatch.setattr(
+        file_util, "stringify_file_content", lambda p: reads.append(p) or real(p)
+    )
+    first = file_util.stringify_file_contents([str(f)])
+    second = file_util.stringify_file_contents([str(f)])
+    assert first == second == ["📁 Files:", render_block(str(f), "x = 1")]
+    assert reads == [str(f)]
@@ -0,0 +1,103 @@
+import json
+import os
+
+import pytest
+
+import sasori.util.dir_cache_util as dir_cache_util
+from sasori.util.ignore_util import IgnoreScope
+from sasori.util.walk_util import walk_scandir, walk_tree
+
+
+@pytest.fixture(autouse=True)
+def patch_cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(dir_cache_util.session_util, "CACHE_DIR", cache_dir)
+    # treat every listing as old enough to be cached
+    monkeypatch.setattr(dir_cache_util, "_RACY_NS", -(10**18))
+    yield cache_dir
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "tree"
+    for rel in ["a.txt", "b/c.txt", "b/d/e.txt", "venv/x.py"]:
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text("x")
+    return root
+
+
+def _walk(root, cache):
+    scope = IgnoreScope.for_root(str(root), ["venv"])
+    return list(walk_scandir(scope, 2, cache.scan))
+
+
+def test_cached_walk_matches_plain_walk(tree):
+    cache = dir_cache_util.DirCache()
+    scope = IgnoreScope.for_root(str(tree), ["venv"])
+    assert _walk(tree, cache) == list(walk_tree(str(tree), scope))
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_second_walk_hits_cache(tree, patch_cache_dir):
+    first = dir_cache_util.DirCache()
+    _walk(tree, first)
+    first.save()
+    assert (patch_cache_dir / dir_cache_util.DIR_CACHE_NAME).exists()
+
+    second = dir_cache_util.DirCache()
+    files = _walk(tree, second)
+    assert (second.hits, second.misses) == (3, 0)
+    assert str(tree / "b" / "d" / "e.txt") in files
+    assert "3 hit(s), 0 miss(es)" in second.summary()
+
+
+def test_changed_directory_is_relisted(tree):
+    first = dir_cache_util.DirCache()
+    _walk(tree, first)
+    first.save()
+    (tree / "b" / "new.txt").write_text("x")
+    st = os.stat(tree / "b")
+    os.utime(tree / "b", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    second = dir_cache_util.DirCache()
+    files = _walk(tree, second)
+    assert str(tree / "b" / "new.txt") in files
+    assert second.misses == 1
+
+
+def test_racy_listings_are_not_cached(tree, monkeypatch):
+    monkeypatch.setattr(dir_cache_util, "_RACY_NS", 10**18)
+    cache = dir_cache_util.DirCache()
+    _walk(tree, cache)
+    assert cache._entries == {}
+
+
+def test_evicts_old_and_oversized_entries(tmp_path):
+    cache = dir_cache_util.DirCache(tmp_path / "c.json", max_age_s=100, max_bytes=80)
+    cache._entries = {
+        "/old": [1, 0, ["a"], []],
+        "/lru": [1, 950, ["b" * 30], []],
+        "/mru": [1, 990, ["c" * 30], []],
+    }
+    cache._evict(now=1000)
+    assert list(cache._entries) == ["/mru"]
+
+
+def test_save_skips_clean_cache(tmp_path):
+    cache = dir_cache_util.DirCache(tmp_path / "c.json")
+    cache.save()
+    assert not (tmp_path / "c.json").exists()
+
+
+def test_load_ignores_corrupt_file(tmp_path, capsys):
+    path = tmp_path / "c.json"
+    path.write_text("not json")
+    cache = dir_cache_util.DirCache(path)
+    assert cache._entries == {}
+    assert "Failed to load" in capsys.readouterr().err
+
+
+def test_load_ignores_unknown_version(tmp_path):
+    path = tmp_path / "c.json"
+    path.write_text(json.dumps({"version": 99, "entries": {"/x": []}}))
+    assert dir_cache_util.DirCache(path)._entries == {}
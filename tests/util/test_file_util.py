@@ -46,6 +46,34 @@ def test_get_all_files_ignores_patterns(tmp_path):
     assert all("__pycache__" not in f and f.endswith(".pyc") is False for f in files)
 
 
+def test_get_all_files_honours_ignore_files(tmp_path):
+    (tmp_path / ".gitignore").write_text("node_modules/\n*.log\n!keep.log\n")
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg" / "index.js").write_text("x")
+    (tmp_path / "a.log").write_text("x")
+    (tmp_path / "keep.log").write_text("x")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / ".sasoriignore").write_text("/gen.py\n")
+    (tmp_path / "src" / "gen.py").write_text("x")
+    (tmp_path / "src" / "main.py").write_text("x")
+    files = file_util.get_all_files(tmp_path)
+    assert sorted(files) == sorted(
+        [
+            str(tmp_path / ".gitignore"),
+            str(tmp_path / "keep.log"),
+            str(tmp_path / "src" / ".sasoriignore"),
+            str(tmp_path / "src" / "main.py"),
+        ]
+    )
+
+
+def test_get_all_files_can_skip_ignore_files(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "a.log").write_text("x")
+    files = file_util.get_all_files(tmp_path, use_ignore_files=False)
+    assert str(tmp_path / "a.log") in files
+
+
 def test_stringify_file_contents_empty(monkeypatch):
     assert file_util.stringify_file_contents([]) == []
 
@@ -202,3 +230,104 @@ def test_source_to_test_path_too_short(tmp_path):
     src.write_text("x")
     with pytest.raises(Exception):
         file_util.source_to_test_path(src, repo_root)
+
+
+def test_get_all_files_walkers_agree(tmp_path):
+    for rel in ["a.py", "pkg/b.py", "pkg/sub/c.py", "__pycache__/d.pyc"]:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("x")
+    walked = file_util.get_all_files(tmp_path, walker=file_util.Walker.WALK)
+    scanned = file_util.get_all_files(tmp_path, walker=file_util.Walker.SCANDIR)
+    assert walked == scanned
+    assert len(walked) == 3
+
+
+def test_get_all_files_git_walker_falls_back_outside_repo(monkeypatch, tmp_path):
+    (tmp_path / "a.py").write_text("x")
+    monkeypatch.setattr(file_util, "walk_git", lambda *a, **k: None)
+    files = file_util.get_all_files(tmp_path, walker=file_util.Walker.GIT)
+    assert files == [str(tmp_path / "a.py")]
+
+
+def test_iter_files_is_lazy(tmp_path):
+    for name in ["a", "b"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "1.txt").write_text("x")
+    gen = file_util.iter_files(tmp_path)
+    assert next(gen) == str(tmp_path / "a" / "1.txt")
+    # "b" is only listed once the consumer gets there
+    (tmp_path / "b" / "2.txt").write_text("x")
+    assert list(gen) == [str(tmp_path / "b" / "1.txt"), str(tmp_path / "b" / "2.txt")]
+
+
+def test_iter_files_nonexistent_yields_nothing(tmp_path):
+    assert list(file_util.iter_files(tmp_path / "missing")) == []
+
+
+def test_stringify_file_contents_accepts_generator(tmp_path):
+    (tmp_path / "a.txt").write_text("foo")
+    result = file_util.stringify_file_contents(file_util.iter_files(tmp_path))
+    assert len(result) == 2 and "foo" in result[1]
+
+
+def test_get_all_files_with_cache(monkeypatch, tmp_path):
+    import sasori.util.session_util as session_util
+
+    monkeypatch.setattr(session_util, "CACHE_DIR", tmp_path / "cache")
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "a.py").write_text("x")
+    files = file_util.get_all_files(tmp_path / "src", use_cache=True)
+    assert files == [str(tmp_path / "src" / "pkg" / "a.py")]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_stringify_file_contents_keeps_order(tmp_path, monkeypatch, workers):
+    import time
+
+    def slow_read(path):
+        # later files finish first
+        time.sleep(0.002 * (9 - int(Path(path).stem)))
+        return Path(path).read_text()
+
+    monkeypatch.setattr(file_util, "stringify_file_content", slow_read)
+    files = []
+    for i in range(10):
+        (tmp_path / f"{i}.txt").write_text(f"body {i}")
+        files.append(str(tmp_path / f"{i}.txt"))
+    result = file_util.stringify_file_contents(files, max_workers=workers)
+    assert result[1:] == [f"File: {f}\n```\nbody {i}\n```" for i, f in enumerate(files)]
+
+
+def test_stringify_file_contents_reports_errors_in_place(tmp_path, monkeypatch, capsys):
+    def read(path):
+        if "bad" in str(path):
+            raise OSError("boom")
+        return "ok"
+
+    monkeypatch.setattr(file_util, "stringify_file_content", read)
+    result = file_util.stringify_file_contents(["a", "bad", "c"], max_workers=3)
+    assert result == ["📁 Files:", "File: a\n```\nok\n```", "File: c\n```\nok\n```"]
+    assert "Error reading bad: boom" in capsys.readouterr().err
+
+
+def test_stringify_file_contents_stops_at_byte_budget(monkeypatch):
+    monkeypatch.setattr(file_util, "stringify_file_content", lambda p: "x" * 100)
+    consumed = []
+
+    def paths():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"f{i}"
+
+    result = file_util.stringify_file_contents(paths(), max_workers=2, max_bytes=400)
+    assert len(result) == 1 + 3
+    # read-ahead is bounded, so the input is not drained past the budget
+    assert len(consumed) < 20
+
+
+def test_resolve_path_matches_iter_files(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("x = 1")
+    monkeypatch.chdir(tmp_path)
+    assert file_util.resolve_path("./src/a.py") == next(file_util.iter_files("src"))
+    assert file_util.resolve_path("src/") == str(tmp_path.resolve() / "src") + "/"
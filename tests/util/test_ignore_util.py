@@ -0,0 +1,126 @@
+import pytest
+from fnmatch import fnmatch
+
+import sasori.util.ignore_util as ignore_util
+from sasori.util.file_util import DEFAULT_IGNORES
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "__pycache__",
+        "foo.pyc",
+        "foo.pyo",
+        "foo.pyx",
+        "sasori.egg-info",
+        ".egg-info",
+        ".DS_Store",
+        ".git",
+        ".gitignore",
+        "venv",
+        "venvs",
+        "LICENSE",
+        "LICENSE.md",
+        "img.webp",
+        "img.jpeg",
+        "img.jpg",
+        "img.gif",
+        "main.py",
+        "",
+    ],
+)
+def test_name_matcher_agrees_with_fnmatch(name):
+    matcher = ignore_util.NameMatcher(DEFAULT_IGNORES)
+    expected = any(fnmatch(name, pat) for pat in DEFAULT_IGNORES)
+    assert matcher(name) == expected
+
+
+def test_name_matcher_buckets_patterns():
+    matcher = ignore_util.NameMatcher(["venv", "*.log", "*.py[co]", "build?"])
+    assert matcher.literals == {"venv"}
+    assert matcher.suffixes == (".log",)
+    assert matcher.regex is not None
+    assert matcher("build1") and matcher("x.pyc") and matcher("a.log")
+    assert not matcher("build") and not matcher("x.py")
+
+
+def test_name_matcher_empty_patterns_never_match():
+    matcher = ignore_util.NameMatcher([])
+    assert matcher.regex is None
+    assert not matcher("anything")
+
+
+def test_compile_ignore_patterns_is_cached():
+    first = ignore_util.compile_ignore_patterns(["a", "*.b"])
+    second = ignore_util.compile_ignore_patterns(("a", "*.b"))
+    assert first is second
+
+
+@pytest.mark.parametrize(
+    "lines,path,is_dir,expected",
+    [
+        (["*.log"], "a.log", False, True),
+        (["*.log"], "deep/dir/a.log", False, True),
+        (["*.log", "!keep.log"], "keep.log", False, False),
+        (["*.log", "!keep.log"], "other.txt", False, None),
+        (["/build"], "build", True, True),
+        (["/build"], "src/build", True, None),
+        (["build/"], "build", False, None),
+        (["build/"], "src/build", True, True),
+        (["docs/*.md"], "docs/a.md", False, True),
+        (["docs/*.md"], "docs/sub/a.md", False, None),
+        (["**/tmp"], "a/b/tmp", True, True),
+        (["logs/**"], "logs/x/y.txt", False, True),
+        (["a/**/b"], "a/b", True, True),
+        (["a/**/b"], "a/x/y/b", True, True),
+        (["# comment", "", "\\#hash"], "#hash", False, True),
+        (["node_modules   "], "node_modules", True, True),
+        (["file[0-9].txt"], "file7.txt", False, True),
+        (["file[!0-9].txt"], "file7.txt", False, None),
+    ],
+)
+def test_ignore_rules_match(lines, path, is_dir, expected):
+    assert ignore_util.IgnoreRules(lines).match(path, is_dir) is expected
+
+
+def test_load_ignore_rules_merges_files(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / ".sasoriignore").write_text("!keep.log\n")
+    rules = ignore_util.load_ignore_rules(str(tmp_path))
+    assert rules is not None
+    assert rules.match("a.log", False) is True
+    assert rules.match("keep.log", False) is False
+
+
+def test_load_ignore_rules_none_without_files(tmp_path):
+    assert ignore_util.load_ignore_rules(str(tmp_path)) is None
+
+
+def test_ignore_scope_inherits_and_overrides(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("*.log\nsecret/\n")
+    sub = tmp_path / "pkg"
+    sub.mkdir()
+    (sub / ".gitignore").write_text("!debug.log\n")
+    root = ignore_util.IgnoreScope.for_root(str(tmp_path), ["venv"])
+    child = root.child("pkg")
+    assert root.ignored("venv", True)
+    assert root.ignored("a.log", False)
+    assert child.ignored("a.log", False)
+    assert not child.ignored("debug.log", False)
+    assert child.ignored("secret", True)
+
+
+def test_ignore_scope_reads_repo_rules_above_root(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("pkg/generated/\n")
+    (tmp_path / "pkg").mkdir()
+    scope = ignore_util.IgnoreScope.for_root(str(tmp_path / "pkg"), [])
+    assert scope.ignored("generated", True)
+
+
+def test_ignore_scope_without_files(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    scope = ignore_util.IgnoreScope.for_root(str(tmp_path), [], read_files=False)
+    assert not scope.ignored("a.log", False)
+    assert not scope.child("x").read_files
@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from sasori.util.job_util import run_jobs
+
+
+def test_run_jobs_sequential_keeps_order_and_thread():
+    threads = []
+
+    def work(x):
+        threads.append(threading.get_ident())
+        return x * 2
+
+    assert list(run_jobs([1, 2, 3], work)) == [(1, 2, None), (2, 4, None), (3, 6, None)]
+    assert set(threads) == {threading.get_ident()}
+
+
+def test_run_jobs_reports_errors_per_item():
+    def work(x):
+        if x == 2:
+            raise ValueError("bad")
+        return x
+
+    results = {item: (res, err) for item, res, err in run_jobs([1, 2, 3], work, 2)}
+    assert results[1] == (1, None) and results[3] == (3, None)
+    assert isinstance(results[2][1], ValueError)
+
+
+@pytest.mark.parametrize("jobs", [2, 4])
+def test_run_jobs_bounds_concurrency(jobs):
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def work(x):
+        with lock:
+            active.append(x)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(x)
+        return x
+
+    out = sorted(item for item, _, _ in run_jobs(range(12), work, jobs))
+    assert out == list(range(12))
+    assert max(peak) == jobs
@@ -0,0 +1,33 @@
+import threading
+import time
+
+from sasori.util.lock_util import ReentrantFileLock, file_lock
+
+
+def test_file_lock_excludes_other_holders(tmp_path):
+    path = tmp_path / "x.lock"
+    events = []
+
+    def hold():
+        with file_lock(path):
+            events.append("second")
+
+    with file_lock(path):
+        t = threading.Thread(target=hold)
+        t.start()
+        time.sleep(0.1)
+        events.append("first")
+    t.join()
+    assert events == ["first", "second"]
+
+
+def test_reentrant_file_lock_nests(tmp_path):
+    lock = ReentrantFileLock(tmp_path / "x.lock")
+    with lock():
+        with lock():
+            pass
+        with lock():
+            pass
+    # released: a plain lock on the same file is free again
+    with file_lock(tmp_path / "x.lock"):
+        pass
@@ -1,10 +1,14 @@
 import pytest
 from pathlib import Path
 
+import os
+import subprocess
 import sys
 
 import sasori.util.session_util as session_util
 
+_get_session_id = session_util.get_session_id
+
 
 @pytest.fixture(autouse=True)
 def patch_cache_dir(tmp_path, monkeypatch):
@@ -12,7 +16,31 @@ def patch_cache_dir(tmp_path, monkeypatch):
     cache_dir = tmp_path / ".cache" / "cli_history"
     monkeypatch.setattr(session_util, "CACHE_DIR", cache_dir)
     cache_dir.mkdir(parents=True, exist_ok=True)
+    # get_session_id is memoized per process; resolve afresh in every test
+    _get_session_id.cache_clear()
     yield
+    _get_session_id.cache_clear()
+
+
+def test_get_session_id_is_memoized(monkeypatch):
+    calls = []
+    monkeypatch.setattr(session_util, "_try_pty", lambda: calls.append(1) or None)
+    monkeypatch.delenv("HISTORY_SESSION_ID", raising=False)
+    first = session_util.get_session_id()
+    assert session_util.get_session_id() == first
+    assert len(calls) == 1
+
+
+def test_import_creates_no_cache_dir(tmp_path):
+    code = (
+        "import pathlib, sasori.util.session_util as s;"
+        "print(s.create_session_file('x').parent.exists())"
+    )
+    env = {**os.environ, "HOME": str(tmp_path / "home")}
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert out.stdout.strip() == "False"
 
 
 @pytest.mark.parametrize(
@@ -6,6 +6,8 @@ import builtins
 
 import sasori.util.session_util as session_util
 
+_get_session_id = session_util.get_session_id
+
 
 @pytest.fixture(autouse=True)
 def patch_cache_dir(tmp_path, monkeypatch):
@@ -13,6 +15,10 @@ def patch_cache_dir(tmp_path, monkeypatch):
     monkeypatch.setattr(session_util, "CACHE_DIR", tmp_path)
     # Ensure directory exists
     tmp_path.mkdir(parents=True, exist_ok=True)
+    # get_session_id is memoized per process; resolve afresh in every test
+    _get_session_id.cache_clear()
+    yield
+    _get_session_id.cache_clear()
 
 
 def test_create_session_file_uses_cache_dir(monkeypatch):
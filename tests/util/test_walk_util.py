@@ -0,0 +1,100 @@
+import os
+import subprocess
+
+import pytest
+
+import sasori.util.walk_util as walk_util
+from sasori.util.ignore_util import IgnoreScope
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel in [
+        "a.txt",
+        "b/c.txt",
+        "b/d/e.txt",
+        "b/d/f.pyc",
+        "venv/lib.py",
+        "z/y.txt",
+        "z/a/x.txt",
+    ]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    return tmp_path
+
+
+def _scope(root):
+    return IgnoreScope.for_root(str(root), ["venv", "*.pyc"])
+
+
+def test_walk_tree_sorted_depth_first(tree):
+    files = list(walk_util.walk_tree(str(tree), _scope(tree)))
+    assert files == [
+        str(tree / rel)
+        for rel in ["a.txt", "b/c.txt", "b/d/e.txt", "z/y.txt", "z/a/x.txt"]
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2, 8])
+def test_walk_scandir_matches_walk_tree(tree, workers):
+    expected = list(walk_util.walk_tree(str(tree), _scope(tree)))
+    assert list(walk_util.walk_scandir(_scope(tree), workers)) == expected
+
+
+def test_walk_scandir_does_not_follow_symlinked_dirs(tree):
+    os.symlink(tree / "b", tree / "link")
+    files = list(walk_util.walk_scandir(_scope(tree), 2))
+    assert not any("link" in f for f in files)
+
+
+def test_scan_dir_missing_directory_returns_empty(tmp_path):
+    scope = IgnoreScope.for_root(str(tmp_path / "missing"), [])
+    assert walk_util.scan_dir(scope) == ([], [])
+
+
+def test_walk_scandir_stops_early(tree):
+    gen = walk_util.walk_scandir(_scope(tree), 2)
+    assert next(gen) == str(tree / "a.txt")
+    gen.close()
+
+
+@pytest.fixture
+def git_tree(tree):
+    (tree / ".gitignore").write_text("z/a/\n")
+    try:
+        subprocess.run(["git", "init", "-q", str(tree)], check=True)
+        subprocess.run(["git", "-C", str(tree), "add", "-A"], check=True)
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("git not available")
+    (tree / "untracked.txt").write_text("x")
+    return tree
+
+
+def test_walk_git_lists_tracked_files_in_walk_order(git_tree):
+    files = walk_util.walk_git(str(git_tree), _scope(git_tree))
+    assert files == [
+        str(git_tree / rel)
+        for rel in [".gitignore", "a.txt", "b/c.txt", "b/d/e.txt", "z/y.txt"]
+    ]
+
+
+def test_walk_git_includes_untracked(git_tree):
+    files = walk_util.walk_git(str(git_tree), _scope(git_tree), True)
+    assert files is not None
+    assert str(git_tree / "untracked.txt") in files
+    assert str(git_tree / "z" / "a" / "x.txt") not in files
+
+
+def test_walk_git_drops_deleted_files(git_tree):
+    (git_tree / "a.txt").unlink()
+    files = walk_util.walk_git(str(git_tree), _scope(git_tree))
+    assert str(git_tree / "a.txt") not in files
+
+
+def test_walk_git_returns_none_outside_repo(monkeypatch, tmp_path):
+    def fail(*a, **k):
+        raise walk_util.subprocess.CalledProcessError(128, "git")
+
+    monkeypatch.setattr(walk_util.subprocess, "check_output", fail)
+    assert walk_util.walk_git(str(tmp_path), _scope(tmp_path)) is None